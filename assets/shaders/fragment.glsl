@@ -1,11 +1,15 @@
 #version 330 core
 
 in vec2 tex_coord_out;
+in float texture_layer_out;
+in float light_out;
 
-uniform sampler2D texture_sampler;
+// Every block texture is one layer of this array, so all chunks draw without rebinding textures
+uniform sampler2DArray texture_sampler;
 
 out vec4 frag_color;
 
 void main() {
-    frag_color = texture(texture_sampler, tex_coord_out);
+    vec4 color = texture(texture_sampler, vec3(tex_coord_out, texture_layer_out));
+    frag_color = vec4(color.rgb * light_out, color.a);
 }
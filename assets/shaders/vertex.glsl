@@ -2,14 +2,25 @@
 
 layout (location = 0) in vec3 position;
 layout (location = 1) in vec2 tex_coord;
+layout (location = 2) in float texture_layer;
+layout (location = 3) in float light;
+// Per-instance offset of the instanced cube; chunk meshes leave it disabled, which reads as zero
+layout (location = 4) in vec3 instance_offset;
 
 uniform mat4 model;
-uniform mat4 view;
-uniform mat4 projection;
+// Shared by every program through one uniform buffer at binding 0
+layout (std140) uniform Camera {
+    mat4 view;
+    mat4 projection;
+};
 
 out vec2 tex_coord_out;
+out float texture_layer_out;
+out float light_out;
 
 void main() {
     tex_coord_out = tex_coord;
-    gl_Position = projection * view * model * vec4(position, 1.0);
+    texture_layer_out = texture_layer;
+    light_out = light;
+    gl_Position = projection * view * model * vec4(position + instance_offset, 1.0);
 }
@@ -0,0 +1,69 @@
+"""
+Compares naive and greedy chunk mesh build time and size on generated terrain, and
+the size of the downsampled level-of-detail meshes.
+
+Run from the repository root with ``python -m benchmarks.chunk_mesher_benchmark``.
+"""
+
+import time
+
+import numpy as np
+
+from src.game.block_registry import AIR
+from src.game.chunk import Chunk
+from src.rendering.chunk_mesher import MESH_GREEDY, MESH_NAIVE, VERTEX_STRIDE, build_chunk_mesh
+
+
+def padded_terrain(chunk_x, chunk_z, seed=0):
+    """Returns the padded block IDs of a generated chunk, with its horizontal neighbours as border."""
+    size = Chunk.CHUNK_SIZE
+    padded = np.full((size + 2,) * 3, AIR.id, dtype=np.uint16)
+    for dx in (-1, 0, 1):
+        for dz in (-1, 0, 1):
+            chunk = Chunk(((chunk_x + dx) * size, 0, (chunk_z + dz) * size), seed)
+            ids = chunk.block_ids()
+            x_slice = slice(1, -1) if dx == 0 else (slice(0, 1) if dx < 0 else slice(size + 1, None))
+            z_slice = slice(1, -1) if dz == 0 else (slice(0, 1) if dz < 0 else slice(size + 1, None))
+            source_x = slice(None) if dx == 0 else (slice(size - 1, None) if dx < 0 else slice(0, 1))
+            source_z = slice(None) if dz == 0 else (slice(size - 1, None) if dz < 0 else slice(0, 1))
+            padded[x_slice, 1:-1, z_slice] = ids[source_x, :, source_z]
+    return padded
+
+
+def sample_chunks(count=16):
+    """Returns padded block IDs of generated terrain chunks."""
+    return [padded_terrain(index % 4, index // 4) for index in range(count)]
+
+
+def benchmark(build, chunks, repeat=5):
+    """Returns (best milliseconds per chunk, total vertex count) for a mesh builder."""
+    best = float("inf")
+    vertices = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        vertices = sum(len(build(padded)) for padded in chunks)
+        best = min(best, time.perf_counter() - start)
+    return best / len(chunks) * 1000, vertices
+
+
+def main():
+    chunks = sample_chunks()
+    print(f"chunks: {len(chunks)}")
+    for mode in (MESH_NAIVE, MESH_GREEDY):
+        milliseconds, vertices = benchmark(lambda padded: build_chunk_mesh(padded, mode=mode), chunks)
+        print(
+            f"{mode}: {milliseconds:.2f} ms per chunk, {vertices / len(chunks):.0f} vertices per chunk "
+            f"({vertices * VERTEX_STRIDE / len(chunks) / 1024:.1f} KiB)"
+        )
+
+    terrain = [Chunk(((index % 4) * Chunk.CHUNK_SIZE, 0, (index // 4) * Chunk.CHUNK_SIZE)) for index in range(16)]
+    for factor in Chunk.LOD_FACTORS[1:]:
+        lod_chunks = [np.pad(chunk.lod_block_ids(factor), 1, constant_values=AIR.id) for chunk in terrain]
+        milliseconds, vertices = benchmark(
+            lambda padded: build_chunk_mesh(padded, mode=MESH_GREEDY, scale=factor), lod_chunks
+        )
+        print(f"greedy lod {factor}x: {milliseconds:.2f} ms per chunk, {vertices / len(lod_chunks):.0f} vertices per chunk")
+
+
+if __name__ == "__main__":
+    main()
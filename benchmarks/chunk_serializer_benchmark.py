@@ -0,0 +1,59 @@
+"""
+Compares the bit-packed chunk serializer against pickling ``Chunk.blocks``.
+
+Run from the repository root with ``python -m benchmarks.chunk_serializer_benchmark``.
+"""
+
+import pickle
+import timeit
+
+import numpy as np
+
+from src.game.block_registry import AIR, DIRT, STONE
+from src.game.chunk import Chunk
+from src.game.chunk_serializer import deserialize_chunk, serialize_chunk
+
+
+def sample_chunks():
+    """Returns named chunks covering the serializer's encodings."""
+    air = Chunk((0, 0, 0))
+    air.fill_region(AIR)
+
+    layered = Chunk((0, 0, 0))
+    layered.fill_region(AIR)
+    layered.fill_region(STONE, y=slice(0, 6))
+    layered.fill_region(DIRT, y=slice(6, 8))
+
+    noise = Chunk((0, 0, 0))
+    rng = np.random.default_rng(0)
+    noise.load_block_ids(rng.choice([AIR.id, DIRT.id, STONE.id], size=(16, 16, 16)).astype(np.uint16))
+
+    return {
+        "all air": air,
+        "layered": layered,
+        "terrain": Chunk((0, 0, 0), seed=1),
+        "random noise": noise,
+    }
+
+
+def measure(function, repeat=200):
+    """Returns the best average time of a call, in microseconds."""
+    return min(timeit.repeat(function, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    print(f"{'chunk':<14}{'bytes':>8}{'pickle bytes':>14}{'encode us':>11}{'decode us':>11}{'pickle us':>11}{'unpickle us':>13}")
+    for name, chunk in sample_chunks().items():
+        data = serialize_chunk(chunk)
+        pickled = pickle.dumps(chunk.blocks)
+        print(
+            f"{name:<14}{len(data):>8}{len(pickled):>14}"
+            f"{measure(lambda: serialize_chunk(chunk)):>11.1f}"
+            f"{measure(lambda: deserialize_chunk(data, chunk.position)):>11.1f}"
+            f"{measure(lambda: pickle.dumps(chunk.blocks)):>11.1f}"
+            f"{measure(lambda: pickle.loads(pickled)):>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures one physics tick over many entities falling onto and resting on generated terrain,
+to compare against the budget of 5 ms for 10,000 entities. The terrain is two chunks high and
+the entities are dropped from the open air above it.
+
+Run from the repository root with ``python -m benchmarks.entity_physics_benchmark``.
+"""
+
+import time
+
+import numpy as np
+
+from src.game.chunk import Chunk
+from src.game.chunk_index import ChunkIndex
+from src.game.game_loop import TICK_RATE
+from src.physics.entity_store import EntityFlag, EntityStore
+from src.physics.physics import Physics
+
+SIZE = Chunk.CHUNK_SIZE
+ENTITY_SIZE = (0.6, 1.8, 0.6)
+
+
+def load_terrain(radius, seed=0):
+    """Generates a square of two-chunk-high columns; returns an index over them standing in for the world."""
+    chunks = {}
+    for x in range(-radius, radius + 1):
+        for z in range(-radius, radius + 1):
+            for y in (0, 1):
+                chunks[(x, y, z)] = Chunk((x * SIZE, y * SIZE, z * SIZE), seed)
+    return ChunkIndex(chunks)
+
+
+def spawn(count, radius, seed=0):
+    """Returns a store of entities scattered in the air over the terrain, dropped from rest so that they settle."""
+    rng = np.random.default_rng(seed)
+    extent = (radius + 1) * SIZE - 1
+    positions = rng.uniform((-radius * SIZE, 2 * SIZE, -radius * SIZE), (extent, 3 * SIZE, extent), (count, 3))
+    store = EntityStore(capacity=count)
+    store.add_many(positions, ENTITY_SIZE)
+    return store
+
+
+def tick_cost(world, physics, store, ticks):
+    """Returns (mean, worst) milliseconds per tick over the given number of ticks."""
+    timings = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        physics.step(world, store, 1.0 / TICK_RATE)
+        timings.append(time.perf_counter() - start)
+    return np.mean(timings) * 1000, np.max(timings) * 1000
+
+
+def main():
+    radius = 3
+    world = load_terrain(radius)
+    world.refresh()
+    for count in (1000, 10000):
+        store = spawn(count, radius)
+        physics = Physics()
+        # A second of falling covers the drop from the highest spawn to the surface, landings included;
+        # by then the entities lie still on the ground and sleep
+        falling = tick_cost(world, physics, store, TICK_RATE)
+        tick_cost(world, physics, store, TICK_RATE // 2)
+        resting = tick_cost(world, physics, store, 50)
+        on_ground = np.count_nonzero(store.flags[:store.count] & EntityFlag.ON_GROUND)
+        print(f"{count} entities: falling {falling[0]:.2f} ms mean, {falling[1]:.2f} ms worst; "
+              f"resting {resting[0]:.2f} ms mean, {resting[1]:.2f} ms worst ({on_ground} on the ground)")
+
+
+if __name__ == "__main__":
+    main()
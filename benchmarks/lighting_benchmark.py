@@ -0,0 +1,63 @@
+"""
+Measures the cost of lighting freshly loaded chunks and of relighting single block edits,
+for growing worlds, to show that an edit costs the same however many chunks are loaded.
+
+Run from the repository root with ``python -m benchmarks.lighting_benchmark``.
+"""
+
+import time
+
+import numpy as np
+
+from src.game.block_registry import AIR, GLOWSTONE, STONE
+from src.game.chunk import Chunk
+from src.game.lighting import LightEngine
+
+SIZE = Chunk.CHUNK_SIZE
+
+
+def load_world(radius, seed=0):
+    """Generates and lights a square of two-chunk-high columns; returns the engine and milliseconds per chunk."""
+    chunks = {}
+    engine = LightEngine(chunks)
+    elapsed = 0.0
+    for x in range(-radius, radius + 1):
+        for z in range(-radius, radius + 1):
+            # Top chunk first, so the one below is lit under it instead of under open sky
+            for y in (1, 0):
+                coords = (x, y, z)
+                chunks[coords] = Chunk((x * SIZE, y * SIZE, z * SIZE), seed)
+                start = time.perf_counter()
+                engine.light_chunk(coords)
+                elapsed += time.perf_counter() - start
+    return engine, elapsed / len(chunks) * 1000
+
+
+def edit_cost(engine, block_type, count=200, seed=0):
+    """Returns (mean, worst) milliseconds to relight after setting random cells near the origin and back."""
+    rng = np.random.default_rng(seed)
+    timings = []
+    for _ in range(count):
+        x, y, z = (int(value) for value in rng.integers((-SIZE, 0, -SIZE), (SIZE, 2 * SIZE, SIZE)))
+        chunk = engine.chunks[(x // SIZE, y // SIZE, z // SIZE)]
+        local = (x % SIZE, y % SIZE, z % SIZE)
+        previous = chunk.get_block(*local)
+        for new_type in (block_type, previous):
+            chunk.set_block(*local, new_type)
+            start = time.perf_counter()
+            engine.update_block(x, y, z)
+            timings.append(time.perf_counter() - start)
+    return np.mean(timings) * 1000, np.max(timings) * 1000
+
+
+def main():
+    for radius in (1, 3, 5):
+        engine, chunk_milliseconds = load_world(radius)
+        print(f"{len(engine.chunks)} chunks: {chunk_milliseconds:.2f} ms to light each chunk")
+        for block_type in (STONE, GLOWSTONE, AIR):
+            mean, worst = edit_cost(engine, block_type)
+            print(f"  {block_type.name} edits: {mean:.3f} ms mean, {worst:.2f} ms worst")
+
+
+if __name__ == "__main__":
+    main()
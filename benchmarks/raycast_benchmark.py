@@ -0,0 +1,64 @@
+"""
+Measures batched voxel raycasts over generated terrain: block picking at reach distance,
+mob line-of-sight checks through open air, and sound occlusion counts.
+
+Run from the repository root with ``python -m benchmarks.raycast_benchmark``.
+"""
+
+import time
+
+import numpy as np
+
+from src.game.chunk import Chunk
+from src.game.chunk_index import ChunkIndex
+from src.physics.raycast import Raycaster
+
+SIZE = Chunk.CHUNK_SIZE
+
+
+def load_terrain(radius, seed=0):
+    """Generates a square of two-chunk-high columns; returns an index over them standing in for the world."""
+    chunks = {}
+    for x in range(-radius, radius + 1):
+        for z in range(-radius, radius + 1):
+            for y in (0, 1):
+                chunks[(x, y, z)] = Chunk((x * SIZE, y * SIZE, z * SIZE), seed)
+    index = ChunkIndex(chunks)
+    index.refresh()
+    return index
+
+
+def timed(function, repeats=5):
+    """Returns the result of the last call and the mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+    return result, (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    radius = 3
+    world = load_terrain(radius)
+    raycaster = Raycaster()
+    rng = np.random.default_rng(0)
+    extent = radius * SIZE
+
+    for count in (1, 1000, 10000):
+        origins = rng.uniform((-extent, SIZE, -extent), (extent, 2 * SIZE, extent), (count, 3))
+        directions = rng.normal(size=(count, 3))
+        (hits, _, _, _), milliseconds = timed(lambda: raycaster.cast_many(world, origins, directions, 5.0))
+        print(f"{count} picks within 5 blocks: {milliseconds:.2f} ms ({hits.mean():.0%} hit)")
+
+    for count, distance in ((1000, 16), (4096, 32)):
+        # Mobs and targets high above the terrain, so most rays travel their whole length
+        origins = rng.uniform((-extent, 2 * SIZE, -extent), (extent, 3 * SIZE, extent), (count, 3))
+        offsets = rng.normal(size=(count, 3))
+        targets = origins + offsets / np.linalg.norm(offsets, axis=1)[:, None] * distance
+        visible, milliseconds = timed(lambda: raycaster.line_of_sight(world, origins, targets))
+        print(f"{count} line-of-sight checks over {distance} blocks: {milliseconds:.2f} ms ({visible.mean():.0%} visible)")
+        counts, milliseconds = timed(lambda: raycaster.occluding_blocks(world, origins, targets))
+        print(f"{count} occlusion counts over {distance} blocks: {milliseconds:.2f} ms ({counts.mean():.1f} blocks on average)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+from typing import Optional, Union
+
+import numpy as np
+
+from src.game.block import Block
+
+
+class BlockType:
+    """Immutable definition shared by every voxel of the same kind."""
+
+    __slots__ = ("id", "name", "texture", "hardness", "light_level", "opaque", "solid")
+
+    def __init__(self, block_id, name, texture, hardness=1, light_level=0, opaque=True, solid=True):
+        """
+        Initializes a BlockType object.
+
+        Args:
+            block_id (int): Numeric ID stored in chunk data.
+            name (str): Unique name of the block type (e.g., "stone").
+            texture (Optional[str]): Texture file name, or None for invisible blocks.
+            hardness (Union[int, float], optional): How difficult it is to break the block. Defaults to 1.
+            light_level (int, optional): Amount of light emitted by the block (0-15). Defaults to 0.
+            opaque (bool, optional): Whether the block blocks light and hides neighbouring faces. Defaults to True.
+            solid (bool, optional): Whether entities collide with the block. Defaults to True.
+        """
+
+        if not isinstance(hardness, (int, float)):
+            raise TypeError("Hardness must be a number")
+        if light_level < 0 or light_level > 15:
+            raise ValueError("Light level must be between 0 and 15")
+
+        object.__setattr__(self, "id", block_id)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "texture", texture)
+        object.__setattr__(self, "hardness", hardness)
+        object.__setattr__(self, "light_level", light_level)
+        object.__setattr__(self, "opaque", opaque)
+        object.__setattr__(self, "solid", solid)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BlockType is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("BlockType is immutable")
+
+    def __reduce__(self):
+        # Pickling would restore the slots through __setattr__, so rebuild through the constructor instead
+        return BlockType, (self.id, self.name, self.texture, self.hardness, self.light_level, self.opaque, self.solid)
+
+    def get_texture(self) -> Optional[str]:
+        """Returns the block type's texture file name."""
+        return self.texture
+
+    def get_hardness(self) -> Union[int, float]:
+        """Returns the block type's hardness."""
+        return self.hardness
+
+    def get_light_level(self) -> int:
+        """Returns the light level emitted by the block type."""
+        return self.light_level
+
+    def __repr__(self):
+        return f"BlockType(id={self.id}, name={self.name!r})"
+
+    def __str__(self):
+        """Provides a string representation of the BlockType."""
+        return (f"BlockType(id={self.id}, name={self.name}, texture={self.texture}, hardness={self.hardness}, "
+                f"light_level={self.light_level}, opaque={self.opaque}, solid={self.solid})")
+
+
+class BlockRegistry:
+    """Maps numeric block IDs to shared BlockType definitions and per-ID lookup tables."""
+
+    MAX_BLOCK_TYPES = np.iinfo(np.uint16).max + 1
+
+    def __init__(self):
+        self._types = []
+        self._by_name = {}
+
+        # ID-indexed lookup tables, rebuilt whenever a block type is registered
+        self.hardness = np.zeros(0, dtype=np.float32)
+        self.opacity = np.zeros(0, dtype=np.uint8)
+        self.light_emission = np.zeros(0, dtype=np.uint8)
+        self.solid = np.zeros(0, dtype=bool)
+        self.visible = np.zeros(0, dtype=bool)
+
+    def register(self, name, texture, hardness=1, light_level=0, opaque=True, solid=True):
+        """
+        Registers a new block type under the next free ID.
+
+        Args:
+            name (str): Unique name of the block type.
+            texture (Optional[str]): Texture file name, or None for invisible blocks.
+            hardness (Union[int, float], optional): How difficult it is to break the block. Defaults to 1.
+            light_level (int, optional): Amount of light emitted by the block (0-15). Defaults to 0.
+            opaque (bool, optional): Whether the block blocks light and hides neighbouring faces. Defaults to True.
+            solid (bool, optional): Whether entities collide with the block. Defaults to True.
+
+        Returns:
+            BlockType: The registered block type.
+
+        Raises:
+            ValueError: If the name is already taken or the registry is full.
+        """
+
+        if name in self._by_name:
+            raise ValueError(f"Block type {name!r} is already registered")
+        if len(self._types) >= self.MAX_BLOCK_TYPES:
+            raise ValueError("Block registry is full")
+
+        block_type = BlockType(len(self._types), name, texture, hardness, light_level, opaque, solid)
+        self._types.append(block_type)
+        self._by_name[name] = block_type
+        self._rebuild_tables()
+        return block_type
+
+    def _rebuild_tables(self):
+        self.hardness = self._table([t.hardness for t in self._types], np.float32)
+        self.opacity = self._table([15 if t.opaque else 0 for t in self._types], np.uint8)
+        self.light_emission = self._table([t.light_level for t in self._types], np.uint8)
+        self.solid = self._table([t.solid for t in self._types], bool)
+        self.visible = self._table([t.texture is not None for t in self._types], bool)
+
+    @staticmethod
+    def _table(values, dtype):
+        table = np.array(values, dtype=dtype)
+        table.setflags(write=False)
+        return table
+
+    def get(self, key):
+        """
+        Resolves a block type from an ID, a name, a BlockType or a legacy Block.
+
+        Args:
+            key (Union[int, str, BlockType, Block]): The value to resolve. A Block is
+                resolved by its texture, which holds the block type name.
+
+        Returns:
+            BlockType: The shared block type definition.
+
+        Raises:
+            KeyError: If no block type matches.
+            TypeError: If the key has an unsupported type.
+        """
+
+        if isinstance(key, BlockType):
+            return key
+        if isinstance(key, Block):
+            key = key.get_texture()
+        if isinstance(key, str):
+            return self._by_name[key]
+        if isinstance(key, (int, np.integer)):
+            if not 0 <= key < len(self._types):
+                raise KeyError(key)
+            return self._types[key]
+        raise TypeError(f"Cannot resolve a block type from {key!r}")
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self._types)
+
+    def __iter__(self):
+        return iter(self._types)
+
+
+BLOCK_REGISTRY = BlockRegistry()
+
+AIR = BLOCK_REGISTRY.register("air", None, hardness=0, opaque=False, solid=False)
+STONE = BLOCK_REGISTRY.register("stone", "stone.png", hardness=1.5)
+DIRT = BLOCK_REGISTRY.register("dirt", "dirt.png", hardness=0.5)
+GLOWSTONE = BLOCK_REGISTRY.register("glowstone", "glowstone.png", hardness=0.3, light_level=15)
@@ -1,150 +1,267 @@
 import numpy as np
-from OpenGL.GL import glGetFloatv
-from OpenGL.raw.GL.VERSION.GL_1_0 import GL_MODELVIEW_MATRIX, glLoadMatrixf, glPushMatrix, glPopMatrix
 
 from src.game.block import Block
-from src.rendering.shader import Shader
+from src.game.block_registry import BLOCK_REGISTRY, BlockType
+from src.game.chunk_journal import ChangeJournal, DirtyFlag
+from src.game.noise import generate_noise
 
 
 class Chunk:
     """Represents a chunk of the game world."""
 
     CHUNK_SIZE = 16
+    MAX_PALETTE_SIZE = np.iinfo(np.uint16).max + 1
 
-    def __init__(self, position):
+    # Terrain noise parameters
+    NOISE_SCALE = 10
+    NOISE_OCTAVES = 6
+    NOISE_PERSISTENCE = 0.5
+    NOISE_LACUNARITY = 2.0
+
+    # Voxel merge factors of the level-of-detail versions, from full resolution down
+    LOD_FACTORS = (1, 2, 4, 8)
+
+    def __init__(self, position, seed=0, registry=BLOCK_REGISTRY, block_ids=None):
         """
         Initializes a Chunk object.
 
+        Voxels are stored as a dense ``uint16`` array of palette indices, indexed as
+        ``blocks[x, y, z]``. The palette maps each index to a shared BlockType from the
+        block registry, so a chunk costs 8 KiB of voxel data no matter how many blocks it holds.
+
         Args:
             position (Tuple[int, int, int]): X, Y, and Z coordinates of the chunk's origin.
+            seed (int, optional): World seed used for terrain generation. Defaults to 0.
+            registry (BlockRegistry, optional): Registry that block types resolve against.
+                Defaults to the global block registry.
+            block_ids (np.ndarray, optional): Existing (16, 16, 16) registry block IDs to load
+                instead of generating terrain, e.g. from a generation worker.
         """
 
         self.position = position
-        self.blocks = self.generate_blocks()
+        self.seed = seed
+        self.registry = registry
+        self.palette = []
+        self._palette_lookup = {}
+        self._palette_ids = np.zeros(0, dtype=np.uint16)
+        # Subsystems that still have to catch up with the chunk, and the edits they can replay
+        self.dirty = DirtyFlag.ALL
+        self.journal = ChangeJournal()
+        # How the renderer meshes the chunk: "greedy" merges coplanar faces, "naive" emits one quad per face
+        self.mesh_mode = "greedy"
+        # Skylight and block light levels (0-15) per voxel, filled in by the world's LightEngine
+        self.sky_light = np.zeros((self.CHUNK_SIZE,) * 3, dtype=np.uint8)
+        self.block_light = np.zeros((self.CHUNK_SIZE,) * 3, dtype=np.uint8)
+        if block_ids is None:
+            self.blocks = self.generate_blocks()
+        else:
+            self.blocks = self.load_block_ids(block_ids)
 
     def generate_blocks(self):
         """
-        Generates blocks for the chunk using basic procedural noise.
+        Generates blocks for the chunk from seeded fractal Perlin noise.
 
-        This method uses NumPy's random number generator for a basic noise
-        generation approach. You can replace this with more sophisticated noise
-        libraries or techniques for enhanced terrain generation.
+        The noise is sampled at world coordinates, so neighbouring chunks line up and
+        the same seed and position always produce the same blocks. The whole chunk is
+        evaluated in one vectorized pass over an open coordinate grid.
 
         Returns:
-            List[Block]: A list of Block objects representing the terrain in the chunk.
-        """
-
-        blocks = []
-        scale = 10
-        octaves = 6
-        persistence = 0.5
-        lacunarity = 2.0
-
-        for x in range(self.CHUNK_SIZE):
-            for y in range(self.CHUNK_SIZE):
-                for z in range(self.CHUNK_SIZE):
-                    noise_value = generate_noise(
-                        x / scale,
-                        y / scale,
-                        z / scale,
-                        octaves=octaves,
-                        persistence=persistence,
-                        lacunarity=lacunarity,
-                    )
-                    block_type = self.determine_block_type(noise_value)
-                    block = Block((x, y, z), block_type)
-                    blocks.append(block)
-        return blocks
-
-    def determine_block_type(self, noise_value):
-        """
-        Maps the noise value to a block type based on thresholds.
+            np.ndarray: A (16, 16, 16) ``uint16`` array of palette indices.
+        """
+
+        local = np.arange(self.CHUNK_SIZE, dtype=np.float64)
+        noise_values = generate_noise(
+            (self.position[0] + local)[:, None, None],
+            (self.position[1] + local)[None, :, None],
+            (self.position[2] + local)[None, None, :],
+            seed=self.seed,
+            scale=self.NOISE_SCALE,
+            octaves=self.NOISE_OCTAVES,
+            persistence=self.NOISE_PERSISTENCE,
+            lacunarity=self.NOISE_LACUNARITY,
+        )
+        return self.load_block_ids(self.determine_block_type(noise_values))
+
+    def determine_block_type(self, noise_values):
+        """
+        Maps noise values to block IDs based on thresholds.
 
         You can adjust the thresholds and block types to create different terrain patterns.
+        Values above 0.6 become stone, values above 0.4 become dirt and the rest is air.
 
         Args:
-            noise_value (float): Noise value between 0 and 1.
+            noise_values (np.ndarray): Noise values between 0 and 1.
 
         Returns:
-            str: The type of block based on the noise value (e.g., "air", "dirt", "stone").
+            np.ndarray: Registry block IDs, shaped like ``noise_values``.
         """
 
-        if noise_value > 0.6:
-            return "stone"
-        elif noise_value > 0.4:
-            return "dirt"
-        else:
-            return "air"
+        terrain_ids = np.array(
+            [self.registry.get(name).id for name in ("air", "dirt", "stone")], dtype=np.uint16
+        )
+        return terrain_ids[np.digitize(noise_values, (0.4, 0.6), right=True)]
 
-    def update(self, delta_time):
+    def load_block_ids(self, block_ids):
         """
-        Updates the chunk based on game logic and time passed.
+        Replaces the chunk's contents with an array of registry block IDs.
 
-        This is a placeholder for potential updates like gravity, block interactions,
-        or dynamic changes in the environment.
+        The palette is rebuilt to hold exactly the block types present. Since every voxel
+        may have changed, the chunk is marked fully dirty and every journal cursor must rebuild.
 
         Args:
-            delta_time (float): Time elapsed since the last update in seconds.
+            block_ids (np.ndarray): A (16, 16, 16) array of registry block IDs.
+
+        Returns:
+            np.ndarray: The new (16, 16, 16) ``uint16`` array of palette indices.
         """
 
-        # Implement your update logic here (e.g., block physics, particle effects)
-        pass
+        # Block IDs are small integers, so counting them is cheaper than sorting for np.unique
+        flat = np.asarray(block_ids, dtype=np.uint16).reshape(-1)
+        ids = np.flatnonzero(np.bincount(flat)).astype(np.uint16)
+        remap = np.zeros(int(ids[-1]) + 1, dtype=np.uint16)
+        remap[ids] = np.arange(len(ids), dtype=np.uint16)
+
+        self.palette = [self.registry.get(int(block_id)) for block_id in ids]
+        self._palette_lookup = {block_type.id: index for index, block_type in enumerate(self.palette)}
+        self._palette_ids = ids
+        self.blocks = remap[flat].reshape((self.CHUNK_SIZE,) * 3)
+        self.dirty = DirtyFlag.ALL
+        self.journal.invalidate()
+        return self.blocks
+
+    def palette_index(self, block_type):
+        """
+        Returns the palette index of a block type, adding it to the palette if needed.
 
-    def render(self, block_renderer):
+        Args:
+            block_type (Union[BlockType, str, int, Block]): The block type, or anything the
+                registry can resolve to one (e.g., "air", "dirt", "stone").
+
+        Returns:
+            int: Index of the block type in this chunk's palette.
+
+        Raises:
+            ValueError: If the palette is full.
+        """
+
+        block_type = self.registry.get(block_type)
+        index = self._palette_lookup.get(block_type.id)
+        if index is None:
+            if len(self.palette) >= self.MAX_PALETTE_SIZE:
+                raise ValueError("Chunk palette is full")
+            index = len(self.palette)
+            self.palette.append(block_type)
+            self._palette_lookup[block_type.id] = index
+            self._palette_ids = np.append(self._palette_ids, np.uint16(block_type.id))
+        return index
+
+    def palette_ids(self):
+        """Returns the registry ID of every palette entry as a ``uint16`` array."""
+        return self._palette_ids
+
+    def block_ids(self):
+        """
+        Returns the registry ID of every voxel.
+
+        Returns:
+            np.ndarray: A (16, 16, 16) ``uint16`` array of block IDs.
+        """
+
+        return self._palette_ids[self.blocks]
+
+    def lookup(self, table):
         """
-        Renders the blocks in the chunk using the provided block renderer.
+        Maps every voxel through an ID-indexed lookup table.
+
+        The table is first gathered down to the palette, so the per-voxel work is a
+        single indexing pass regardless of how many block types are registered.
 
         Args:
-            block_renderer (BlockRenderer): An object responsible for rendering blocks.
+            table (np.ndarray): A registry lookup table, e.g. ``registry.solid``.
+
+        Returns:
+            np.ndarray: A (16, 16, 16) array of table values.
         """
 
-        for block in self.blocks:
-            # Get the current modelview matrix
-            model_matrix = glGetFloatv(GL_MODELVIEW_MATRIX)
+        return np.asarray(table)[self._palette_ids][self.blocks]
 
-            # Create a translation matrix using the block's position
-            translation_matrix = np.array([
-                [1, 0, 0, block.get_position()[0]],
-                [0, 1, 0, block.get_position()[1]],
-                [0, 0, 1, block.get_position()[2]],
-                [0, 0, 0, 1]
-            ])
+    def lod_block_ids(self, factor):
+        """
+        Returns a downsampled copy of the chunk for level-of-detail meshing.
 
-            # Multiply the current modelview matrix by the translation matrix
-            model_matrix = np.matmul(model_matrix, translation_matrix)
+        Every factor x factor x factor cell becomes one voxel. The cell is opaque if at least
+        half of its voxels are, and then takes its most common opaque block type, so the
+        surface keeps its material; otherwise it takes its most common non-opaque type.
 
-            # Convert the model matrix to GLfloat before loading
-            model_matrix = model_matrix.astype(np.float32)
+        Args:
+            factor (int): One of LOD_FACTORS.
 
-            # Load the new model matrix
-            glLoadMatrixf(model_matrix)
-            glPushMatrix()  # Push the matrix to avoid side effects
+        Returns:
+            np.ndarray: A (16 / factor,) * 3 ``uint16`` array of block IDs.
 
-            # Render the block
-            block_renderer.render_block(block, model_matrix)
+        Raises:
+            ValueError: If the factor is not one of LOD_FACTORS.
+        """
 
-            glPopMatrix()  # Pop the matrix after rendering
+        if factor not in self.LOD_FACTORS:
+            raise ValueError(f"LOD factor must be one of {self.LOD_FACTORS}")
+        if factor == 1:
+            return self.block_ids()
+
+        cells = self.CHUNK_SIZE // factor
+        palette_size = len(self.palette)
+        # Gather each cell's voxels along the last axis, then count palette entries per cell
+        grouped = self.blocks.reshape(cells, factor, cells, factor, cells, factor).transpose(0, 2, 4, 1, 3, 5)
+        grouped = grouped.reshape(cells ** 3, factor ** 3).astype(np.int64)
+        offsets = np.arange(cells ** 3)[:, None] * palette_size
+        counts = np.bincount((grouped + offsets).reshape(-1), minlength=cells ** 3 * palette_size)
+        counts = counts.reshape(cells ** 3, palette_size)
+
+        opaque = np.asarray(self.registry.opacity)[self._palette_ids] > 0
+        is_opaque = counts[:, opaque].sum(axis=1) * 2 >= factor ** 3
+        winners = np.where(
+            is_opaque,
+            np.where(opaque, counts, -1).argmax(axis=1),
+            np.where(opaque, -1, counts).argmax(axis=1),
+        )
+        return self._palette_ids[winners].reshape((cells,) * 3)
+
+    def update(self, delta_time):
+        """
+        Updates the chunk based on game logic and time passed.
+
+        This is a placeholder for potential updates like gravity, block interactions,
+        or dynamic changes in the environment.
+
+        Args:
+            delta_time (float): Time elapsed since the last update in seconds.
+        """
+
+        # Implement your update logic here (e.g., block physics, particle effects)
+        pass
 
     def get_block(self, x, y, z):
         """
         Retrieves the block at the specified coordinates within the chunk.
 
+        The returned BlockType is shared by every voxel of the same kind, so no
+        object is created per call.
+
         Args:
             x (int): X coordinate within the chunk (0-15).
             y (int): Y coordinate within the chunk (0-15).
             z (int): Z coordinate within the chunk (0-15).
 
         Returns:
-            Block: The block object at the specified coordinates, or None if out of bounds.
+            BlockType: The block type at the specified coordinates, or None if out of bounds.
         """
 
         if 0 <= x < self.CHUNK_SIZE and 0 <= y < self.CHUNK_SIZE and 0 <= z < self.CHUNK_SIZE:
-            index = x + y * self.CHUNK_SIZE + z * self.CHUNK_SIZE * self.CHUNK_SIZE
-            return self.blocks[index]
+            return self.palette[self.blocks[x, y, z]]
         else:
             return None
 
-    def set_block(self, x, y, z, block):
+    def set_block(self, x, y, z, block, tick=0):
         """
         Sets the block at the specified coordinates within the chunk.
 
@@ -152,65 +269,133 @@ class Chunk:
             x (int): X coordinate within the chunk (0-15).
             y (int): Y coordinate within the chunk (0-15).
             z (int): Z coordinate within the chunk (0-15).
-            block (Block): The Block object to set at the specified coordinates.
+            block (Union[BlockType, Block]): The block type to set at the specified coordinates.
+                A legacy Block is resolved through its texture name.
+            tick (int, optional): World tick recorded in the change journal. Defaults to 0.
 
         Raises:
-            ValueError: If the provided coordinates are out of bounds or the block is not a Block object.
+            ValueError: If the provided coordinates are out of bounds or the block is not a block type.
         """
 
-        if not isinstance(block, Block):
-            raise ValueError("block must be a Block object")
+        if not isinstance(block, (BlockType, Block)):
+            raise ValueError("block must be a BlockType or Block object")
 
         if 0 <= x < self.CHUNK_SIZE and 0 <= y < self.CHUNK_SIZE and 0 <= z < self.CHUNK_SIZE:
-            index = x + y * self.CHUNK_SIZE + z * self.CHUNK_SIZE * self.CHUNK_SIZE
-            self.blocks[index] = block
+            old_index = self.blocks[x, y, z]
+            new_index = self.palette_index(block)
+            if new_index == old_index:
+                return
 
-            # Optional: Update neighboring blocks or chunk data as needed
-            # based on the block change (e.g., gravity, light propagation)
+            self.blocks[x, y, z] = new_index
+            self.journal.record(
+                ((x, y, z),), self._palette_ids[old_index], self._palette_ids[new_index], tick
+            )
+            self.dirty |= DirtyFlag.ALL
 
         else:
             raise ValueError("Coordinates are out of bounds")
 
+    def get_region(self, x=slice(None), y=slice(None), z=slice(None)):
+        """
+        Returns a view of the palette indices inside a region of the chunk.
+
+        Args:
+            x (slice, optional): X range within the chunk. Defaults to the whole axis.
+            y (slice, optional): Y range within the chunk. Defaults to the whole axis.
+            z (slice, optional): Z range within the chunk. Defaults to the whole axis.
+
+        Returns:
+            np.ndarray: A view into the chunk's block array; writes go through to the chunk but
+            bypass the change journal, so call mark_dirty() and ``journal.invalidate()`` after
+            writing through it.
+        """
+
+        return self.blocks[x, y, z]
 
-def generate_noise(x, y, z, scale=1, octaves=6, persistence=0.5, lacunarity=2.0):
-  """
-  Generates a simple noise value using NumPy's random number generator.
+    def fill_region(self, block_type, x=slice(None), y=slice(None), z=slice(None), tick=0):
+        """
+        Sets every voxel inside a region of the chunk to the same block type.
+
+        Args:
+            block_type (Union[BlockType, str]): The block type to fill with.
+            x (slice, optional): X range within the chunk. Defaults to the whole axis.
+            y (slice, optional): Y range within the chunk. Defaults to the whole axis.
+            z (slice, optional): Z range within the chunk. Defaults to the whole axis.
+            tick (int, optional): World tick recorded in the change journal. Defaults to 0.
+        """
+
+        positions = LOCAL_POSITIONS[:, x, y, z].reshape(3, -1).T
+        self.set_blocks(positions, block_type, tick)
+
+    def set_blocks(self, positions, block_type, tick=0):
+        """
+        Sets many voxels to the same block type, journaling the ones that change.
+
+        Args:
+            positions (np.ndarray): An (N, 3) array of local positions.
+            block_type (Union[BlockType, str]): The block type to set.
+            tick (int, optional): World tick recorded in the change journal. Defaults to 0.
+        """
 
-  This function implements a basic noise generation approach that is not equivalent to Perlin noise
-  provided by libraries like `pynoise`. It can be used as a starting point for further customization
-  or exploration of alternative noise generation techniques.
+        positions = np.asarray(positions).reshape(-1, 3)
+        new_index = self.palette_index(block_type)
+        old_indices = self.blocks[positions[:, 0], positions[:, 1], positions[:, 2]]
+        changed = old_indices != new_index
+        if not changed.any():
+            return
+
+        # A position listed twice is still one edit, so it is journaled once
+        _, first = np.unique(np.ravel_multi_index(positions[changed].T, self.blocks.shape), return_index=True)
+        positions = positions[changed][first]
+        old_indices = old_indices[changed][first]
+        self.blocks[positions[:, 0], positions[:, 1], positions[:, 2]] = new_index
+        self.journal.record(positions, self._palette_ids[old_indices], self._palette_ids[new_index], tick)
+        self.dirty |= DirtyFlag.ALL
+
+    def mark_dirty(self, flags=DirtyFlag.ALL):
+        """Marks subsystems as needing to catch up with the chunk."""
+        self.dirty |= flags
+
+    def set_mesh_mode(self, mode):
+        """
+        Switches how the chunk is meshed and schedules a mesh rebuild.
+
+        Args:
+            mode (str): "greedy" or "naive"; see src.rendering.chunk_mesher.
+        """
+
+        if mode != self.mesh_mode:
+            self.mesh_mode = mode
+            self.mark_dirty(DirtyFlag.MESH)
 
-  Args:
-      x: X coordinate.
-      y: Y coordinate.
-      z: Z coordinate.
-      scale: Scale factor for the noise (default: 1).
-      octaves: Number of octaves for the noise (more octaves increase detail, default: 6).
-      persistence: Persistence of the noise (higher means more roughness, default: 0.5).
-      lacunarity: Lacunarity of the noise (higher means more stretched features, default: 2.0).
+    def clear_dirty(self, flags):
+        """Marks subsystems as caught up with the chunk."""
+        self.dirty &= ~flags
 
-  Returns:
-      A noise value between 0 and 1.
-  """
+    def is_dirty(self, flags):
+        """Returns whether any of the given subsystems still has to catch up with the chunk."""
+        return bool(self.dirty & flags)
 
-  # Normalize coordinates
-  x /= scale
-  y /= scale
-  z /= scale
+    def mask(self, block_type):
+        """
+        Returns a boolean mask of the voxels holding the given block type.
+
+        Args:
+            block_type (Union[BlockType, str]): The block type to look for.
 
-  # Initialize noise value (using random number between 0 and 1)
-  noise_value = np.random.rand()
+        Returns:
+            np.ndarray: A (16, 16, 16) boolean array, True where the block type is present.
+        """
 
-  # Iterate over octaves (replace with Perlin noise implementation for a more accurate approach)
-  for i in range(octaves):
-    # Increase frequency and decrease amplitude for each octave
-    frequency = 2**i
-    amplitude = persistence**i
+        index = self._palette_lookup.get(self.registry.get(block_type).id)
+        if index is None:
+            return np.zeros(self.blocks.shape, dtype=bool)
+        return self.blocks == index
 
-    # Sample noise using simple linear interpolation (replace with Perlin noise function)
-    noise_sample = (np.random.rand() + np.random.rand()) / 2
+    def count(self, block_type):
+        """Returns the number of voxels holding the given block type."""
+        return int(np.count_nonzero(self.mask(block_type)))
 
-    # Add noise to the total noise value with scaled amplitude
-    noise_value += noise_sample * amplitude
 
-  return noise_value
\ No newline at end of file
+# Local (x, y, z) coordinates of every voxel, shaped (3, 16, 16, 16)
+LOCAL_POSITIONS = np.indices((Chunk.CHUNK_SIZE,) * 3)
@@ -0,0 +1,275 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
+
+from src.game.block_registry import BLOCK_REGISTRY
+from src.game.chunk import Chunk
+
+CHUNK_SHAPE = (Chunk.CHUNK_SIZE,) * 3
+SLOT_SIZE = int(np.prod(CHUNK_SHAPE)) * np.dtype(np.uint16).itemsize
+# Times a chunk is generated before a failing request is given up on
+MAX_ATTEMPTS = 3
+
+# Shared memory segments attached by this worker process, keyed by name
+_attached_buffers = {}
+# Registry the worker process generates chunks with, handed over by the initializer
+_registry = BLOCK_REGISTRY
+
+
+def _close_attached_buffers():
+    """Detaches the worker from every shared memory segment it attached."""
+    for buffer in _attached_buffers.values():
+        buffer.close()
+    _attached_buffers.clear()
+
+
+def _initialize_worker(registry=BLOCK_REGISTRY):
+    """
+    Worker initializer: stores the generator's registry and has the attached segments
+    closed when the worker process exits.
+
+    Args:
+        registry (BlockRegistry, optional): Registry the worker generates chunks with.
+            Defaults to the global block registry.
+    """
+
+    global _registry
+    _registry = registry
+    # Worker processes skip atexit handlers, but run multiprocessing's finalizers on the way out
+    util.Finalize(None, _close_attached_buffers, exitpriority=0)
+
+
+def _generate_into_slot(position, seed, buffer_name, slot):
+    """
+    Worker entry point: generates a chunk and writes its block IDs into a shared slot.
+
+    Only the slot index travels back to the main process, so no block data is pickled.
+
+    Args:
+        position (Tuple[int, int, int]): World position of the chunk's origin.
+        seed (int): World seed.
+        buffer_name (str): Name of the shared memory segment holding the slots.
+        slot (int): Slot to write the chunk's block IDs into.
+
+    Returns:
+        int: The slot that was written.
+    """
+
+    buffer = _attached_buffers.get(buffer_name)
+    if buffer is None:
+        buffer = shared_memory.SharedMemory(name=buffer_name)
+        _attached_buffers[buffer_name] = buffer
+
+    target = np.ndarray(CHUNK_SHAPE, dtype=np.uint16, buffer=buffer.buf, offset=slot * SLOT_SIZE)
+    target[...] = Chunk(position, seed, _registry).block_ids()
+    return slot
+
+
+class ChunkGenerator:
+    """Generates chunks on a pool of worker processes, nearest to the focus point first."""
+
+    def __init__(self, seed=0, workers=None, registry=BLOCK_REGISTRY):
+        """
+        Initializes a ChunkGenerator object.
+
+        Args:
+            seed (int, optional): World seed. Defaults to 0.
+            workers (int, optional): Number of worker processes. Defaults to one less than
+                the number of CPUs. Zero generates chunks inline on the calling thread.
+            registry (BlockRegistry, optional): Registry the generated chunks use, in the
+                worker processes as well. Defaults to the global block registry.
+        """
+
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) - 1)
+        if workers < 0:
+            raise ValueError("workers must be zero or positive")
+
+        self.seed = seed
+        self.workers = workers
+        self.registry = registry
+        self.focus = (0, 0, 0)
+
+        self._queue = []
+        self._queued = set()
+        self._counter = itertools.count()
+        # Slot and future of each chunk being generated, by position
+        self._in_flight = {}
+        # Failed attempts of the requests that failed so far, by position
+        self._attempts = {}
+        # The last error of each request given up on after MAX_ATTEMPTS, by position
+        self.failed = {}
+
+        self._executor = None
+        self._buffer = None
+        self._free_slots = []
+        if workers > 0:
+            # Keep the backlog in flight short so a moving player reprioritizes quickly
+            max_in_flight = workers * 2
+            self._buffer = shared_memory.SharedMemory(create=True, size=max_in_flight * SLOT_SIZE)
+            self._free_slots = list(range(max_in_flight))
+            self._executor = self._create_executor()
+
+    def request(self, position):
+        """
+        Queues a chunk for generation.
+
+        Args:
+            position (Tuple[int, int, int]): World position of the chunk's origin.
+        """
+
+        if position in self._queued or position in self._in_flight:
+            return
+        self._queued.add(position)
+        heapq.heappush(self._queue, (self._distance(position), next(self._counter), position))
+
+    def cancel(self, position):
+        """
+        Drops a queued chunk request. Chunks already being generated still complete.
+
+        Args:
+            position (Tuple[int, int, int]): World position of the chunk's origin.
+        """
+
+        self._queued.discard(position)
+
+    def retain(self, predicate):
+        """
+        Drops every queued request whose position does not satisfy a predicate.
+
+        Args:
+            predicate (Callable[[Tuple[int, int, int]], bool]): Returns True for positions to keep.
+        """
+
+        self._queued = {position for position in self._queued if predicate(position)}
+
+    def set_focus(self, position):
+        """
+        Sets the point, usually the player's position, that requests are prioritized by.
+
+        Args:
+            position (Tuple[float, float, float]): The new focus point.
+        """
+
+        self.focus = tuple(position)
+        self._queue = [
+            (self._distance(queued), next(self._counter), queued)
+            for _, _, queued in self._queue
+            if queued in self._queued
+        ]
+        heapq.heapify(self._queue)
+
+    def pending(self):
+        """Returns the number of chunks queued or being generated."""
+        return len(self._queued) + len(self._in_flight)
+
+    def poll(self, max_chunks=None):
+        """
+        Collects finished chunks without waiting and dispatches queued requests.
+
+        Args:
+            max_chunks (int, optional): Maximum number of chunks to return. Without workers
+                this bounds how many chunks are generated inline. Defaults to no limit.
+
+        A chunk whose generation raised is queued again, up to MAX_ATTEMPTS times in all;
+        after that the request is dropped and its error kept in ``failed``. A worker that
+        dies, e.g. killed by the OS, breaks the pool; it is then replaced by a new one.
+
+        Returns:
+            List[Chunk]: The chunks that finished since the last poll.
+        """
+
+        if self._executor is None:
+            return self._generate_inline(max_chunks)
+
+        finished = []
+        for position, (slot, future) in list(self._in_flight.items()):
+            if max_chunks is not None and len(finished) >= max_chunks:
+                break
+            if not future.done():
+                continue
+
+            # The slot is free again whatever happened in the worker
+            del self._in_flight[position]
+            self._free_slots.append(slot)
+            try:
+                future.result()
+            except Exception as error:
+                self._retry(position, error)
+                continue
+            self._attempts.pop(position, None)
+            self.failed.pop(position, None)
+            block_ids = np.ndarray(CHUNK_SHAPE, dtype=np.uint16, buffer=self._buffer.buf, offset=slot * SLOT_SIZE)
+            finished.append(Chunk(position, self.seed, self.registry, block_ids=block_ids))
+
+        while self._free_slots:
+            position = self._pop_request()
+            if position is None:
+                break
+            slot = self._free_slots.pop()
+            try:
+                future = self._submit(position, slot)
+            except BrokenExecutor:
+                # A broken pool refuses new work; whatever was in flight on it fails and is retried
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+                future = self._submit(position, slot)
+            self._in_flight[position] = (slot, future)
+
+        return finished
+
+    def close(self):
+        """Stops the worker processes and releases the shared memory."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer.unlink()
+            self._buffer = None
+        self._in_flight.clear()
+
+    def _create_executor(self):
+        # The registry is pickled once per worker instead of with every request
+        return ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_initialize_worker,
+            initargs=(self.registry,)
+        )
+
+    def _submit(self, position, slot):
+        return self._executor.submit(_generate_into_slot, position, self.seed, self._buffer.name, slot)
+
+    def _retry(self, position, error):
+        attempts = self._attempts.get(position, 0) + 1
+        if attempts < MAX_ATTEMPTS:
+            self._attempts[position] = attempts
+            self.request(position)
+        else:
+            self._attempts.pop(position, None)
+            self.failed[position] = error
+
+    def _generate_inline(self, max_chunks):
+        finished = []
+        while max_chunks is None or len(finished) < max_chunks:
+            position = self._pop_request()
+            if position is None:
+                break
+            finished.append(Chunk(position, self.seed, self.registry))
+        return finished
+
+    def _pop_request(self):
+        while self._queue:
+            _, _, position = heapq.heappop(self._queue)
+            if position in self._queued:
+                self._queued.discard(position)
+                return position
+        return None
+
+    def _distance(self, position):
+        half = Chunk.CHUNK_SIZE / 2
+        return sum((position[axis] + half - self.focus[axis]) ** 2 for axis in range(3))
@@ -0,0 +1,249 @@
+from collections import deque
+
+import numpy as np
+
+from src.game.block_registry import AIR
+from src.game.chunk import Chunk
+
+# Chunk sizes are powers of two, so chunk coordinates and offsets within chunks are shifts and masks
+SHIFT = Chunk.CHUNK_SIZE.bit_length() - 1
+MASK = Chunk.CHUNK_SIZE - 1
+# Chunks are divided into bricks of 4x4x4 cells, each flagged if it holds anything but air
+BRICK_SHIFT = 2
+BRICKS_PER_AXIS = Chunk.CHUNK_SIZE >> BRICK_SHIFT
+# Number of refreshes whose changed chunks changed_chunks() can still report
+CHANGE_HISTORY = 256
+
+
+class ChunkIndex:
+    """
+    A dense copy of the block IDs of a dictionary of chunks for batched lookups.
+
+    The chunks' block IDs are stacked into one array and a small table maps chunk
+    coordinates to their slot in it, so looking up any number of cells is a handful of
+    vectorized index operations with no per-chunk grouping. Whoever loads, unloads or
+    edits a chunk reports it through mark_dirty(), as World does, and before every lookup
+    the copy catches up with just the reported chunks, so keeping it current costs
+    nothing for the chunks that did not change. An edited chunk is caught up by replaying
+    its change journal from the index's cursor, so only the edited cells are copied.
+
+    Every refresh that changes a copy advances ``version``, which lets callers ask which
+    chunks changed since they last looked, and a coarse grid of bricks records where there
+    is anything but air, so boxes in open air can be skipped without looking at their cells.
+    """
+
+    def __init__(self, chunks):
+        """
+        Initializes a ChunkIndex object.
+
+        Args:
+            chunks (Dict[Tuple[int, int, int], Chunk]): Loaded chunks by chunk coordinates.
+                The index keeps the reference; the chunks already in it are copied on the first
+                lookup, later changes once they are reported through mark_dirty().
+        """
+
+        self.chunks = chunks
+        size = Chunk.CHUNK_SIZE
+        self.blocks = np.zeros((0, size, size, size), dtype=np.uint16)
+        self.occupied_bricks = np.zeros((0,) + (BRICKS_PER_AXIS,) * 3, dtype=bool)
+        # Slot of each chunk by chunk coordinates relative to origin, or -1; the last layer is always -1
+        self.table = np.full((1, 1, 1), -1, dtype=np.int32)
+        self.origin = np.zeros(3, dtype=np.int64)
+        self._last = np.zeros(3, dtype=np.uint64)
+        # Whether any of the 2x2x2 bricks from each brick on is occupied, over the table's extent
+        # plus one brick below it; the last brick is always clear
+        self._occupied_pairs = np.zeros((1, 1, 1), dtype=bool)
+        self._brick_origin = np.zeros(3, dtype=np.int64)
+        self._last_brick = np.zeros(3, dtype=np.uint64)
+        # Slot of each copied chunk by chunk coordinates
+        self._entries = {}
+        self._free_slots = []
+        # Chunks added, removed or edited since the last refresh
+        self._dirty = set(chunks)
+        self.version = 0
+        # The chunks each of the latest refreshes changed, by the version it produced
+        self._history = deque(maxlen=CHANGE_HISTORY)
+
+    def mark_dirty(self, coords):
+        """
+        Reports that the chunk at the given coordinates was added to the dictionary, removed
+        from it or edited, so its copy is refreshed before the next lookup.
+        """
+
+        self._dirty.add(coords)
+
+    def refresh(self):
+        """Brings the copies of the chunks reported through mark_dirty() up to date."""
+        if not self._dirty:
+            return
+
+        layout_changed = False
+        changed = set()
+        for coords in self._dirty:
+            chunk = self.chunks.get(coords)
+            slot = self._entries.get(coords)
+            if chunk is None:
+                if slot is not None:
+                    self._free_slots.append(self._entries.pop(coords))
+                    layout_changed = True
+                    changed.add(coords)
+                continue
+            # The first read of a journal, or one the index fell behind, gives no edits to replay
+            edits = chunk.journal.consume(self)
+            if slot is None:
+                slot = self._entries[coords] = self._allocate_slot()
+                layout_changed = True
+                edits = None
+            if edits is None:
+                self.blocks[slot] = chunk.block_ids()
+                bricks = (self.blocks[slot] != AIR.id).reshape((BRICKS_PER_AXIS, 1 << BRICK_SHIFT) * 3)
+                self.occupied_bricks[slot] = bricks.any(axis=(1, 3, 5))
+            elif len(edits):
+                self._apply_edits(slot, edits)
+            else:
+                continue
+            changed.add(coords)
+        self._dirty.clear()
+        if not changed:
+            return
+
+        self.version += 1
+        self._history.append((self.version, frozenset(changed)))
+        if layout_changed:
+            self._rebuild_table()
+        self._rebuild_brick_grid()
+
+    def get_blocks(self, positions, default=AIR.id):
+        """
+        Retrieves the block IDs at many world positions at once.
+
+        Args:
+            positions (np.ndarray): An (N, 3) array of world positions.
+            default (int, optional): Block ID reported for positions in unloaded chunks.
+                Defaults to the ID of air.
+
+        Returns:
+            np.ndarray: An (N,) ``uint16`` array of registry block IDs.
+        """
+
+        self.refresh()
+        positions = np.asarray(positions).reshape(-1, 3)
+        if not self._entries:
+            return np.full(len(positions), default, dtype=np.uint16)
+        if positions.dtype.kind == "f":
+            positions = np.floor(positions)
+        cells = positions.astype(np.int64, copy=False)
+
+        slots = self._slots(cells >> SHIFT)
+        local = cells & MASK
+        offsets = (local[:, 0] << 2 * SHIFT) | (local[:, 1] << SHIFT) | local[:, 2]
+        block_ids = self.blocks.reshape(-1).take((slots.astype(np.int64) << 3 * SHIFT) | offsets, mode="clip")
+        return np.where(slots >= 0, block_ids, np.uint16(default))
+
+    def air_boxes(self, minimums, maximums):
+        """
+        Tells which boxes of cells certainly hold nothing but air, from the brick grid alone.
+
+        Boxes spanning more than two bricks along an axis are reported as not air, so this is
+        meant for boxes a few cells wide. Cells of unloaded chunks count as air.
+
+        Args:
+            minimums (np.ndarray): An (N, 3) integer array of the boxes' minimum cells.
+            maximums (np.ndarray): An (N, 3) integer array of the cells just past their maximum.
+
+        Returns:
+            np.ndarray: An (N,) bool array, True for boxes that are all air.
+        """
+
+        self.refresh()
+        minimums = np.asarray(minimums, dtype=np.int64).reshape(-1, 3)
+        maximums = np.asarray(maximums, dtype=np.int64).reshape(-1, 3)
+        small = np.ones(len(minimums), dtype=bool)
+        index = np.zeros(len(minimums), dtype=np.uint64)
+        for axis in range(3):
+            low = minimums[:, axis] >> BRICK_SHIFT
+            small &= ((maximums[:, axis] - 1) >> BRICK_SHIFT) - low <= 1
+            # As in _slots(), bricks outside the grid clamp to its last brick, which is always clear
+            brick = np.minimum((low - self._brick_origin[axis]).astype(np.uint64), self._last_brick[axis])
+            index = index * np.uint64(self._occupied_pairs.shape[axis]) + brick
+        return small & ~self._occupied_pairs.ravel().take(index)
+
+    def changed_chunks(self, since):
+        """
+        Returns the chunks that changed after a given version.
+
+        Args:
+            since (int): A version previously read from ``version``, or None.
+
+        Returns:
+            Tuple[int, Set[Tuple[int, int, int]]]: The current version and the coordinates of the
+            chunks added, removed or edited after ``since``; the set is None if ``since`` is None
+            or too old for the retained history, meaning any chunk may have changed.
+        """
+
+        self.refresh()
+        if since is not None and since >= self.version:
+            return self.version, set()
+        if since is None or self._history[0][0] > since + 1:
+            return self.version, None
+        return self.version, set().union(*(coords for version, coords in self._history if version > since))
+
+    def _apply_edits(self, slot, edits):
+        """Copies journaled edits into a chunk's slot and re-checks just the bricks they touched."""
+        size = Chunk.CHUNK_SIZE
+        offsets = np.ravel_multi_index((edits["x"], edits["y"], edits["z"]), (size,) * 3)
+        # A cell edited more than once holds the value of its last edit, the first one seen in reverse
+        offsets, last = np.unique(offsets[::-1], return_index=True)
+        self.blocks[slot].reshape(-1)[offsets] = edits["new_id"][::-1][last]
+        bricks = np.unique(np.stack(np.unravel_index(offsets, (size,) * 3), axis=1) >> BRICK_SHIFT, axis=0).T
+        cells = self.blocks[slot].reshape((BRICKS_PER_AXIS, 1 << BRICK_SHIFT) * 3)[bricks[0], :, bricks[1], :, bricks[2]]
+        self.occupied_bricks[slot][tuple(bricks)] = (cells != AIR.id).any(axis=(1, 2, 3))
+
+    def _slots(self, chunk_cells):
+        """Returns the slot of each of the (N, 3) chunk coordinates, or -1 where no chunk is copied."""
+        # Viewed as unsigned, chunks below the origin wrap around to huge indices, so one clamp sends
+        # every chunk outside the table to its empty last layer. Flat indices are then built column
+        # by column, which is much cheaper than reducing over rows
+        index = np.minimum((chunk_cells - self.origin).view(np.uint64), self._last)
+        _, rows, columns = self.table.shape
+        return self.table.ravel().take((index[:, 0] * rows + index[:, 1]) * columns + index[:, 2])
+
+    def _rebuild_brick_grid(self):
+        bricks = BRICKS_PER_AXIS
+        # Free and missing slots have no occupied bricks, so the table's empty cells need no special case
+        slots = np.where(self.table >= 0, self.table, len(self.occupied_bricks))
+        per_slot = np.concatenate((self.occupied_bricks, np.zeros((1,) + (bricks,) * 3, dtype=bool)))
+        grid = per_slot[slots].transpose(0, 3, 1, 4, 2, 5).reshape(tuple(np.array(self.table.shape) * bricks))
+        pairs = np.zeros(tuple(np.array(grid.shape) + 1), dtype=bool)
+        pairs[1:, 1:, 1:] = grid
+        pairs[:-1] |= pairs[1:]
+        pairs[:, :-1] |= pairs[:, 1:]
+        pairs[:, :, :-1] |= pairs[:, :, 1:]
+        self._occupied_pairs = pairs
+        self._brick_origin = self.origin * bricks - 1
+        self._last_brick = np.array(pairs.shape, dtype=np.uint64) - 1
+
+    def _allocate_slot(self):
+        if self._free_slots:
+            return self._free_slots.pop()
+        # The caller adds the new entry afterwards, so every slot in use is an entry or free
+        slot = len(self._entries) + len(self._free_slots)
+        if slot == len(self.blocks):
+            grown = np.zeros((max(16, slot * 2),) + self.blocks.shape[1:], dtype=np.uint16)
+            grown[:slot] = self.blocks
+            self.blocks = grown
+            occupied = np.zeros((len(grown),) + self.occupied_bricks.shape[1:], dtype=bool)
+            occupied[:slot] = self.occupied_bricks
+            self.occupied_bricks = occupied
+        return slot
+
+    def _rebuild_table(self):
+        if not self._entries:
+            self.table = np.full((1, 1, 1), -1, dtype=np.int32)
+            return
+        coords = np.array(list(self._entries), dtype=np.int64)
+        self.origin = coords.min(axis=0)
+        self.table = np.full(tuple(coords.max(axis=0) - self.origin + 2), -1, dtype=np.int32)
+        self._last = np.array(self.table.shape, dtype=np.uint64) - 1
+        index = coords - self.origin
+        self.table[index[:, 0], index[:, 1], index[:, 2]] = list(self._entries.values())
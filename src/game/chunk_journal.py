@@ -0,0 +1,127 @@
+from enum import IntFlag
+
+import numpy as np
+
+
+class DirtyFlag(IntFlag):
+    """Subsystems that have not yet caught up with a chunk's latest contents."""
+
+    NONE = 0
+    MESH = 1
+    LIGHT = 2
+    NETWORK = 4
+    SAVE = 8
+    ALL = MESH | LIGHT | NETWORK | SAVE
+
+
+# One journal entry: local position, block IDs before and after, and the world tick of the edit
+CHANGE_DTYPE = np.dtype([
+    ("x", np.uint8),
+    ("y", np.uint8),
+    ("z", np.uint8),
+    ("old_id", np.uint16),
+    ("new_id", np.uint16),
+    ("tick", np.uint32),
+])
+
+
+class ChangeJournal:
+    """A bounded ring buffer of block edits that subscribers read through cursors."""
+
+    def __init__(self, capacity=256):
+        """
+        Initializes a ChangeJournal object.
+
+        Args:
+            capacity (int, optional): Number of most recent edits kept. Subscribers that fall
+                further behind than this must rebuild from the full chunk. Defaults to 256.
+        """
+
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.entries = np.zeros(capacity, dtype=CHANGE_DTYPE)
+        # Sequence number of the next edit; edit n lives at entries[n % capacity]
+        self.head = 0
+        # Sequence number from which on the journal replays every change
+        self._start = 0
+        self.cursors = {}
+
+    @property
+    def tail(self):
+        """Returns the sequence number of the oldest edit still in the journal."""
+        return max(self._start, self.head - self.capacity)
+
+    def invalidate(self):
+        """
+        Records that the chunk changed in a way the journal cannot replay, e.g. was reloaded
+        as a whole, so every cursor taken before now has to rebuild from the full chunk.
+        """
+
+        # Skipping a sequence number leaves every earlier cursor behind the tail, even one at the head
+        self.head += 1
+        self._start = self.head
+
+    def record(self, positions, old_ids, new_ids, tick):
+        """
+        Appends edits to the journal.
+
+        Args:
+            positions (np.ndarray): An (N, 3) array of local positions.
+            old_ids (np.ndarray): The N block IDs before the edits, or one ID for all of them.
+            new_ids (np.ndarray): The N block IDs after the edits, or one ID for all of them.
+            tick (int): World tick the edits happened on.
+        """
+
+        positions = np.asarray(positions).reshape(-1, 3)
+        count = len(positions)
+        if count == 0:
+            return
+
+        # Only the last `capacity` edits can survive, so older ones in a large batch are skipped
+        skip = max(0, count - self.capacity)
+        slots = (self.head + skip + np.arange(count - skip)) % self.capacity
+        entries = self.entries
+        entries["x"][slots] = positions[skip:, 0]
+        entries["y"][slots] = positions[skip:, 1]
+        entries["z"][slots] = positions[skip:, 2]
+        entries["old_id"][slots] = np.broadcast_to(old_ids, (count,))[skip:]
+        entries["new_id"][slots] = np.broadcast_to(new_ids, (count,))[skip:]
+        entries["tick"][slots] = tick
+        self.head += count
+
+    def changes_since(self, cursor):
+        """
+        Returns the edits made after a cursor.
+
+        Args:
+            cursor (int): A sequence number previously returned as a cursor, or None.
+
+        Returns:
+            Tuple[np.ndarray, int]: The edits in order, as a CHANGE_DTYPE array, and the
+            cursor to pass next time. The edits are None if the cursor is None or older than
+            the journal's tail, meaning the caller must treat the whole chunk as changed.
+        """
+
+        if cursor is None or cursor < self.tail:
+            return None, self.head
+        slots = np.arange(cursor, self.head) % self.capacity
+        return self.entries[slots], self.head
+
+    def consume(self, subscriber):
+        """
+        Returns the edits a named subscriber has not seen yet and advances its cursor.
+
+        A subscriber's first call returns None, since it has no baseline to apply deltas to.
+
+        Args:
+            subscriber (Hashable): Name of the subscriber, e.g. "mesh" or "network", or the
+                subscribing object itself.
+
+        Returns:
+            np.ndarray: The new edits, or None if the subscriber must rebuild from the full chunk.
+        """
+
+        changes, self.cursors[subscriber] = self.changes_since(self.cursors.get(subscriber))
+        return changes
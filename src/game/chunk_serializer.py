@@ -0,0 +1,166 @@
+import struct
+
+import numpy as np
+
+from src.game.block_registry import BLOCK_REGISTRY
+from src.game.chunk import Chunk
+
+SERIALIZER_MAGIC = b"VXC"
+SERIALIZER_VERSION = 1
+
+# How the block data following the palette is laid out
+MODE_SINGLE = 0
+MODE_PACKED = 1
+MODE_RLE = 2
+
+HEADER = struct.Struct("<3sBBH")  # magic, version, mode, palette size
+VOLUME = Chunk.CHUNK_SIZE ** 3
+
+
+def serialize_chunk(chunk):
+    """
+    Serializes a chunk into a compact binary form for disk or network.
+
+    The palette is compacted to the block types actually present. A chunk holding a
+    single block type is stored as its palette alone; otherwise the palette indices are
+    either bit-packed to the minimum width the palette needs or run-length encoded,
+    whichever is smaller.
+
+    Args:
+        chunk (Chunk): The chunk to serialize.
+
+    Returns:
+        bytes: The serialized chunk.
+    """
+
+    flat = chunk.blocks.reshape(-1)
+    used = np.flatnonzero(np.bincount(flat, minlength=len(chunk.palette)))
+    remap = np.zeros(len(chunk.palette), dtype=np.uint16)
+    remap[used] = np.arange(len(used), dtype=np.uint16)
+    indices = remap[flat]
+    names = [chunk.palette[index].name.encode("utf-8") for index in used]
+
+    if len(names) == 1:
+        mode, body = MODE_SINGLE, b""
+    else:
+        bits = bits_per_index(len(names))
+        run_starts = _run_starts(indices)
+        rle_size = 2 + len(run_starts) * (_value_dtype(len(names)).itemsize + 2)
+        if rle_size < VOLUME * bits // 8:
+            mode, body = MODE_RLE, _encode_runs(indices, run_starts, len(names))
+        else:
+            mode, body = MODE_PACKED, struct.pack("<B", bits) + pack_bits(indices, bits)
+
+    parts = [HEADER.pack(SERIALIZER_MAGIC, SERIALIZER_VERSION, mode, len(names))]
+    for name in names:
+        parts.append(struct.pack("<B", len(name)))
+        parts.append(name)
+    parts.append(body)
+    return b"".join(parts)
+
+
+def deserialize_chunk(data, position, seed=0, registry=BLOCK_REGISTRY):
+    """
+    Rebuilds a chunk from serialize_chunk output.
+
+    Args:
+        data (Union[bytes, memoryview]): The serialized chunk.
+        position (Tuple[int, int, int]): World position of the chunk's origin.
+        seed (int, optional): World seed. Defaults to 0.
+        registry (BlockRegistry, optional): Registry to resolve block names against.
+            Defaults to the global block registry.
+
+    Returns:
+        Chunk: The deserialized chunk.
+
+    Raises:
+        ValueError: If the data is not a serialized chunk of a supported version.
+    """
+
+    data = memoryview(data)
+    magic, version, mode, palette_size = HEADER.unpack_from(data, 0)
+    if magic != SERIALIZER_MAGIC or version != SERIALIZER_VERSION:
+        raise ValueError("Data is not a supported serialized chunk")
+
+    offset = HEADER.size
+    palette_ids = np.empty(palette_size, dtype=np.uint16)
+    for index in range(palette_size):
+        name_length = data[offset]
+        palette_ids[index] = registry.get(bytes(data[offset + 1:offset + 1 + name_length]).decode("utf-8")).id
+        offset += 1 + name_length
+
+    if mode == MODE_SINGLE:
+        indices = np.zeros(VOLUME, dtype=np.uint16)
+    elif mode == MODE_PACKED:
+        bits = data[offset]
+        indices = unpack_bits(data[offset + 1:], bits, VOLUME)
+    elif mode == MODE_RLE:
+        indices = _decode_runs(data[offset:], palette_size)
+    else:
+        raise ValueError(f"Unknown chunk encoding mode {mode}")
+
+    block_ids = palette_ids[indices].reshape((Chunk.CHUNK_SIZE,) * 3)
+    return Chunk(position, seed, registry, block_ids=block_ids)
+
+
+def bits_per_index(palette_size):
+    """Returns the minimum number of bits needed to index a palette of the given size."""
+    return max(1, int(palette_size - 1).bit_length())
+
+
+def pack_bits(values, bits):
+    """
+    Packs unsigned integers into a little-endian bit stream of fixed width.
+
+    Args:
+        values (np.ndarray): Values to pack; each must fit in ``bits`` bits.
+        bits (int): Width of each value in bits (1-16).
+
+    Returns:
+        bytes: The packed values.
+    """
+
+    shifts = np.arange(bits, dtype=np.uint16)
+    bit_matrix = ((values.astype(np.uint16)[:, None] >> shifts) & 1).astype(np.uint8)
+    return np.packbits(bit_matrix.reshape(-1), bitorder="little").tobytes()
+
+
+def unpack_bits(data, bits, count):
+    """
+    Unpacks ``count`` fixed-width values written by pack_bits.
+
+    Args:
+        data (Union[bytes, memoryview]): The packed bit stream.
+        bits (int): Width of each value in bits.
+        count (int): Number of values to unpack.
+
+    Returns:
+        np.ndarray: The unpacked ``uint16`` values.
+    """
+
+    stream = np.frombuffer(data, dtype=np.uint8, count=(count * bits + 7) // 8)
+    bit_matrix = np.unpackbits(stream, count=count * bits, bitorder="little").reshape(count, bits)
+    weights = (1 << np.arange(bits, dtype=np.uint32)).astype(np.uint32)
+    return (bit_matrix @ weights).astype(np.uint16)
+
+
+def _value_dtype(palette_size):
+    return np.dtype("<u1") if palette_size <= 256 else np.dtype("<u2")
+
+
+def _run_starts(values):
+    return np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+
+
+def _encode_runs(values, run_starts, palette_size):
+    lengths = np.diff(np.append(run_starts, len(values))).astype("<u2")
+    run_values = values[run_starts].astype(_value_dtype(palette_size))
+    return struct.pack("<H", len(run_starts)) + run_values.tobytes() + lengths.tobytes()
+
+
+def _decode_runs(data, palette_size):
+    (run_count,) = struct.unpack_from("<H", data, 0)
+    value_dtype = _value_dtype(palette_size)
+    run_values = np.frombuffer(data, dtype=value_dtype, count=run_count, offset=2)
+    lengths = np.frombuffer(data, dtype="<u2", count=run_count, offset=2 + run_count * value_dtype.itemsize)
+    return np.repeat(run_values, lengths).astype(np.uint16)
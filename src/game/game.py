@@ -1,37 +1,51 @@
 import pygame
 from OpenGL.raw.GL.VERSION.GL_1_0 import glClear, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT
 
+from src.game.game_loop import TICK_RATE, FixedTimestep
 from src.game.world import World
 from src.game.player import Player
+from src.physics.entity_store import EntityStore
 from src.physics.physics import Physics
 from src.rendering.block_renderer import BlockRenderer
+from src.rendering.camera import Camera
+from src.rendering.gl_state import GL_STATE
+from src.rendering.render_stats import RENDER_STATS
 
 
 class Game:
     """Represents the main game loop and handles core functionality."""
 
-    def __init__(self, window_width, window_height):
+    def __init__(self, window_width, window_height, mesh_upload_time=0.004, mesh_upload_bytes=None,
+                 tick_rate=TICK_RATE, frame_cap=None):
         """
         Initializes the game object.
 
         Args:
             window_width (int): Width of the game window.
             window_height (int): Height of the game window.
+            mesh_upload_time (float, optional): Seconds per frame spent uploading rebuilt chunk
+                meshes, or None for no limit. Defaults to 0.004.
+            mesh_upload_bytes (int, optional): Vertex bytes uploaded per frame, or None for no
+                limit. Defaults to None.
+            tick_rate (float, optional): Simulation ticks per second. Defaults to TICK_RATE.
+            frame_cap (float, optional): Most frames drawn per second, or None for no cap.
+                Defaults to None.
         """
 
         self.window_width = window_width
         self.window_height = window_height
 
         # Initialize game components
-        self.world = World()
-        self.player = Player((0, 10, 0), self.world)
+        self.world = World(mesh_upload_time=mesh_upload_time, mesh_upload_bytes=mesh_upload_bytes)
+        self.entities = EntityStore()
+        self.player = Player((0, 10, 0), self.world, self.entities)
         self.block_renderer = BlockRenderer()
+        self.camera = Camera(aspect=window_width / window_height)
         self.physics = Physics()
 
-        # Initialize clock and delta time
-        self.clock = pygame.time.Clock()
-        self.delta_time = 0.0
-        self.last_update_time = pygame.time.get_ticks()
+        # The simulation ticks at a fixed rate; frames are drawn as often as the cap allows
+        self.timestep = FixedTimestep(tick_rate)
+        self.frame_cap = frame_cap
         # Initialize display and OpenGL context
         pygame.init()
         pygame.display.set_mode((self.window_width, self.window_height), pygame.DOUBLEBUF | pygame.OPENGL)
@@ -39,66 +53,69 @@ class Game:
 
     def run(self):
         """
-        Runs the main game loop.
+        Runs the main game loop until the window is closed.
         """
 
-        running = True
-        while running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
+        self.timestep.run(self.update, self.render, frame_cap=self.frame_cap, should_stop=self.handle_events)
+        self.world.close()
+        pygame.quit()
 
-            # Update game logic
-            self.delta_time = self.clock.tick() / 1000.0  # Update delta time in seconds
-            self.update(self.delta_time)  # Pass delta_time to update method
+    def handle_events(self):
+        """
+        Processes pending window events.
 
-            # Render the game
-            self.render()
+        Returns:
+            bool: True if the game should quit.
+        """
 
-        pygame.quit()
+        quit_requested = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit_requested = True
+        return quit_requested
 
     def update(self, delta_time):
         """
-        Updates the game logic based on the given delta time.
+        Advances the simulation by one fixed tick.
 
         Args:
-            delta_time (float): Time elapsed since the last update in seconds.
+            delta_time (float): Length of the tick in seconds.
         """
 
+        self.entities.save_positions()
+        self.world.set_focus(self.player.get_position())
         self.world.update(delta_time)
         self.player.update(delta_time, self.world)
-        self.physics.update(self.world, self.player)
+        self.physics.step(self.world, self.entities, delta_time)
 
-    def render(self):
+    def update_camera(self, alpha=1.0):
+        """Places the camera at the player's eyes, between the last two ticks, looking where the player looks."""
+        x, y, z = self.player.get_render_position(alpha)
+        self.camera.position = (x, y + self.player.get_size()[1] * 0.9, z)
+        self.camera.yaw = self.player.camera_yaw
+        self.camera.pitch = self.player.camera_pitch
+
+    def render(self, alpha=1.0):
         """
         Renders the game scene.
+
+        Args:
+            alpha (float, optional): Fraction of a tick since the last one was simulated; moving
+                things are drawn that far between their last two positions. Defaults to 1.0.
         """
 
+        RENDER_STATS.begin_frame()
+        GL_STATE.begin_frame()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
-        self.world.render(self.block_renderer)
-        self.player.render()
+        # Meshes are built in the background; only their upload is paid for here, within budget
+        with RENDER_STATS.measure("mesh_upload"):
+            self.world.upload_meshes()
+        self.update_camera(alpha)
+        with RENDER_STATS.measure("terrain"):
+            self.world.render(self.block_renderer, self.camera)
+        with RENDER_STATS.measure("player"):
+            self.player.render(alpha)
 
+        RENDER_STATS.end_frame(GL_STATE)
         pygame.display.flip()
-
-    def run(self):
-        """
-        Runs the main game loop.
-        """
-
-        running = True
-        while running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-            # Update game logic
-            self.delta_time = self.clock.tick() / 1000.0  # Update delta time in seconds
-            self.update(self.delta_time)
-
-            # Render the game
-            self.render()
-
-        pygame.quit()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import time
+
+# Simulation ticks per second; every physics constant is expressed per second of simulated time
+TICK_RATE = 60
+# A frame that would need more ticks than this drops the rest of its time instead of catching up,
+# so a slow tick cannot make the next frame slower still (the spiral of death)
+MAX_TICKS_PER_FRAME = 5
+
+
+class FixedTimestep:
+    """
+    Runs a simulation at a fixed tick rate, independently of how often frames are drawn.
+
+    Real time elapsed between frames is added to an accumulator and consumed in whole
+    ticks of ``tick_length`` seconds, so the simulation behaves the same at any frame
+    rate. What is left over, as a fraction of a tick, is the ``alpha`` renderers use to
+    interpolate between the last two simulated states.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, max_ticks_per_frame=MAX_TICKS_PER_FRAME):
+        """
+        Initializes a FixedTimestep object.
+
+        Args:
+            tick_rate (float, optional): Simulation ticks per second. Defaults to TICK_RATE.
+            max_ticks_per_frame (int, optional): Most ticks run for one frame; time beyond them
+                is dropped, slowing the simulation down instead. Defaults to MAX_TICKS_PER_FRAME.
+
+        Raises:
+            ValueError: If tick_rate or max_ticks_per_frame is not positive.
+        """
+
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        if max_ticks_per_frame <= 0:
+            raise ValueError("max_ticks_per_frame must be positive")
+
+        self.tick_length = 1.0 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+        self.tick_count = 0
+        # Seconds of real time the simulation did not catch up with
+        self.dropped_time = 0.0
+
+    @property
+    def alpha(self):
+        """Fraction of a tick accumulated but not yet simulated, in [0, 1)."""
+        return self.accumulator / self.tick_length
+
+    def advance(self, elapsed, tick):
+        """
+        Runs as many whole ticks as the elapsed time pays for.
+
+        Args:
+            elapsed (float): Real seconds since the previous call.
+            tick (Callable[[float], None]): Advances the simulation by the given number of seconds.
+
+        Returns:
+            float: The interpolation factor ``alpha`` for rendering this frame.
+
+        Raises:
+            ValueError: If elapsed is negative.
+        """
+
+        if elapsed < 0:
+            raise ValueError("elapsed time must not be negative")
+
+        self.accumulator += elapsed
+        # A frame exactly one tick long must not come out a rounding error short of it
+        ticks = int((self.accumulator + self.tick_length * 1e-6) // self.tick_length)
+        if ticks > self.max_ticks_per_frame:
+            dropped = (ticks - self.max_ticks_per_frame) * self.tick_length
+            self.accumulator -= dropped
+            self.dropped_time += dropped
+            ticks = self.max_ticks_per_frame
+
+        for _ in range(ticks):
+            tick(self.tick_length)
+            self.accumulator -= self.tick_length
+            self.tick_count += 1
+        self.accumulator = max(self.accumulator, 0.0)
+        return self.alpha
+
+    def run(self, tick, render=None, frame_cap=None, should_stop=None, max_frames=None,
+            clock=time.perf_counter, sleep=time.sleep):
+        """
+        Runs frames until told to stop: each advances the simulation, then renders it.
+
+        Without a renderer the loop runs headless; having nothing to draw between ticks, it
+        then waits for the next tick instead of spinning.
+
+        Args:
+            tick (Callable[[float], None]): Advances the simulation by the given number of seconds.
+            render (Callable[[float], None], optional): Draws a frame given the interpolation
+                factor ``alpha``. Defaults to None, for a headless loop.
+            frame_cap (float, optional): Most frames per second; the loop sleeps off the rest of
+                each frame. Defaults to None, for no cap.
+            should_stop (Callable[[], bool], optional): Called at the start of every frame, e.g.
+                to handle input; the loop ends when it returns True. Defaults to never stopping.
+            max_frames (int, optional): Number of frames after which the loop ends. Defaults to None.
+            clock (Callable[[], float], optional): Source of the current time in seconds.
+                Defaults to time.perf_counter.
+            sleep (Callable[[float], None], optional): Waits the given number of seconds.
+                Defaults to time.sleep.
+
+        Returns:
+            int: The number of frames run.
+        """
+
+        if render is None and frame_cap is None:
+            frame_cap = 1.0 / self.tick_length
+        frame_length = 0.0 if frame_cap is None else 1.0 / frame_cap
+
+        frames = 0
+        previous = clock()
+        while max_frames is None or frames < max_frames:
+            frame_start = clock()
+            if should_stop is not None and should_stop():
+                break
+
+            alpha = self.advance(frame_start - previous, tick)
+            previous = frame_start
+            if render is not None:
+                render(alpha)
+            frames += 1
+
+            remaining = frame_length - (clock() - frame_start)
+            if remaining > 0:
+                sleep(remaining)
+        return frames
@@ -0,0 +1,393 @@
+from collections import deque
+
+import numpy as np
+
+from src.game.block_registry import BLOCK_REGISTRY
+from src.game.chunk import Chunk
+from src.game.chunk_journal import DirtyFlag
+
+MAX_LIGHT = 15
+
+# The two light channels, named after the Chunk attributes holding them
+SKY_LIGHT = "sky_light"
+BLOCK_LIGHT = "block_light"
+
+# Neighbour offsets in the order +x, -x, +y, -y, +z, -z, matching the mesher's face directions
+NEIGHBOUR_OFFSETS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+
+
+class LightEngine:
+    """
+    Flood-fill voxel lighting over a world's loaded chunks.
+
+    Every chunk carries two ``uint8`` light arrays of levels 0-15: skylight, which enters
+    from above and travels straight down without fading until it meets a non-transparent
+    block, and block light, emitted by blocks with a light level. Both lose at least one
+    level per step sideways, and opaque blocks stop them.
+
+    A freshly loaded chunk is lit with vectorized relaxation over the whole chunk. Block
+    edits are applied incrementally with breadth-first removal and addition queues, so
+    their cost depends on how far the changed light reaches, not on the size of the world.
+    Both cross chunk borders; light stops at chunks that are not loaded and is filled in
+    when they arrive.
+    """
+
+    def __init__(self, chunks, registry=BLOCK_REGISTRY):
+        """
+        Initializes a LightEngine object.
+
+        Args:
+            chunks (Dict[Tuple[int, int, int], Chunk]): Loaded chunks by chunk coordinates.
+                The engine keeps the reference, so chunks added to the dictionary later are seen.
+            registry (BlockRegistry, optional): Registry providing the opacity and light
+                emission lookup tables. Defaults to the global block registry.
+        """
+
+        self.chunks = chunks
+        self.registry = registry
+
+    def get_light(self, x, y, z):
+        """
+        Returns the light levels of a world cell.
+
+        Args:
+            x (int): World X coordinate.
+            y (int): World Y coordinate.
+            z (int): World Z coordinate.
+
+        Returns:
+            Tuple[int, int]: The skylight and block light levels, or None if the cell's chunk
+            is not loaded.
+        """
+
+        size = Chunk.CHUNK_SIZE
+        chunk = self.chunks.get((x // size, y // size, z // size))
+        if chunk is None:
+            return None
+        local = (x % size, y % size, z % size)
+        return int(chunk.sky_light[local]), int(chunk.block_light[local])
+
+    def light_chunk(self, coords):
+        """
+        Computes the light of a newly loaded chunk and spreads it into loaded neighbours.
+
+        The chunk is lit from its own emitters, the sky and the light already at its
+        neighbours' borders. If it covers a loaded chunk below that was lit as open sky,
+        the sunlight the covered chunk no longer receives is removed.
+
+        Args:
+            coords (Tuple[int, int, int]): Integer chunk coordinates of a loaded chunk.
+
+        Returns:
+            Set[Tuple[int, int, int]]: Coordinates of every chunk whose light changed.
+        """
+
+        chunk = self.chunks[coords]
+        opacity = chunk.lookup(self.registry.opacity)
+        emission = chunk.lookup(self.registry.light_emission)
+
+        chunk.sky_light[...] = self._relax(coords, opacity, self._direct_sunlight(coords, opacity), SKY_LIGHT)
+        chunk.block_light[...] = self._relax(coords, opacity, emission, BLOCK_LIGHT)
+        chunk.clear_dirty(DirtyFlag.LIGHT)
+
+        changed = {coords}
+        for kind in (SKY_LIGHT, BLOCK_LIGHT):
+            cache = _LightCache(self.chunks, self.registry, kind)
+            additions = deque(self._border_seeds(coords, kind))
+            removals = deque()
+            if kind == SKY_LIGHT:
+                removals.extend(self._covered_sunlight(coords, cache))
+            self._remove(cache, removals, additions)
+            self._add(cache, additions)
+            changed |= cache.changed
+        return changed
+
+    def update_block(self, x, y, z):
+        """
+        Updates the light around one world cell after its block changed.
+
+        Args:
+            x (int): World X coordinate.
+            y (int): World Y coordinate.
+            z (int): World Z coordinate.
+
+        Returns:
+            Set[Tuple[int, int, int]]: Coordinates of every chunk whose light changed.
+        """
+
+        return self.update_blocks(np.array([[x, y, z]]))
+
+    def update_blocks(self, cells):
+        """
+        Updates the light around many world cells after their blocks changed.
+
+        Light that came through or from the old blocks is removed breadth-first, then the
+        new blocks' emission and the light of the surrounding cells spread back in, all in
+        one pass of each queue however many cells changed. Cells in unloaded chunks are skipped.
+
+        Args:
+            cells (np.ndarray): An (N, 3) array of integer world coordinates.
+
+        Returns:
+            Set[Tuple[int, int, int]]: Coordinates of every chunk whose light changed.
+        """
+
+        cells = [tuple(int(value) for value in cell) for cell in np.asarray(cells).reshape(-1, 3)]
+        changed = set()
+        for kind in (SKY_LIGHT, BLOCK_LIGHT):
+            cache = _LightCache(self.chunks, self.registry, kind)
+            removals = deque()
+            additions = deque()
+            for cell in cells:
+                entry = cache.get(*cell)
+                if entry is None:
+                    continue
+                light, _, _, local = entry
+                level = light[local]
+                if level > 0:
+                    light[local] = 0
+                    removals.append((*cell, level))
+                    cache.touch(*cell)
+            self._remove(cache, removals, additions)
+
+            for x, y, z in cells:
+                entry = cache.get(x, y, z)
+                if entry is None:
+                    continue
+                light, opacity, emission, local = entry
+                cache.changed.add(cache.chunk_coords(x, y, z))
+                cache.chunk(x, y, z).clear_dirty(DirtyFlag.LIGHT)
+
+                source = emission[local] if kind == BLOCK_LIGHT else 0
+                if kind == SKY_LIGHT and opacity[local] == 0 and cache.get(x, y + 1, z) is None:
+                    # Nothing is loaded above, so the cell is open to the sky
+                    source = MAX_LIGHT
+                if source > light[local]:
+                    light[local] = source
+                    additions.append((x, y, z))
+                if opacity[local] < MAX_LIGHT:
+                    # Let the surrounding light flow back into the cell
+                    for dx, dy, dz in NEIGHBOUR_OFFSETS:
+                        neighbour = cache.get(x + dx, y + dy, z + dz)
+                        if neighbour is not None and neighbour[0][neighbour[3]] > 0:
+                            additions.append((x + dx, y + dy, z + dz))
+            self._add(cache, additions)
+            changed |= cache.changed
+        return changed
+
+    def padded_light(self, coords):
+        """
+        Returns a chunk's combined light surrounded by one layer of its face neighbours' light.
+
+        Args:
+            coords (Tuple[int, int, int]): Integer chunk coordinates of a loaded chunk.
+
+        Returns:
+            np.ndarray: An (18, 18, 18) ``uint8`` array of the brighter of skylight and block
+            light per cell, for the mesher. Border cells of unloaded neighbours are dark,
+            except above the chunk, which is open sky.
+        """
+
+        sky = self._padded(coords, SKY_LIGHT)
+        block = self._padded(coords, BLOCK_LIGHT)
+        return np.maximum(sky, block).astype(np.uint8)
+
+    def _padded(self, coords, kind):
+        """Returns a chunk's light of one kind as an (18, 18, 18) ``int16`` array with its neighbours' border."""
+        size = Chunk.CHUNK_SIZE
+        padded = np.zeros((size + 2,) * 3, dtype=np.int16)
+        padded[1:-1, 1:-1, 1:-1] = getattr(self.chunks[coords], kind)
+        for axis in range(3):
+            for step, source_layer, target_layer in ((-1, size - 1, 0), (1, 0, size + 1)):
+                neighbour_coords = list(coords)
+                neighbour_coords[axis] += step
+                neighbour = self.chunks.get(tuple(neighbour_coords))
+                target = [slice(1, -1)] * 3
+                target[axis] = target_layer
+                if neighbour is not None:
+                    source = [slice(None)] * 3
+                    source[axis] = source_layer
+                    padded[tuple(target)] = getattr(neighbour, kind)[tuple(source)]
+                elif kind == SKY_LIGHT and axis == 1 and step == 1:
+                    padded[tuple(target)] = MAX_LIGHT
+        return padded
+
+    def _direct_sunlight(self, coords, opacity):
+        """Returns the skylight seeds of a chunk: full light down every transparent column the sun reaches."""
+        x, y, z = coords
+        above = self.chunks.get((x, y + 1, z))
+        if above is None:
+            incoming = np.ones((Chunk.CHUNK_SIZE, Chunk.CHUNK_SIZE), dtype=bool)
+        else:
+            incoming = above.sky_light[:, 0, :] == MAX_LIGHT
+        # A cell is in sunlight if every cell from it up to the top of the chunk is transparent
+        clear = np.logical_and.accumulate(opacity[:, ::-1, :] == 0, axis=1)[:, ::-1, :]
+        return np.where(clear & incoming[:, None, :], MAX_LIGHT, 0).astype(np.uint8)
+
+    def _relax(self, coords, opacity, seeds, kind):
+        """
+        Spreads light through a chunk from its seeds and its neighbours' borders.
+
+        Every pass raises each transparent cell to the brightest neighbour minus the cell's
+        attenuation, all cells at once, until nothing changes. Light fades by at least one
+        level per cell, so this settles after about MAX_LIGHT passes.
+        """
+
+        padded = self._padded(coords, kind)
+        light = seeds.astype(np.int16)
+        attenuation = np.maximum(opacity, 1).astype(np.int16)
+        receives = opacity < MAX_LIGHT
+        for _ in range(MAX_LIGHT * 4):
+            padded[1:-1, 1:-1, 1:-1] = light
+            brightest = np.maximum.reduce([
+                padded[2:, 1:-1, 1:-1], padded[:-2, 1:-1, 1:-1],
+                padded[1:-1, 2:, 1:-1], padded[1:-1, :-2, 1:-1],
+                padded[1:-1, 1:-1, 2:], padded[1:-1, 1:-1, :-2],
+            ])
+            relaxed = np.where(receives, np.maximum(light, brightest - attenuation), light)
+            if np.array_equal(relaxed, light):
+                break
+            light = relaxed
+        return np.clip(light, 0, MAX_LIGHT).astype(np.uint8)
+
+    def _border_seeds(self, coords, kind):
+        """Yields the world cells on a chunk's faces whose light would brighten a loaded neighbour."""
+        size = Chunk.CHUNK_SIZE
+        light = getattr(self.chunks[coords], kind).astype(np.int16)
+        origin = np.array(coords) * size
+        for axis in range(3):
+            for step, layer, neighbour_layer in ((-1, 0, size - 1), (1, size - 1, 0)):
+                neighbour_coords = list(coords)
+                neighbour_coords[axis] += step
+                neighbour = self.chunks.get(tuple(neighbour_coords))
+                if neighbour is None:
+                    continue
+                index = [slice(None)] * 3
+                index[axis] = layer
+                ours = light[tuple(index)]
+                index[axis] = neighbour_layer
+                theirs = getattr(neighbour, kind)[tuple(index)]
+                brighter = ours - 1 > theirs
+                if kind == SKY_LIGHT and axis == 1 and step == -1:
+                    brighter |= (ours == MAX_LIGHT) & (theirs < MAX_LIGHT)
+                for u, v in np.argwhere(brighter):
+                    local = [u, v]
+                    local.insert(axis, layer)
+                    yield tuple(int(value) for value in origin + local)
+
+    def _covered_sunlight(self, coords, cache):
+        """Returns removal seeds for the top cells of the chunk below that were lit as open sky but are now covered."""
+        x, y, z = coords
+        below = self.chunks.get((x, y - 1, z))
+        if below is None:
+            return []
+        size = Chunk.CHUNK_SIZE
+        lost = (below.sky_light[:, size - 1, :] == MAX_LIGHT) & (self.chunks[coords].sky_light[:, 0, :] < MAX_LIGHT)
+        removals = []
+        top = y * size - 1
+        for u, v in np.argwhere(lost):
+            cell = (x * size + int(u), top, z * size + int(v))
+            below.sky_light[int(u), size - 1, int(v)] = 0
+            cache.touch(*cell)
+            removals.append((*cell, MAX_LIGHT))
+        return removals
+
+    @staticmethod
+    def _remove(cache, removals, additions):
+        """
+        Darkens every cell that got its light from a removed cell, breadth-first.
+
+        Neighbours at least as bright as the removed level are lit from elsewhere; they are
+        queued in ``additions`` to fill the darkened cells back in.
+        """
+
+        sky = cache.kind == SKY_LIGHT
+        while removals:
+            x, y, z, level = removals.popleft()
+            for dx, dy, dz in NEIGHBOUR_OFFSETS:
+                nx, ny, nz = x + dx, y + dy, z + dz
+                entry = cache.get(nx, ny, nz)
+                if entry is None:
+                    continue
+                light, _, emission, local = entry
+                neighbour_level = light[local]
+                if neighbour_level == 0:
+                    continue
+                if neighbour_level < level or (sky and dy == -1 and level == MAX_LIGHT == neighbour_level):
+                    light[local] = 0
+                    cache.touch(nx, ny, nz)
+                    removals.append((nx, ny, nz, neighbour_level))
+                    if not sky and emission[local] > 0:
+                        light[local] = emission[local]
+                        additions.append((nx, ny, nz))
+                else:
+                    additions.append((nx, ny, nz))
+
+    @staticmethod
+    def _add(cache, additions):
+        """Spreads light outward from the queued cells, breadth-first, raising every darker neighbour."""
+        sky = cache.kind == SKY_LIGHT
+        while additions:
+            x, y, z = additions.popleft()
+            entry = cache.get(x, y, z)
+            if entry is None:
+                continue
+            level = entry[0][entry[3]]
+            if level <= 1:
+                continue
+            for dx, dy, dz in NEIGHBOUR_OFFSETS:
+                nx, ny, nz = x + dx, y + dy, z + dz
+                neighbour = cache.get(nx, ny, nz)
+                if neighbour is None:
+                    continue
+                light, opacity, _, local = neighbour
+                if sky and dy == -1 and level == MAX_LIGHT and opacity[local] == 0:
+                    new_level = MAX_LIGHT
+                else:
+                    new_level = level - max(opacity[local], 1)
+                if new_level > light[local]:
+                    light[local] = new_level
+                    cache.touch(nx, ny, nz)
+                    additions.append((nx, ny, nz))
+
+
+class _LightCache:
+    """
+    Per-chunk views used by one flood fill: the light of one kind, opacity and emission,
+    as memoryviews whose element access returns plain ints, built on first use.
+    """
+
+    def __init__(self, chunks, registry, kind):
+        self.chunks = chunks
+        self.registry = registry
+        self.kind = kind
+        self.views = {}
+        self.changed = set()
+
+    @staticmethod
+    def chunk_coords(x, y, z):
+        size = Chunk.CHUNK_SIZE
+        return x // size, y // size, z // size
+
+    def chunk(self, x, y, z):
+        return self.chunks.get(self.chunk_coords(x, y, z))
+
+    def get(self, x, y, z):
+        """Returns (light, opacity, emission, local index) for a world cell, or None if its chunk is not loaded."""
+        size = Chunk.CHUNK_SIZE
+        coords = (x // size, y // size, z // size)
+        views = self.views.get(coords)
+        if views is None:
+            chunk = self.chunks.get(coords)
+            if chunk is None:
+                return None
+            views = self.views[coords] = (
+                getattr(chunk, self.kind).data,
+                chunk.lookup(self.registry.opacity).data,
+                chunk.lookup(self.registry.light_emission).data,
+            )
+        return (*views, (x % size, y % size, z % size))
+
+    def touch(self, x, y, z):
+        """Records that the light of a world cell's chunk changed."""
+        self.changed.add(self.chunk_coords(x, y, z))
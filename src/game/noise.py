@@ -0,0 +1,184 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Gradient directions of Ken Perlin's improved noise, padded to 16 entries so a hash can pick one with `& 15`
+GRADIENTS = np.array([
+    [1, 1, 0], [-1, 1, 0], [1, -1, 0], [-1, -1, 0],
+    [1, 0, 1], [-1, 0, 1], [1, 0, -1], [-1, 0, -1],
+    [0, 1, 1], [0, -1, 1], [0, 1, -1], [0, -1, -1],
+    [1, 1, 0], [0, -1, 1], [-1, 1, 0], [0, -1, -1],
+], dtype=np.float32)
+GRADIENT_X, GRADIENT_Y, GRADIENT_Z = (np.ascontiguousarray(GRADIENTS[:, axis]) for axis in range(3))
+
+
+class PerlinNoise:
+    """Seeded, vectorized 3D Perlin noise with fractal (fBm) octaves."""
+
+    MAX_OCTAVES = 16
+
+    def __init__(self, seed=0):
+        """
+        Initializes a PerlinNoise object.
+
+        Every octave gets its own permutation table and coordinate offset drawn from
+        the seed, so octaves do not line up at the origin and the same seed always
+        produces the same terrain.
+
+        Args:
+            seed (int, optional): Seed of the noise field. Defaults to 0.
+        """
+
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self.permutations = np.empty((self.MAX_OCTAVES, 512), dtype=np.int32)
+        for octave in range(self.MAX_OCTAVES):
+            permutation = rng.permutation(256)
+            self.permutations[octave] = np.concatenate([permutation, permutation])
+        self.offsets = rng.uniform(0, 256, size=(self.MAX_OCTAVES, 3))
+
+        # Gradient components looked up straight from the final hash, saving a gather per corner
+        gradient_index = self.permutations & 15
+        self.gradient_x = GRADIENT_X[gradient_index]
+        self.gradient_y = GRADIENT_Y[gradient_index]
+        self.gradient_z = GRADIENT_Z[gradient_index]
+
+    def noise3(self, x, y, z, octave=0):
+        """
+        Evaluates single-octave Perlin noise.
+
+        The coordinates only need to broadcast against each other, so a regular grid can
+        be passed as three open axes (e.g. shapes (n, 1, 1), (1, n, 1) and (1, 1, n)) and
+        the per-axis work is done once per axis instead of once per voxel.
+
+        Args:
+            x (np.ndarray): X coordinates.
+            y (np.ndarray): Y coordinates.
+            z (np.ndarray): Z coordinates.
+            octave (int, optional): Which permutation table to use. Defaults to 0.
+
+        Returns:
+            np.ndarray: Noise values roughly in [-1, 1], shaped like the broadcast coordinates.
+        """
+
+        perm = self.permutations[octave]
+        gradients = (self.gradient_x[octave], self.gradient_y[octave], self.gradient_z[octave])
+
+        xi, xf, u = _split(x)
+        yi, yf, v = _split(y)
+        zi, zf, w = _split(z)
+
+        a = perm[xi] + yi
+        b = perm[xi + 1] + yi
+        aa = perm[a] + zi
+        ab = perm[a + 1] + zi
+        ba = perm[b] + zi
+        bb = perm[b + 1] + zi
+
+        x1 = _lerp(u, _grad(gradients, aa, xf, yf, zf), _grad(gradients, ba, xf - 1, yf, zf))
+        x2 = _lerp(u, _grad(gradients, ab, xf, yf - 1, zf), _grad(gradients, bb, xf - 1, yf - 1, zf))
+        y1 = _lerp(v, x1, x2)
+
+        x1 = _lerp(u, _grad(gradients, aa + 1, xf, yf, zf - 1), _grad(gradients, ba + 1, xf - 1, yf, zf - 1))
+        x2 = _lerp(u, _grad(gradients, ab + 1, xf, yf - 1, zf - 1), _grad(gradients, bb + 1, xf - 1, yf - 1, zf - 1))
+        y2 = _lerp(v, x1, x2)
+
+        return _lerp(w, y1, y2)
+
+    def fractal(self, x, y, z, octaves=6, persistence=0.5, lacunarity=2.0):
+        """
+        Sums several octaves of noise (fractal Brownian motion).
+
+        Args:
+            x (np.ndarray): X coordinates.
+            y (np.ndarray): Y coordinates.
+            z (np.ndarray): Z coordinates.
+            octaves (int, optional): Number of octaves (more octaves increase detail). Defaults to 6.
+            persistence (float, optional): Amplitude multiplier per octave (higher means rougher). Defaults to 0.5.
+            lacunarity (float, optional): Frequency multiplier per octave. Defaults to 2.0.
+
+        Returns:
+            np.ndarray: Noise values roughly in [-1, 1].
+
+        Raises:
+            ValueError: If more octaves are requested than the noise supports.
+        """
+
+        if not 1 <= octaves <= self.MAX_OCTAVES:
+            raise ValueError(f"Octaves must be between 1 and {self.MAX_OCTAVES}")
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        z = np.asarray(z, dtype=np.float64)
+
+        total = 0.0
+        amplitude = 1.0
+        frequency = 1.0
+        max_amplitude = 0.0
+        for octave in range(octaves):
+            offset = self.offsets[octave]
+            total = total + amplitude * self.noise3(
+                x * frequency + offset[0],
+                y * frequency + offset[1],
+                z * frequency + offset[2],
+                octave,
+            )
+            max_amplitude += amplitude
+            amplitude *= persistence
+            frequency *= lacunarity
+
+        return total / max_amplitude
+
+
+def _split(coordinate):
+    """Splits coordinates into lattice cell (wrapped to 0-255), fractional part and fade curve."""
+    floor = np.floor(coordinate)
+    fraction = (coordinate - floor).astype(np.float32)
+    fade = fraction * fraction * fraction * (fraction * (fraction * 6 - 15) + 10)
+    return floor.astype(np.intp) & 255, fraction, fade
+
+
+def _lerp(t, a, b):
+    return a + t * (b - a)
+
+
+def _grad(gradients, hash_value, x, y, z):
+    # One gather per gradient component is much cheaper than gathering (..., 3) rows
+    gradient_x, gradient_y, gradient_z = gradients
+    return gradient_x[hash_value] * x + gradient_y[hash_value] * y + gradient_z[hash_value] * z
+
+
+@lru_cache(maxsize=8)
+def get_noise(seed):
+    """Returns the shared PerlinNoise instance for a seed."""
+    return PerlinNoise(seed)
+
+
+def generate_noise(x, y, z, seed=0, scale=1, octaves=6, persistence=0.5, lacunarity=2.0):
+    """
+    Generates coherent fractal Perlin noise for whole coordinate grids at once.
+
+    Args:
+        x: X coordinates (scalar or array).
+        y: Y coordinates (scalar or array).
+        z: Z coordinates (scalar or array).
+        seed: World seed; the same seed and coordinates always give the same value (default: 0).
+        scale: Scale factor for the noise, in blocks per noise unit (default: 1).
+        octaves: Number of octaves for the noise (more octaves increase detail, default: 6).
+        persistence: Persistence of the noise (higher means more roughness, default: 0.5).
+        lacunarity: Lacunarity of the noise (higher means more stretched features, default: 2.0).
+
+    Returns:
+        Noise values between 0 and 1, shaped like the broadcast coordinates.
+    """
+
+    noise = get_noise(seed)
+    values = noise.fractal(
+        np.asarray(x, dtype=np.float64) / scale,
+        np.asarray(y, dtype=np.float64) / scale,
+        np.asarray(z, dtype=np.float64) / scale,
+        octaves=octaves,
+        persistence=persistence,
+        lacunarity=lacunarity,
+    )
+    return np.clip(values * 0.5 + 0.5, 0.0, 1.0)
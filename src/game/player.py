@@ -5,19 +5,31 @@ import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
-from src.game.block import Block
-from src.game.chunk import Chunk
+from src.game.block_registry import AIR, BLOCK_REGISTRY
+from src.physics.collision import overlapped_cells
+from src.physics.entity_store import DEFAULT_FLAGS, EntityFlag, EntityStore
+from src.physics.raycast import Raycaster
 
 
 class Player:
-    def __init__(self, position, direction):
-        self.position = position
+    def __init__(self, position, direction, store=None):
+        """
+        Initializes a Player object.
+
+        Args:
+            position (Tuple[float, float, float]): Minimum corner of the player's bounding box.
+            direction: The player's movement direction source.
+            store (EntityStore, optional): Entity store the player's physics state lives in, as
+                one entity among the others. Defaults to a store of its own.
+        """
+
+        self.size = (0.6, 1.8, 0.6)
+        self.store = EntityStore(capacity=1) if store is None else store
+        self.entity = self.store.add(position, self.size, flags=DEFAULT_FLAGS)
         self.rotation = (0, 0)
         self.movement_speed = 0.1
-        self.size = (0.6, 1.8, 0.6)
-        self.jumping = False
-        self._on_ground = False
-        self.velocity = (0, 0, 0)
+        self.reach = 5.0
+        self.raycaster = Raycaster()
         self.camera_distance = 5
         self.camera_pitch = 0
         self.camera_yaw = 0
@@ -25,11 +37,7 @@ class Player:
         self.speed = 0.1
 
     def update(self, delta_time, world):
-        if self.jumping and self._on_ground:
-            self.jumping = False
-            self._on_ground = False
-            self.velocity = (self.velocity[0], 0.3, self.velocity[2])
-
+        # Jumping is left to Physics.step, which launches the player on the next tick it stands on the ground
         # Update position based on direction and speed
         new_position = (
             self.position[0] + self.direction.get_player_direction().get_direction()[0] * self.speed * delta_time,
@@ -37,18 +45,8 @@ class Player:
             self.position[2] + self.direction.get_player_direction().get_direction()[2] * self.speed * delta_time
         )
 
-        is_blocked = False
-        for chunk in world.chunks:
-            chunk_x = int(new_position[0] - chunk.position[0])
-            chunk_y = int(new_position[1] - chunk.position[1])
-            chunk_z = int(new_position[2] - chunk.position[2])
-
-            # Check if the new position is within the chunk boundaries
-            if 0 <= chunk_x < Chunk.CHUNK_SIZE and 0 <= chunk_y < Chunk.CHUNK_SIZE and 0 <= chunk_z < Chunk.CHUNK_SIZE:
-                block = chunk.get_block(chunk_x, chunk_y, chunk_z)
-                if block is not None:  # Check if a block exists at that position
-                    is_blocked = True
-                    break
+        block = world.get_block(*new_position)
+        is_blocked = block is not None and block.solid
 
         if not is_blocked:
             self.position = new_position
@@ -78,13 +76,39 @@ class Player:
     def set_jumping(self, jumping):
         self.jumping = jumping
 
+    @property
+    def position(self):
+        return self.store.position[self.entity].copy()
+
+    @position.setter
+    def position(self, position):
+        self.store.position[self.entity] = position
+        self.store.set_flags(self.entity, EntityFlag.SLEEPING, False)
+
+    @property
+    def velocity(self):
+        return self.store.velocity[self.entity].copy()
+
+    @velocity.setter
+    def velocity(self, velocity):
+        self.store.velocity[self.entity] = velocity
+        self.store.set_flags(self.entity, EntityFlag.SLEEPING, False)
+
+    @property
+    def jumping(self):
+        return self.store.has_flags(self.entity, EntityFlag.JUMPING)
+
+    @jumping.setter
+    def jumping(self, jumping):
+        self.store.set_flags(self.entity, EntityFlag.JUMPING, jumping)
+
     @property
     def on_ground(self):
-        return self._on_ground
+        return self.store.has_flags(self.entity, EntityFlag.ON_GROUND)
 
     @on_ground.setter
     def on_ground(self, on_ground):
-        self._on_ground = on_ground
+        self.store.set_flags(self.entity, EntityFlag.ON_GROUND, on_ground)
 
     def get_position(self):
         return self.position
@@ -92,6 +116,10 @@ class Player:
     def set_position(self, position):
         self.position = position
 
+    def get_render_position(self, alpha):
+        """Returns the position to draw at, blended between the last two ticks by alpha."""
+        return self.store.interpolated_position(alpha, self.entity)
+
     def get_velocity(self):
         return self.velocity
 
@@ -110,10 +138,10 @@ class Player:
             math.sin(pitch),
             math.cos(pitch) * math.sin(yaw)
         ])
-        front = np.normalize(front)
+        front = front / np.linalg.norm(front)
 
         right = np.cross(np.array([0, 1, 0]), front)
-        right = np.normalize(right)
+        right = right / np.linalg.norm(right)
 
         up = np.cross(front, right)
 
@@ -125,48 +153,51 @@ class Player:
 
         return view_matrix
 
-    def interact_with_world(self, world, action, block_type=None):
-        reach = 5.0
+    def get_eye_position(self):
+        """Returns the point the camera looks from, matching Game.update_camera."""
         x, y, z = self.position
+        return x, y + self.size[1] * 0.9, z
 
-        # Calculate the ray direction based on the camera's view matrix
-        view_matrix = self.get_view_matrix()
-        ray_direction = np.dot(view_matrix[:3, 2], np.linalg.inv(view_matrix)[:3, :3])
-
-        # Normalize the ray direction
-        ray_direction = ray_direction / np.linalg.norm(ray_direction)
-
-        # Calculate the target point
-        target_point = self.position + ray_direction * reach
-
-        # Check if the target point intersects with any blocks in the world
-        intersected_block = None
-        for chunk in world.chunks:
-            if chunk.position[0] <= target_point[0] <= chunk.position[0] + Chunk.CHUNK_SIZE and \
-                    chunk.position[1] <= target_point[1] <= chunk.position[1] + Chunk.CHUNK_SIZE and \
-                    chunk.position[2] <= target_point[2] <= chunk.position[2] + Chunk.CHUNK_SIZE:
-
-                chunk_x = int(target_point[0] - chunk.position[0])
-                chunk_y = int(target_point[1] - chunk.position[1])
-                chunk_z = int(target_point[2] - chunk.position[2])
-
-                intersected_block = chunk.get_block(chunk_x, chunk_y, chunk_z)
-                if intersected_block is not None:
-                    break
-
-        if intersected_block is not None:
-            if action == 'break':
-                # Remove the block from the chunk
-                chunk.set_block(chunk_x, chunk_y, chunk_z, Block((chunk_x, chunk_y, chunk_z), 'air'))
-            elif action == 'place' and block_type is not None:
-                # Add the new block to the chunk
-                chunk.set_block(chunk_x, chunk_y, chunk_z, Block((chunk_x, chunk_y, chunk_z), block_type))
+    def get_look_direction(self):
+        """Returns the unit vector the camera looks along, matching Camera.front."""
+        pitch = math.radians(max(-89.0, min(89.0, self.camera_pitch)))
+        yaw = math.radians(self.camera_yaw)
+        return math.cos(pitch) * math.cos(yaw), math.sin(pitch), math.cos(pitch) * math.sin(yaw)
 
-    def render(self):
+    def interact_with_world(self, world, action, block_type=None):
+        """
+        Breaks the block the player looks at, or places one against the face looked at.
+
+        Args:
+            world (World): The world to edit.
+            action (str): 'break' or 'place'.
+            block_type (str, optional): Name of the block type to place. Defaults to None.
+
+        Returns:
+            RayHit: The block looked at, or None if nothing solid is within reach.
+        """
+
+        hit = self.raycaster.cast(world, self.get_eye_position(), self.get_look_direction(), self.reach)
+        if hit is None:
+            return None
+
+        if action == 'break':
+            # Remove the block from the world
+            world.set_block(*hit.cell, AIR)
+        elif action == 'place' and block_type is not None and hit.normal != (0, 0, 0):
+            # Add the new block in front of the face looked at, unless the player stands there
+            position = np.asarray(self.position)
+            cells = overlapped_cells(position, position + self.size)
+            if not any(tuple(int(value) for value in cell) == hit.adjacent for cell in cells):
+                world.set_block(*hit.adjacent, BLOCK_REGISTRY.get(block_type))
+        return hit
+
+    def render(self, alpha=1.0):
         glPushMatrix()  # Save the current matrix state
 
-        # Apply the model matrix for the player's position and orientation
-        glTranslatef(self.position[0], self.position[1], self.position[2])
+        # Apply the model matrix for the player's position and orientation, between the last two ticks
+        x, y, z = self.get_render_position(alpha)
+        glTranslatef(x, y, z)
 
         # Placeholder: Replace the following lines with your actual rendering code
         glBegin(GL_QUADS)
@@ -0,0 +1,201 @@
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+
+from src.game.block_registry import BLOCK_REGISTRY
+from src.game.chunk import Chunk
+from src.game.chunk_journal import DirtyFlag
+from src.game.chunk_serializer import deserialize_chunk, serialize_chunk
+
+REGION_MAGIC = b"VXRG"
+REGION_VERSION = 2
+SECTOR_SIZE = 512
+
+# Magic, version, region size
+HEADER_PREFIX = struct.Struct("<4sHH")
+# Payload offset, payload length and reserved capacity, all in bytes
+HEADER_ENTRY = struct.Struct("<III")
+
+
+class RegionFile:
+    """A file holding up to size x size chunk payloads behind an offset table."""
+
+    def __init__(self, path, size):
+        """
+        Initializes a RegionFile object, creating the file if it does not exist.
+
+        Args:
+            path (str): Path of the region file.
+            size (int): Number of chunks along each horizontal side of the region.
+
+        Raises:
+            ValueError: If an existing file is not a region file of the same size.
+        """
+
+        self.path = path
+        self.size = size
+        self.header_size = HEADER_PREFIX.size + size * size * HEADER_ENTRY.size
+
+        if not os.path.exists(path):
+            with open(path, "wb") as file:
+                file.write(HEADER_PREFIX.pack(REGION_MAGIC, REGION_VERSION, size))
+                file.write(bytes(self.header_size - HEADER_PREFIX.size))
+
+        self._file = open(path, "r+b")
+        self._map = None
+        # A file cut short, even to nothing, has no complete header to check
+        complete = os.fstat(self._file.fileno()).st_size >= self.header_size
+        magic, version, file_size = HEADER_PREFIX.unpack(self._view()[:HEADER_PREFIX.size]) if complete else (None,) * 3
+        if magic != REGION_MAGIC or version != REGION_VERSION or file_size != size:
+            self.close()
+            raise ValueError(f"{path} is not a version {REGION_VERSION} region file of size {size}")
+
+    def _view(self):
+        """Returns a read-only memory map of the file, remapping after writes."""
+        if self._map is None:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _entry_offset(self, index):
+        return HEADER_PREFIX.size + index * HEADER_ENTRY.size
+
+    def read(self, index):
+        """
+        Reads one chunk payload without loading the rest of the region.
+
+        Args:
+            index (int): Slot of the chunk within the region.
+
+        Returns:
+            bytes: The stored payload, or None if the slot is empty.
+        """
+
+        view = self._view()
+        offset, length, _ = HEADER_ENTRY.unpack_from(view, self._entry_offset(index))
+        if length == 0:
+            return None
+        return view[offset:offset + length]
+
+    def write(self, index, payload):
+        """
+        Stores a chunk payload, reusing its previous space when the payload still fits.
+
+        Args:
+            index (int): Slot of the chunk within the region.
+            payload (bytes): The payload to store.
+        """
+
+        entry_offset = self._entry_offset(index)
+        offset, _, capacity = HEADER_ENTRY.unpack_from(self._view(), entry_offset)
+
+        if len(payload) > capacity:
+            # Append a new sector-aligned block; the old one becomes unused space
+            self._file.seek(0, os.SEEK_END)
+            end = self._file.tell()
+            offset = -(-end // SECTOR_SIZE) * SECTOR_SIZE
+            capacity = -(-len(payload) // SECTOR_SIZE) * SECTOR_SIZE
+            self._file.truncate(offset + capacity)
+
+        self._file.seek(offset)
+        self._file.write(payload)
+        self._file.seek(entry_offset)
+        self._file.write(HEADER_ENTRY.pack(offset, len(payload), capacity))
+        self._file.flush()
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def close(self):
+        """Closes the memory map and the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class RegionStorage:
+    """Saves and loads chunks through a directory of region files."""
+
+    def __init__(self, directory, region_size=8, seed=0, registry=BLOCK_REGISTRY, max_open_files=16):
+        """
+        Initializes a RegionStorage object.
+
+        Args:
+            directory (str): Directory holding the region files; created if missing.
+            region_size (int, optional): Number of chunks along each horizontal side of a region. Defaults to 8.
+            seed (int, optional): World seed given to loaded chunks. Defaults to 0.
+            registry (BlockRegistry, optional): Registry to resolve block names against.
+                Defaults to the global block registry.
+            max_open_files (int, optional): Number of region files kept open. Defaults to 16.
+        """
+
+        self.directory = directory
+        self.region_size = region_size
+        self.seed = seed
+        self.registry = registry
+        self.max_open_files = max_open_files
+        self._regions = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+    def _locate(self, chunk_coords, create):
+        x, y, z = chunk_coords
+        size = self.region_size
+        region_coords = (x // size, y, z // size)
+        index = (x % size) + (z % size) * size
+
+        region = self._regions.get(region_coords)
+        if region is None:
+            path = os.path.join(self.directory, "r.{}.{}.{}.region".format(*region_coords))
+            if not create and not os.path.exists(path):
+                return None, index
+            region = RegionFile(path, size)
+            self._regions[region_coords] = region
+            while len(self._regions) > self.max_open_files:
+                self._regions.popitem(last=False)[1].close()
+        self._regions.move_to_end(region_coords)
+        return region, index
+
+    def load_chunk(self, chunk_coords):
+        """
+        Loads a saved chunk.
+
+        Args:
+            chunk_coords (Tuple[int, int, int]): Integer chunk coordinates.
+
+        Returns:
+            Chunk: The saved chunk, or None if it was never saved.
+        """
+
+        region, index = self._locate(chunk_coords, create=False)
+        if region is None:
+            return None
+        payload = region.read(index)
+        if payload is None:
+            return None
+
+        position = tuple(coordinate * Chunk.CHUNK_SIZE for coordinate in chunk_coords)
+        chunk = deserialize_chunk(zlib.decompress(payload), position, self.seed, self.registry)
+        chunk.clear_dirty(DirtyFlag.SAVE)
+        return chunk
+
+    def save_chunk(self, chunk_coords, chunk):
+        """
+        Saves a chunk and clears its SAVE dirty flag.
+
+        Args:
+            chunk_coords (Tuple[int, int, int]): Integer chunk coordinates.
+            chunk (Chunk): The chunk to save.
+        """
+
+        region, index = self._locate(chunk_coords, create=True)
+        region.write(index, zlib.compress(serialize_chunk(chunk)))
+        chunk.clear_dirty(DirtyFlag.SAVE)
+
+    def close(self):
+        """Closes every open region file."""
+        for region in self._regions.values():
+            region.close()
+        self._regions.clear()
@@ -1,26 +1,423 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from src.game.block_registry import AIR
 from src.game.chunk import Chunk
+from src.game.chunk_generator import ChunkGenerator
+from src.game.chunk_index import ChunkIndex
+from src.game.chunk_journal import DirtyFlag
+from src.game.lighting import LightEngine
+from src.game.region import RegionStorage
 from src.rendering.block_renderer import BlockRenderer
+from src.rendering.chunk_mesh import ChunkMesh
+from src.rendering.chunk_visibility import FULLY_CONNECTED, potentially_visible
+from src.rendering.mesh_builder import MeshBuilder
 
 
 class World:
-    def __init__(self):
-        self.chunks = []
+    def __init__(self, seed=0, generation_workers=None, load_radius=4, unload_radius=6,
+                 vertical_chunks=(0, 1), cache_size=64, save_directory=None, mesh_workers=None,
+                 mesh_upload_time=0.004, mesh_upload_bytes=None, render_distance=None, occlusion_culling=True,
+                 lod_distances=None):
+        """
+        Initializes a World object.
+
+        Chunks are streamed in around a focus point (the player) instead of being
+        generated up front, and are keyed by integer chunk coordinates.
+
+        Args:
+            seed (int, optional): World seed. Defaults to 0.
+            generation_workers (int, optional): Number of chunk generation processes.
+                Defaults to one less than the number of CPUs.
+            load_radius (int, optional): Horizontal radius, in chunks, that is kept loaded. Defaults to 4.
+            unload_radius (int, optional): Horizontal radius, in chunks, beyond which chunks are
+                unloaded. Must not be smaller than ``load_radius``. Defaults to 6.
+            vertical_chunks (Tuple[int, int], optional): Range of vertical chunk coordinates
+                (start inclusive, end exclusive) that make up a column. Defaults to (0, 1).
+            cache_size (int, optional): Number of recently unloaded chunks kept in memory so
+                backtracking does not regenerate them. Defaults to 64.
+            save_directory (str, optional): Directory of region files that chunks are loaded from
+                and saved to. Defaults to None, which disables persistence.
+            mesh_workers (int, optional): Number of mesh building threads. Defaults to one
+                less than the number of CPUs.
+            mesh_upload_time (float, optional): Seconds per frame spent uploading finished
+                meshes to the GPU, or None for no limit. Defaults to 0.004.
+            mesh_upload_bytes (int, optional): Vertex bytes uploaded per frame, or None for
+                no limit. Defaults to None.
+            render_distance (int, optional): Distance, in chunks, beyond which chunks are not
+                drawn. Defaults to ``load_radius``.
+            occlusion_culling (bool, optional): Whether chunks hidden behind opaque terrain are
+                skipped using the chunks' face connectivity. Defaults to True.
+            lod_distances (Tuple[int, ...], optional): Horizontal distances, in chunks, from the
+                focus chunk at which meshes switch to the successive downsampled levels of
+                Chunk.LOD_FACTORS (2x, 4x, 8x). Defaults to a half, three quarters and all of
+                ``load_radius``, e.g. (2, 3, 4) at the default radius, so every level is in use.
+        """
+
+        if unload_radius < load_radius:
+            raise ValueError("unload_radius must not be smaller than load_radius")
+
+        self.chunks = {}
+        self.chunk_meshes = {}
+        self.seed = seed
+        self.tick = 0
+        self.load_radius = load_radius
+        self.unload_radius = unload_radius
+        self.vertical_chunks = vertical_chunks
+        self.cache_size = cache_size
+        self.render_distance = load_radius if render_distance is None else render_distance
+        self.occlusion_culling = occlusion_culling
+        if lod_distances is None:
+            lod_distances = (max(1, load_radius // 2), max(1, load_radius * 3 // 4), max(1, load_radius))
+        self.lod_distances = tuple(lod_distances)
+        # LOD factor each chunk's latest mesh request was built at
+        self.chunk_lods = {}
+        # Chunks drawn, dropped by the frustum and distance test, and hidden by occlusion culling
+        # during the last render; empty meshes count as none of these
+        self.visible_chunks = 0
+        self.culled_chunks = 0
+        self.occluded_chunks = 0
+        # Face connectivity of every meshed chunk, and the potentially visible set it last produced
+        self.chunk_connectivity = {}
+        self._connectivity_version = 0
+        self._visible_set = (None, None)
+        self.unloaded_chunks = OrderedDict()
+        self.focus_chunk = None
+        self.chunk_generator = ChunkGenerator(seed, generation_workers)
+        self.region_storage = RegionStorage(save_directory, seed=seed) if save_directory is not None else None
+        self.lighting = LightEngine(self.chunks)
+        self.chunk_index = ChunkIndex(self.chunks)
         self.block_renderer = BlockRenderer()
+        self.mesh_builder = MeshBuilder(mesh_workers, layers=self.block_renderer.textures.layers,
+                                        time_budget=mesh_upload_time, byte_budget=mesh_upload_bytes)
         self.player_direction = Direction()  # Create a Direction object for player direction
-        self.generate_chunks()
+        self.set_focus((0, 0, 0))
         self.directional_light = None
 
+    @staticmethod
+    def chunk_coords(position):
+        """
+        Returns the integer chunk coordinates containing a world position.
+
+        Args:
+            position (Tuple[float, float, float]): World position.
+
+        Returns:
+            Tuple[int, int, int]: Chunk coordinates.
+        """
+        return tuple(int(coordinate // Chunk.CHUNK_SIZE) for coordinate in position)
+
+    def get_chunk(self, chunk_coords):
+        """Returns the loaded chunk at the given chunk coordinates, or None."""
+        return self.chunks.get(chunk_coords)
+
+    def get_block(self, x, y, z):
+        """
+        Retrieves the block at a world position in constant time.
+
+        Args:
+            x (float): World X coordinate.
+            y (float): World Y coordinate.
+            z (float): World Z coordinate.
+
+        Returns:
+            BlockType: The block type at the position, or None if its chunk is not loaded.
+        """
+
+        x, y, z = int(np.floor(x)), int(np.floor(y)), int(np.floor(z))
+        size = Chunk.CHUNK_SIZE
+        chunk = self.chunks.get((x // size, y // size, z // size))
+        if chunk is None:
+            return None
+        return chunk.get_block(x % size, y % size, z % size)
+
+    def set_block(self, x, y, z, block):
+        """
+        Sets the block at a world position in constant time.
+
+        The light around the position is updated incrementally; see LightEngine.update_blocks.
+
+        Args:
+            x (float): World X coordinate.
+            y (float): World Y coordinate.
+            z (float): World Z coordinate.
+            block (Union[BlockType, Block]): The block type to set.
+
+        Raises:
+            ValueError: If the position's chunk is not loaded.
+        """
+
+        x, y, z = int(np.floor(x)), int(np.floor(y)), int(np.floor(z))
+        size = Chunk.CHUNK_SIZE
+        coords = (x // size, y // size, z // size)
+        chunk = self.chunks.get(coords)
+        if chunk is None:
+            raise ValueError(f"No chunk is loaded at ({x}, {y}, {z})")
+        local = np.array([[x % size, y % size, z % size]])
+        chunk.set_block(*local[0], block, tick=self.tick)
+        self.chunk_index.mark_dirty(coords)
+        self._mark_neighbours_dirty(coords, local)
+        self._relight(np.array([[x, y, z]]))
+
+    def get_blocks(self, positions, default=AIR.id):
+        """
+        Retrieves the block IDs at many world positions at once.
+
+        Lookups go through a dense copy of the loaded chunks (see ChunkIndex), so the cost
+        is a few vectorized gathers however many chunks are loaded or the positions span.
+
+        Args:
+            positions (np.ndarray): An (N, 3) array of world positions.
+            default (int, optional): Block ID reported for positions in unloaded chunks.
+                Defaults to the ID of air.
+
+        Returns:
+            np.ndarray: An (N,) ``uint16`` array of registry block IDs.
+        """
+
+        return self.chunk_index.get_blocks(positions, default)
+
+    def air_boxes(self, minimums, maximums):
+        """
+        Tells which small boxes of cells certainly hold nothing but air; see ChunkIndex.air_boxes.
+
+        Args:
+            minimums (np.ndarray): An (N, 3) integer array of the boxes' minimum cells.
+            maximums (np.ndarray): An (N, 3) integer array of the cells just past their maximum.
+
+        Returns:
+            np.ndarray: An (N,) bool array, True for boxes that are all air.
+        """
+
+        return self.chunk_index.air_boxes(minimums, maximums)
+
+    def changed_chunks(self, since):
+        """
+        Returns the chunks added, removed or edited after a version; see ChunkIndex.changed_chunks.
+
+        Args:
+            since (int): A version previously returned by this method, or None.
+
+        Returns:
+            Tuple[int, Set[Tuple[int, int, int]]]: The current version and the changed chunk
+            coordinates, or None in place of the set if any chunk may have changed.
+        """
+
+        return self.chunk_index.changed_chunks(since)
+
+    def set_blocks(self, positions, block):
+        """
+        Sets many world positions to the same block type at once.
+
+        Positions in unloaded chunks are skipped.
+
+        Args:
+            positions (np.ndarray): An (N, 3) array of world positions.
+            block (Union[BlockType, Block]): The block type to set.
+        """
+
+        cells = np.floor(np.asarray(positions, dtype=np.float64)).astype(np.int64).reshape(-1, 3)
+        for coords, chunk, _, local in self._group_by_chunk(cells):
+            chunk.set_blocks(local, block, tick=self.tick)
+            self.chunk_index.mark_dirty(coords)
+            self._mark_neighbours_dirty(coords, local)
+        self._relight(cells)
+
+    def _relight(self, cells):
+        """Updates the light around edited cells and marks the meshes of chunks whose light changed."""
+        for coords in self.lighting.update_blocks(cells):
+            self.chunks[coords].mark_dirty(DirtyFlag.MESH)
+
+    def _mark_neighbours_dirty(self, coords, local):
+        """Marks the meshes of chunks bordering edited cells as dirty."""
+        last = Chunk.CHUNK_SIZE - 1
+        for axis in range(3):
+            for edge, step in ((0, -1), (last, 1)):
+                if not (local[:, axis] == edge).any():
+                    continue
+                neighbour_coords = list(coords)
+                neighbour_coords[axis] += step
+                neighbour = self.chunks.get(tuple(neighbour_coords))
+                if neighbour is not None:
+                    neighbour.mark_dirty(DirtyFlag.MESH)
+
+    def _group_by_chunk(self, cells):
+        """Yields (chunk coordinates, chunk, selection, local cells) for every loaded chunk holding some of the cells."""
+        size = Chunk.CHUNK_SIZE
+        chunk_cells = cells // size
+        keys, inverse = np.unique(chunk_cells, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for index, key in enumerate(keys):
+            coords = tuple(int(coordinate) for coordinate in key)
+            chunk = self.chunks.get(coords)
+            if chunk is None:
+                continue
+            selection = np.flatnonzero(inverse == index)
+            yield coords, chunk, selection, cells[selection] % size
+
     def generate_chunks(self):
-        # Generate chunks around the origin (0, 0, 0)
-        for x in range(-1, 2):
-            for z in range(-1, 2):
-                chunk = Chunk((x * Chunk.CHUNK_SIZE, 0, z * Chunk.CHUNK_SIZE))
-                self.chunks.append(chunk)
+        """
+        Loads every chunk within the load radius of the focus chunk.
+
+        Chunks still in the unload cache or saved on disk are restored immediately; the
+        rest are queued for generation and added by update() as workers finish them.
+        """
+
+        center_x, _, center_z = self.focus_chunk
+        radius = self.load_radius
+        for x in range(center_x - radius, center_x + radius + 1):
+            for z in range(center_z - radius, center_z + radius + 1):
+                if (x - center_x) ** 2 + (z - center_z) ** 2 > radius * radius:
+                    continue
+                for y in range(*self.vertical_chunks):
+                    coords = (x, y, z)
+                    if coords in self.chunks:
+                        continue
+                    cached = self.unloaded_chunks.pop(coords, None)
+                    if cached is None and self.region_storage is not None:
+                        cached = self.region_storage.load_chunk(coords)
+                    if cached is not None:
+                        self.add_chunk(coords, cached)
+                    else:
+                        self.chunk_generator.request(self.chunk_position(coords))
+
+    def add_chunk(self, coords, chunk):
+        """
+        Makes a chunk part of the loaded world, lights it, and marks its neighbours' border
+        faces and every chunk its light reached for rebuilding.
+        """
+
+        self.chunks[coords] = chunk
+        self.chunk_index.mark_dirty(coords)
+        chunk.mark_dirty(DirtyFlag.MESH | DirtyFlag.LIGHT)
+        for neighbour_coords in self.neighbour_coords(coords):
+            neighbour = self.chunks.get(neighbour_coords)
+            if neighbour is not None:
+                neighbour.mark_dirty(DirtyFlag.MESH)
+        for changed_coords in self.lighting.light_chunk(coords):
+            self.chunks[changed_coords].mark_dirty(DirtyFlag.MESH)
+
+    @staticmethod
+    def neighbour_coords(coords):
+        """Returns the chunk coordinates of the six chunks sharing a face with the given one."""
+        x, y, z = coords
+        return ((x + 1, y, z), (x - 1, y, z), (x, y + 1, z), (x, y - 1, z), (x, y, z + 1), (x, y, z - 1))
+
+    def padded_block_ids(self, coords, include=None):
+        """
+        Returns a chunk's block IDs surrounded by one layer of its face neighbours' voxels.
+
+        Args:
+            coords (Tuple[int, int, int]): Integer chunk coordinates of a loaded chunk.
+            include (Callable[[Tuple[int, int, int]], bool], optional): Returns whether a
+                neighbour's voxels are copied into the border; excluded neighbours read as
+                air. Defaults to including every loaded neighbour.
+
+        Returns:
+            np.ndarray: An (18, 18, 18) ``uint16`` array. Voxels of unloaded neighbours,
+            and the edges and corners of the border, are air.
+        """
+
+        size = Chunk.CHUNK_SIZE
+        padded = np.full((size + 2,) * 3, AIR.id, dtype=np.uint16)
+        padded[1:-1, 1:-1, 1:-1] = self.chunks[coords].block_ids()
+        for axis in range(3):
+            for step, source_layer, target_layer in ((-1, size - 1, 0), (1, 0, size + 1)):
+                neighbour_coords = list(coords)
+                neighbour_coords[axis] += step
+                neighbour_coords = tuple(neighbour_coords)
+                neighbour = self.chunks.get(neighbour_coords)
+                if neighbour is None or (include is not None and not include(neighbour_coords)):
+                    continue
+                source = [slice(None)] * 3
+                source[axis] = source_layer
+                target = [slice(1, -1)] * 3
+                target[axis] = target_layer
+                padded[tuple(target)] = neighbour.palette_ids()[neighbour.blocks[tuple(source)]]
+        return padded
+
+    def unload_distant_chunks(self):
+        """Moves chunks beyond the unload radius into the LRU cache, evicting the oldest ones."""
+        for coords in [coords for coords in self.chunks if not self.within_radius(coords, self.unload_radius)]:
+            self.cache_chunk(coords, self.chunks.pop(coords))
+            self.chunk_index.mark_dirty(coords)
+
+    def cache_chunk(self, coords, chunk):
+        """Stores an unloaded chunk as the most recently used cache entry."""
+        self.unloaded_chunks[coords] = chunk
+        self.unloaded_chunks.move_to_end(coords)
+        while len(self.unloaded_chunks) > self.cache_size:
+            self.save_chunk(*self.unloaded_chunks.popitem(last=False))
+
+    def save_chunk(self, coords, chunk):
+        """Writes a chunk to its region file if persistence is enabled and the chunk has unsaved data."""
+        if self.region_storage is not None and chunk.is_dirty(DirtyFlag.SAVE):
+            self.region_storage.save_chunk(coords, chunk)
+
+    def save(self):
+        """Writes every loaded and cached chunk with unsaved data to disk."""
+        for chunks in (self.chunks, self.unloaded_chunks):
+            for coords, chunk in chunks.items():
+                self.save_chunk(coords, chunk)
+
+    def within_radius(self, coords, radius):
+        """Returns whether chunk coordinates lie within a horizontal radius of the focus chunk."""
+        return (coords[0] - self.focus_chunk[0]) ** 2 + (coords[2] - self.focus_chunk[2]) ** 2 <= radius * radius
+
+    @staticmethod
+    def chunk_position(coords):
+        """Returns the world position of the origin of the chunk at the given chunk coordinates."""
+        return tuple(coordinate * Chunk.CHUNK_SIZE for coordinate in coords)
+
+    def set_focus(self, position):
+        """
+        Sets the point, usually the player's position, that chunks are streamed around.
+
+        Crossing into another chunk loads newly covered chunks, unloads distant ones and
+        reprioritizes pending generation.
+
+        Args:
+            position (Tuple[float, float, float]): The new focus point.
+        """
+
+        focus_chunk = self.chunk_coords(position)
+        if focus_chunk == self.focus_chunk:
+            return
+
+        self.focus_chunk = focus_chunk
+        self.chunk_generator.set_focus(position)
+        self.mesh_builder.set_focus(focus_chunk)
+        self.unload_distant_chunks()
+        self.chunk_generator.retain(
+            lambda chunk_position: self.within_radius(self.chunk_coords(chunk_position), self.unload_radius)
+        )
+        self.generate_chunks()
+
+    def collect_generated_chunks(self):
+        """Adds chunks that finished generating to the world without waiting for pending ones."""
+        for chunk in self.chunk_generator.poll():
+            coords = self.chunk_coords(chunk.position)
+            if self.within_radius(coords, self.unload_radius):
+                self.add_chunk(coords, chunk)
+            else:
+                self.cache_chunk(coords, chunk)
 
     def update(self, delta_time):
-        for chunk in self.chunks:
+        self.tick += 1
+        self.collect_generated_chunks()
+        self.update_meshes()
+        for chunk in self.chunks.values():
             chunk.update(delta_time)  # Pass delta_time to chunk update
 
+    def close(self):
+        """Stops background chunk generation and meshing and saves the world."""
+        self.chunk_generator.close()
+        self.mesh_builder.close()
+        if self.region_storage is not None:
+            self.save()
+            self.region_storage.close()
+
     def get_player_direction(self):
         """Returns the current direction of the player."""
         return self.player_direction
@@ -32,9 +429,174 @@ class World:
         else:
             raise TypeError("Player direction must be a Direction object")
 
-    def render(self, block_renderer):
-        for chunk in self.chunks:
-            chunk.render(block_renderer)
+    def update_meshes(self):
+        """
+        Queues changed chunks for meshing on the background builder.
+
+        Each request carries a snapshot of the chunk, its border and their light, so edits
+        made while a mesh is being built dirty the chunk again and the outdated result is
+        discarded.
+        Chunks whose level of detail changed with the focus are queued as well; their old
+        mesh stays on screen until the new one is uploaded.
+        """
+
+        for coords in (set(self.chunk_meshes) | set(self.chunk_lods)) - set(self.chunks):
+            if coords in self.chunk_meshes:
+                self.chunk_meshes.pop(coords).delete()
+            self.chunk_lods.pop(coords, None)
+            self.mesh_builder.cancel(coords)
+            if self.chunk_connectivity.pop(coords, None) is not None:
+                self._connectivity_version += 1
+
+        factors = {coords: self.lod_factor(coords) for coords in self.chunks}
+        for coords, factor in factors.items():
+            if self.chunk_lods.get(coords, factor) != factor:
+                # Full-resolution neighbours cull their border faces against this chunk, so they must follow
+                for neighbour_coords in self.neighbour_coords(coords):
+                    if neighbour_coords in self.chunks:
+                        self.chunks[neighbour_coords].mark_dirty(DirtyFlag.MESH)
+
+        for coords, chunk in self.chunks.items():
+            factor = factors[coords]
+            if not chunk.is_dirty(DirtyFlag.MESH) and self.chunk_lods.get(coords) == factor:
+                continue
+            if factor == 1:
+                # Neighbours at a coarser level may not cover this chunk's border, so their faces stay
+                padded = self.padded_block_ids(coords, lambda neighbour: factors[neighbour] == 1)
+                light = self.lighting.padded_light(coords)
+                self.mesh_builder.request(coords, padded, chunk.mesh_mode, light=light)
+            else:
+                # Downsampled chunks keep every border face as a skirt that hides cracks between levels;
+                # they are too far away for their light to be worth sampling and stay fully lit
+                padded = np.pad(chunk.lod_block_ids(factor), 1, constant_values=AIR.id)
+                self.mesh_builder.request(coords, padded, chunk.mesh_mode, factor, chunk.block_ids())
+            self.chunk_lods[coords] = factor
+            chunk.clear_dirty(DirtyFlag.MESH)
+        self.mesh_builder.poll()
+
+    def lod_factor(self, coords):
+        """
+        Returns the LOD factor a chunk is meshed at, from its horizontal distance to the focus chunk.
+
+        Args:
+            coords (Tuple[int, int, int]): Integer chunk coordinates.
+
+        Returns:
+            int: One of Chunk.LOD_FACTORS.
+        """
+
+        distance = ((coords[0] - self.focus_chunk[0]) ** 2 + (coords[2] - self.focus_chunk[2]) ** 2) ** 0.5
+        level = sum(distance >= threshold for threshold in self.lod_distances)
+        return Chunk.LOD_FACTORS[min(level, len(Chunk.LOD_FACTORS) - 1)]
+
+    def upload_meshes(self):
+        """
+        Uploads finished meshes, nearest to the focus first, within the per-frame upload budget.
+        Must be called on the thread owning the GL context.
+
+        Returns:
+            int: The number of chunk meshes uploaded.
+        """
+
+        return self.mesh_builder.upload(self._upload_mesh)
+
+    def _upload_mesh(self, coords, vertices, connectivity):
+        chunk = self.chunks.get(coords)
+        if chunk is None:
+            return
+        mesh = self.chunk_meshes.get(coords)
+        if mesh is None:
+            mesh = self.chunk_meshes[coords] = ChunkMesh(chunk.position)
+        mesh.upload(vertices)
+
+        previous = self.chunk_connectivity.get(coords)
+        if previous is None or not np.array_equal(previous, connectivity):
+            self.chunk_connectivity[coords] = connectivity
+            self._connectivity_version += 1
+
+    def potentially_visible_chunks(self, camera):
+        """
+        Returns the chunk coordinates that may be visible from the camera's chunk through
+        non-opaque voxels. Chunks that are not meshed yet, and the open sky above and
+        below the loaded columns, are treated as fully see-through.
+
+        The result is cached until the camera changes chunk or a chunk's connectivity changes.
+
+        Args:
+            camera (Camera): The camera to search from.
+
+        Returns:
+            Set[Tuple[int, int, int]]: The potentially visible chunk coordinates.
+        """
+
+        start = self.chunk_coords(camera.position)
+        key = (start, self._connectivity_version)
+        if self._visible_set[0] == key:
+            return self._visible_set[1]
+
+        bottom, top = self.vertical_chunks
+        radius = self.render_distance
+
+        def within(coords):
+            return (bottom - 1 <= coords[1] <= top
+                    and (coords[0] - start[0]) ** 2 + (coords[2] - start[2]) ** 2 <= radius * radius)
+
+        visible = potentially_visible(
+            start, lambda coords: self.chunk_connectivity.get(coords, FULLY_CONNECTED), within
+        )
+        self._visible_set = (key, visible)
+        return visible
+
+    def visible_meshes(self, camera):
+        """
+        Returns the non-empty chunk meshes that lie inside the camera's frustum and render
+        distance and are not occluded (if occlusion culling is on), and updates the visible,
+        culled and occluded chunk counters.
+
+        Args:
+            camera (Camera): The camera to cull against, or None to keep every mesh.
+
+        Returns:
+            List[ChunkMesh]: The meshes to draw.
+        """
+
+        meshes = [mesh for mesh in self.chunk_meshes.values() if mesh.vertex_count > 0]
+        self.occluded_chunks = 0
+        self.culled_chunks = 0
+        if camera is not None and meshes:
+            minimums = np.array([mesh.origin for mesh in meshes], dtype=np.float64)
+            visible = camera.boxes_visible(minimums, minimums + Chunk.CHUNK_SIZE,
+                                           self.render_distance * Chunk.CHUNK_SIZE)
+            self.culled_chunks = len(meshes) - int(np.count_nonzero(visible))
+            meshes = [mesh for mesh, keep in zip(meshes, visible) if keep]
+        # Chunks past the render distance are outside the visibility search too, so the frustum and
+        # distance test goes first and the occlusion count holds only chunks that were in view
+        if camera is not None and self.occlusion_culling and meshes:
+            visible_set = self.potentially_visible_chunks(camera)
+            unoccluded = [mesh for mesh in meshes if self.chunk_coords(mesh.origin) in visible_set]
+            self.occluded_chunks = len(meshes) - len(unoccluded)
+            meshes = unoccluded
+
+        self.visible_chunks = len(meshes)
+        return meshes
+
+    def render(self, block_renderer, camera=None):
+        """
+        Draws the uploaded chunk meshes that survive culling, with a single texture bind.
+
+        Args:
+            block_renderer (BlockRenderer): Renderer providing the shader and texture array.
+            camera (Camera, optional): Camera supplying the view and projection and the
+                frustum to cull against. Defaults to None, which draws every chunk.
+        """
+
+        block_renderer.state.use_program(block_renderer.shader.program)
+        block_renderer.textures.bind(block_renderer.state)
+        block_renderer.camera_buffer.bind()
+        if camera is not None:
+            camera.apply(block_renderer.camera_buffer)
+        for mesh in self.visible_meshes(camera):
+            mesh.draw(block_renderer.shader)
 
     def set_directional_light(self, light_direction, light_color):
         """
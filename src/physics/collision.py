@@ -1,26 +1,205 @@
+import numpy as np
+
 from src.game.block import Block
-from src.game.player import Player
+from src.game.block_registry import BLOCK_REGISTRY
+
+# Boxes that merely touch a block face do not overlap it
+EPSILON = 1e-7
+# Vertical movement is resolved first, so walking off a ledge or landing never snags on walls
+AXIS_ORDER = (1, 0, 2)
+
+
+def overlapped_cells(minimum, maximum):
+    """
+    Returns the integer cells an axis-aligned box overlaps.
+
+    Args:
+        minimum (np.ndarray): The box's minimum corner.
+        maximum (np.ndarray): The box's maximum corner.
+
+    Returns:
+        np.ndarray: An (N, 3) ``int64`` array of cell coordinates; empty if the box has no volume.
+    """
+
+    low = np.floor(np.asarray(minimum, dtype=np.float64) + EPSILON).astype(np.int64)
+    high = np.ceil(np.asarray(maximum, dtype=np.float64) - EPSILON).astype(np.int64)
+    if (high <= low).any():
+        return np.zeros((0, 3), dtype=np.int64)
+    grids = np.meshgrid(*(np.arange(low[axis], high[axis]) for axis in range(3)), indexing="ij")
+    return np.stack(grids, axis=-1).reshape(-1, 3)
+
 
 class Collision:
-    def __init__(self):
-        pass
+    """Collision of axis-aligned boxes against the world's solid voxels."""
+
+    def __init__(self, registry=BLOCK_REGISTRY):
+        """
+        Initializes a Collision object.
+
+        Args:
+            registry (BlockRegistry, optional): Registry providing the solid lookup table.
+                Defaults to the global block registry.
+        """
+
+        self.registry = registry
+
+    def solid_cells(self, world, minimum, maximum):
+        """
+        Returns the solid cells an axis-aligned box overlaps.
+
+        Only the cells inside the box are looked up, in one batched query, so the cost
+        depends on the size of the box and not on the size of the world. Cells in
+        unloaded chunks count as air.
+
+        Args:
+            world (World): The world to query.
+            minimum (np.ndarray): The box's minimum corner.
+            maximum (np.ndarray): The box's maximum corner.
+
+        Returns:
+            np.ndarray: An (N, 3) ``int64`` array of solid cell coordinates.
+        """
+
+        cells = overlapped_cells(minimum, maximum)
+        if len(cells) == 0:
+            return cells
+        return cells[np.asarray(self.registry.solid)[world.get_blocks(cells)]]
+
+    def sweep(self, world, position, size, displacement):
+        """
+        Moves a box through the world, stopping it at solid cells.
+
+        The movement is resolved one axis at a time (Y, then X, then Z). On each axis the
+        box is swept over its whole displacement against every solid cell in its path, so
+        a fast-moving box cannot tunnel through thin walls. Cells the box already overlaps
+        are ignored, so a box stuck inside terrain can move out of it.
+
+        Args:
+            world (World): The world to collide with.
+            position (Tuple[float, float, float]): The box's minimum corner.
+            size (Tuple[float, float, float]): The box's extent along each axis.
+            displacement (Tuple[float, float, float]): The intended movement.
+
+        Returns:
+            Tuple[np.ndarray, List[Tuple[int, int, int]]]: The box's new minimum corner and
+            the normals of the faces it came to rest against, e.g. (0, 1, 0) for the ground.
+        """
+
+        positions, normals = self.sweep_boxes(
+            world, np.reshape(position, (1, 3)), np.reshape(size, (1, 3)), np.reshape(displacement, (1, 3))
+        )
+        return positions[0], [self._normal(axis, int(normals[0, axis])) for axis in AXIS_ORDER if normals[0, axis]]
+
+    def sweep_boxes(self, world, positions, sizes, displacements):
+        """
+        Moves many boxes through the world at once, each stopping at solid cells as in sweep().
+
+        The cells every box can reach are looked up in one batched query, and only the
+        solid ones take part in the per-axis resolution. Worlds with an ``air_boxes`` method,
+        such as World, first rule out boxes in open air, whose cells are then not looked up at all.
+
+        Args:
+            world (World): The world to collide with.
+            positions (np.ndarray): An (N, 3) array of minimum corners.
+            sizes (np.ndarray): An (N, 3) array of box extents.
+            displacements (np.ndarray): An (N, 3) array of intended movements.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The (N, 3) new minimum corners and an (N, 3)
+            ``int8`` array holding, per axis, the sign of the normal of the face each box
+            came to rest against, or 0 where it moved freely.
+        """
+
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        sizes = np.asarray(sizes, dtype=np.float64).reshape(-1, 3)
+        displacements = np.asarray(displacements, dtype=np.float64).reshape(-1, 3)
+        normals = np.zeros(positions.shape, dtype=np.int8)
+
+        owners, cells = self._reachable_solid_cells(world, positions, sizes, displacements)
+        if len(owners) == 0:
+            return positions + displacements, normals
+        # Owners are sorted, so each box's cells form one segment for the per-box reductions
+        starts = np.flatnonzero(np.concatenate(([True], owners[1:] != owners[:-1])))
+        boxes = owners[starts]
+
+        # Cells relative to their box's minimum corner, and whether each overlaps the box on each axis;
+        # both are kept up to date as the boxes move, instead of being recomputed from world positions
+        offsets = cells - positions[owners]
+        box_sizes = sizes[owners]
+        overlaps = (offsets < box_sizes - EPSILON) & (offsets > EPSILON - 1)
+
+        for axis in AXIS_ORDER:
+            first, second = (other for other in range(3) if other != axis)
+            across = overlaps[:, first] & overlaps[:, second]
+
+            # Distance each cell is ahead of its box in the direction the box moves; negative if behind
+            wanted = displacements[:, axis]
+            forward = wanted[owners] > 0
+            gaps = np.where(forward, offsets[:, axis] - box_sizes[:, axis], -1 - offsets[:, axis])
+            gaps = np.where(across & (gaps >= -EPSILON), gaps, np.inf)
+            limits = np.minimum.reduceat(gaps, starts)
+
+            distance = wanted.copy()
+            moving = np.abs(wanted[boxes])
+            hit = (moving > 0) & (limits < moving)
+            hit_boxes = boxes[hit]
+            distance[hit_boxes] = np.copysign(np.maximum(limits[hit], 0.0), wanted[hit_boxes])
+            normals[hit_boxes, axis] = np.where(wanted[hit_boxes] > 0, -1, 1)
+            positions[:, axis] += distance
+
+            offsets[:, axis] -= distance[owners]
+            overlaps[:, axis] = (offsets[:, axis] < box_sizes[:, axis] - EPSILON) & (offsets[:, axis] > EPSILON - 1)
+        return positions, normals
+
+    def _reachable_solid_cells(self, world, positions, sizes, displacements):
+        """Returns the owning box index and coordinates of every solid cell inside each box's swept bounds, by box."""
+        ends = positions + displacements
+        low = np.floor(np.minimum(positions, ends) + EPSILON).astype(np.int64)
+        high = np.ceil(np.maximum(positions, ends) + sizes - EPSILON).astype(np.int64)
+        extents = np.maximum(high - low, 0)
+
+        # Enumerate each box's cell range without padding every box to the largest one; this works on
+        # columns rather than reducing over rows, which is much slower for three-wide arrays
+        depth, height = extents[:, 2], extents[:, 1]
+        counts = extents[:, 0] * height * depth
+        air_boxes = getattr(world, "air_boxes", None)
+        if air_boxes is not None:
+            # Boxes the world can tell are in open air have no cells worth enumerating
+            counts *= ~air_boxes(low, high)
+        owners = np.repeat(np.arange(len(positions)), counts)
+        ranks = np.arange(len(owners)) - (np.cumsum(counts) - counts)[owners]
+        depth, height = depth[owners], height[owners]
+        cells = low[owners]
+        cells[:, 2] += ranks % depth
+        ranks //= depth
+        cells[:, 1] += ranks % height
+        cells[:, 0] += ranks // height
+
+        solid = np.asarray(self.registry.solid)[world.get_blocks(cells)]
+        return owners[solid], cells[solid]
+
+    @staticmethod
+    def _normal(axis, sign):
+        normal = [0, 0, 0]
+        normal[axis] = sign
+        return tuple(normal)
 
     def check_collision_with_blocks(self, player, world):
-        player_position = player.get_position()
-        player_size = player.get_size()
-
-        for chunk in world.chunks:
-            for block in chunk.blocks:
-                if (
-                    player_position[0] < block.position[0] + 1
-                    and player_position[0] + player_size[0] > block.position[0]
-                    and player_position[1] < block.position[1] + 1
-                    and player_position[1] + player_size[1] > block.position[1]
-                    and player_position[2] < block.position[2] + 1
-                    and player_position[2] + player_size[2] > block.position[2]
-                ):
-                    # Collision detected, handle accordingly
-                    return block
-
-        # No collision detected
-        return None
+        """
+        Returns a solid block overlapping the player's bounding box.
+
+        Args:
+            player (Player): The player, whose position is the box's minimum corner.
+            world (World): The world to query.
+
+        Returns:
+            Block: One of the overlapping solid blocks, or None if the box is free.
+        """
+
+        player_position = np.asarray(player.get_position(), dtype=np.float64)
+        player_size = np.asarray(player.get_size(), dtype=np.float64)
+        cells = self.solid_cells(world, player_position, player_position + player_size)
+        if len(cells) == 0:
+            return None
+        x, y, z = (int(value) for value in cells[0])
+        return Block((x, y, z), world.get_block(x, y, z).name)
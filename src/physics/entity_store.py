@@ -0,0 +1,173 @@
+from enum import IntFlag
+
+import numpy as np
+
+
+class EntityFlag(IntFlag):
+    """Per-entity state bits kept in EntityStore.flags."""
+
+    NONE = 0
+    ALIVE = 1
+    GRAVITY = 2
+    COLLIDES = 4
+    ON_GROUND = 8
+    JUMPING = 16
+    SLEEPING = 32
+
+
+# Flags of a new entity unless others are given: a falling, colliding body such as a dropped item
+DEFAULT_FLAGS = EntityFlag.GRAVITY | EntityFlag.COLLIDES
+
+
+class EntityStore:
+    """
+    Physics state of every entity as a structure of arrays.
+
+    Entity ``i`` owns row ``i`` of ``position``, ``velocity`` and ``size`` and entry ``i``
+    of ``flags``, so systems such as Physics.step update thousands of entities with a few
+    NumPy operations instead of one method call each. Positions are the minimum corners
+    of the entities' bounding boxes, and ``previous_position`` holds them as of the start
+    of the current tick for render interpolation. Rows of removed entities are reused by
+    later ones.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Initializes an EntityStore object.
+
+        Args:
+            capacity (int, optional): Number of entities room is reserved for; the store grows
+                as needed. Defaults to 64.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.position = np.zeros((capacity, 3), dtype=np.float64)
+        self.previous_position = np.zeros((capacity, 3), dtype=np.float64)
+        self.velocity = np.zeros((capacity, 3), dtype=np.float64)
+        self.size = np.zeros((capacity, 3), dtype=np.float64)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.count = 0
+        self._free = []
+
+    def __len__(self):
+        """Returns the number of live entities."""
+        return self.count - len(self._free)
+
+    def add(self, position, size, velocity=(0.0, 0.0, 0.0), flags=DEFAULT_FLAGS):
+        """
+        Adds an entity.
+
+        Args:
+            position (Tuple[float, float, float]): Minimum corner of its bounding box.
+            size (Tuple[float, float, float]): Extent of its bounding box along each axis.
+            velocity (Tuple[float, float, float], optional): Initial velocity. Defaults to rest.
+            flags (EntityFlag, optional): Behaviour flags; ALIVE is always added. Defaults to
+                GRAVITY | COLLIDES.
+
+        Returns:
+            int: The entity's index into the arrays, valid until it is removed.
+        """
+
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self.count == len(self.flags):
+                self._grow(self.count * 2)
+            index = self.count
+            self.count += 1
+
+        self.position[index] = position
+        self.previous_position[index] = position
+        self.velocity[index] = velocity
+        self.size[index] = size
+        self.flags[index] = flags | EntityFlag.ALIVE
+        return index
+
+    def add_many(self, positions, sizes, velocities=None, flags=DEFAULT_FLAGS):
+        """
+        Adds many entities at once, appended after the existing ones.
+
+        Args:
+            positions (np.ndarray): An (N, 3) array of minimum corners.
+            sizes (np.ndarray): An (N, 3) array, or one (3,) size shared by every entity.
+            velocities (np.ndarray, optional): An (N, 3) array of initial velocities. Defaults to rest.
+            flags (EntityFlag, optional): Behaviour flags of every new entity. Defaults to
+                GRAVITY | COLLIDES.
+
+        Returns:
+            np.ndarray: The N new entity indices.
+        """
+
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        count = len(positions)
+        if self.count + count > len(self.flags):
+            self._grow(max(self.count + count, len(self.flags) * 2))
+
+        indices = np.arange(self.count, self.count + count)
+        self.position[indices] = positions
+        self.previous_position[indices] = positions
+        self.velocity[indices] = 0.0 if velocities is None else velocities
+        self.size[indices] = sizes
+        self.flags[indices] = flags | EntityFlag.ALIVE
+        self.count += count
+        return indices
+
+    def remove(self, index):
+        """
+        Removes an entity; its index may be handed to a later add().
+
+        Raises:
+            ValueError: If the entity is not alive.
+        """
+
+        if not 0 <= index < self.count or not self.flags[index] & EntityFlag.ALIVE:
+            raise ValueError(f"Entity {index} is not alive")
+        self.flags[index] = EntityFlag.NONE
+        self._free.append(index)
+
+    def alive(self):
+        """Returns the indices of every live entity, in increasing order."""
+        return np.flatnonzero(self.flags[:self.count] & EntityFlag.ALIVE)
+
+    def save_positions(self):
+        """Copies every position to ``previous_position``; call at the start of each tick."""
+        self.previous_position[:self.count] = self.position[:self.count]
+
+    def interpolated_position(self, alpha, entities=slice(None)):
+        """
+        Returns positions blended between the previous tick and the current one.
+
+        Args:
+            alpha (float): Fraction of a tick since the current positions were simulated,
+                as returned by FixedTimestep.advance().
+            entities (Union[int, np.ndarray, slice], optional): The entities to blend. Defaults to all rows.
+
+        Returns:
+            np.ndarray: The blended positions, shaped like ``position[entities]``.
+        """
+
+        previous = self.previous_position[entities]
+        return previous + (self.position[entities] - previous) * alpha
+
+    def has_flags(self, index, flags):
+        """Returns whether an entity has all of the given flags."""
+        return (int(self.flags[index]) & flags) == flags
+
+    def set_flags(self, index, flags, value=True):
+        """Sets or clears flags of one entity, or of an array of them."""
+        if value:
+            self.flags[index] |= np.uint8(flags)
+        else:
+            self.flags[index] &= np.uint8(~flags & 0xFF)
+
+    def _grow(self, capacity):
+        for name in ("position", "previous_position", "velocity", "size", "flags"):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
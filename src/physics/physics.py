@@ -1,39 +1,131 @@
+import itertools
+
+import numpy as np
+
+from src.game.chunk import Chunk
 from src.physics.collision import Collision
-from src.game.player import Player
+from src.physics.entity_store import EntityFlag
+
+
+def _chunk_keys(chunk_cells):
+    """Packs (N, 3) chunk coordinates into one int64 each, for membership tests."""
+    chunk_cells = np.asarray(chunk_cells, dtype=np.int64) + (1 << 20)
+    return (chunk_cells[:, 0] << 42) | (chunk_cells[:, 1] << 21) | chunk_cells[:, 2]
+
 
 class Physics:
     def __init__(self):
         self.collision = Collision()
-        self.gravity = -0.1  # Gravity acceleration
-        self.jump_force = 0.3  # Jump force
+        self.gravity = -32.0  # Gravity acceleration, in blocks per second squared
+        self.jump_force = 9.0  # Upward speed a jump starts with, in blocks per second; about 1.25 blocks high
+        # Version of the world's chunks the sleeping entities were last checked against
+        self._world_version = None
+
+    def update(self, world, player, delta_time):
+        """
+        Applies gravity and jumping to the player and moves it by its velocity, stopping at solid blocks.
+
+        The player is one entity of its entity store, so this is step() restricted to it.
+
+        Args:
+            world (World): The world to collide with.
+            player (Player): The player, whose position is the minimum corner of its bounding box.
+            delta_time (float): Seconds of simulated time to advance.
+        """
+
+        self.step(world, player.store, delta_time, [player.entity])
+
+    def step(self, world, store, delta_time, entities=None):
+        """
+        Advances entities by one tick: gravity, integration and voxel collision, in batches.
+
+        Velocity along an axis an entity collided on is zeroed, and an entity is on the
+        ground exactly when it came to rest on a face pointing up. Entities on the ground
+        that are jumping leave it with the jump force. Entities without COLLIDES move freely.
+
+        In worlds that report their changed chunks, as World does, entities that come to rest
+        on the ground fall asleep and are skipped until they are given a velocity, told to
+        jump, or a chunk around them changes. Code that moves an entity by writing its
+        position directly must clear its SLEEPING flag.
+
+        Args:
+            world (World): The world to collide with; get_blocks() is required, air_boxes() and
+                changed_chunks() are used when present.
+            store (EntityStore): The entities' physics state, updated in place.
+            delta_time (float): Seconds of simulated time to advance; a fixed tick length keeps
+                the results independent of the frame rate.
+            entities (np.ndarray, optional): Indices of the entities to step. Defaults to every
+                live entity.
+        """
 
-    def update(self, world, player):
-        # Update physics for the world and player (gravity, collisions, etc.)
-        player.set_velocity([player.get_velocity()[0], player.get_velocity()[1] + self.gravity, player.get_velocity()[2]])
+        changed_chunks = getattr(world, "changed_chunks", None)
+        if changed_chunks is not None:
+            self._wake_near_changes(store, changed_chunks)
 
-        # Check and handle collisions in X and Z axes
-        new_position = self.check_and_handle_collisions(player, world, player.get_position()[0] + player.get_velocity()[0], player.get_position()[1], player.get_position()[2] + player.get_velocity()[2])
+        if entities is None:
+            entities = store.alive()
+            if len(entities) == store.count:
+                # No gaps, so slices view the rows instead of copying them out and back
+                entities = slice(0, store.count)
+        flags = store.flags[entities]
+        velocity = store.velocity[entities].copy()
+        still = (velocity[:, 0] == 0) & (velocity[:, 1] == 0) & (velocity[:, 2] == 0)
+        asleep = still & (flags & (EntityFlag.SLEEPING | EntityFlag.JUMPING) == EntityFlag.SLEEPING)
+        falling = (flags & EntityFlag.GRAVITY != 0) & ~asleep
+        velocity[:, 1] += np.where(falling, self.gravity * delta_time, 0.0)
+        displacement = velocity * delta_time
 
-        # Check and handle collisions in Y axis (gravity and jumping)
-        new_position = self.check_and_handle_collisions(player, world, new_position[0], new_position[1] + player.get_velocity()[1], new_position[2])
+        # Sleeping entities stay where they are, so only the awake colliding ones are swept
+        positions = store.position[entities]
+        swept = (flags & EntityFlag.COLLIDES != 0) & ~asleep
+        if swept.all():
+            position, normals = self.collision.sweep_boxes(world, positions, store.size[entities], displacement)
+        else:
+            position = positions + displacement
+            normals = np.zeros(velocity.shape, dtype=np.int8)
+            if swept.any():
+                swept = np.flatnonzero(swept)
+                position[swept], normals[swept] = self.collision.sweep_boxes(
+                    world, positions[swept], store.size[entities][swept], displacement[swept]
+                )
+        velocity[normals != 0] = 0.0
 
-        player.set_position(new_position)
+        on_ground = (normals[:, 1] == 1) | asleep
+        flags = np.where(on_ground, flags | EntityFlag.ON_GROUND, flags & ~EntityFlag.ON_GROUND & 0xFF)
+        jumping = flags & EntityFlag.JUMPING != 0
+        velocity[on_ground & jumping, 1] = self.jump_force
 
-    def check_and_handle_collisions(self, player, world, x, y, z):
-        player_position = (x, y, z)
-        collided_block = self.collision.check_collision_with_blocks(player, world)
+        # Entities left standing still on the ground would only bump into it again every tick
+        at_rest = on_ground & ~jumping & (velocity[:, 0] == 0) & (velocity[:, 1] == 0) & (velocity[:, 2] == 0)
+        at_rest &= changed_chunks is not None
+        flags = np.where(at_rest, flags | EntityFlag.SLEEPING, flags & ~EntityFlag.SLEEPING & 0xFF)
 
-        if collided_block is not None:
-            if player.get_velocity()[0] > 0:
-                player_position = (collided_block.position[0] - player.get_size()[0], player_position[1], player_position[2])
-            elif player.get_velocity()[0] < 0:
-                player_position = (collided_block.position[0] + 1, player_position[1], player_position[2])
-            if player.get_velocity()[2] > 0:
-                player_position = (player_position[0], player_position[1], collided_block.position[2] - player.get_size()[2])
-            elif player.get_velocity()[2] < 0:
-                player_position = (player_position[0], player_position[1], collided_block.position[2] + 1)
+        store.position[entities] = position
+        store.velocity[entities] = velocity
+        store.flags[entities] = flags
 
-        if player.on_ground and player.is_jumping():
-            player.set_velocity(player.get_velocity()[0], self.jump_force, player.get_velocity()[2])
+    def _wake_near_changes(self, store, changed_chunks):
+        """Wakes sleeping entities whose bounding box, or the layer of cells below it, lies in a changed chunk."""
+        version, changed = changed_chunks(self._world_version)
+        self._world_version = version
+        if changed is not None and not changed:
+            return
+        sleepers = np.flatnonzero(store.flags[:store.count] & EntityFlag.SLEEPING)
+        if len(sleepers) == 0:
+            return
 
-        return player_position
+        if changed is None:
+            woken = sleepers
+        else:
+            positions = store.position[sleepers]
+            corners = (
+                np.floor((positions - (0, 1, 0)) / Chunk.CHUNK_SIZE).astype(np.int64),
+                np.floor((positions + store.size[sleepers]) / Chunk.CHUNK_SIZE).astype(np.int64),
+            )
+            changed_keys = _chunk_keys(list(changed))
+            near = np.zeros(len(sleepers), dtype=bool)
+            for corner in itertools.product((0, 1), repeat=3):
+                chunk_cells = np.stack([corners[side][:, axis] for axis, side in enumerate(corner)], axis=1)
+                near |= np.isin(_chunk_keys(chunk_cells), changed_keys)
+            woken = sleepers[near]
+        store.set_flags(woken, EntityFlag.SLEEPING, False)
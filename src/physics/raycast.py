@@ -0,0 +1,236 @@
+import numpy as np
+
+from src.game.block_registry import BLOCK_REGISTRY
+
+# Visits looked up per ray at a time when only the first solid cell matters
+VISIT_WINDOW = 8
+
+
+class RayHit:
+    """The first solid cell a ray reached."""
+
+    __slots__ = ("cell", "normal", "distance")
+
+    def __init__(self, cell, normal, distance):
+        """
+        Initializes a RayHit object.
+
+        Args:
+            cell (Tuple[int, int, int]): The solid cell that was hit.
+            normal (Tuple[int, int, int]): Normal of the face the ray entered through, or
+                (0, 0, 0) if the ray started inside the cell.
+            distance (float): Distance along the ray to the face.
+        """
+
+        self.cell = cell
+        self.normal = normal
+        self.distance = distance
+
+    @property
+    def adjacent(self):
+        """The cell in front of the face that was hit, where a placed block goes."""
+        return tuple(value + offset for value, offset in zip(self.cell, self.normal))
+
+    def __repr__(self):
+        return f"RayHit(cell={self.cell}, normal={self.normal}, distance={self.distance:.3f})"
+
+
+class Raycaster:
+    """
+    Voxel traversal of rays through the world's solid blocks (Amanatidis and Woo's DDA).
+
+    A ray visits exactly the cells it passes through, in order, so nothing between its
+    origin and the first solid block is skipped however thin it is. Rays are cast in
+    batches: every cell boundary a ray crosses within its range is found at once, the
+    crossings are put in order per ray, and all of the visited cells are looked up in
+    one world query.
+    """
+
+    def __init__(self, registry=BLOCK_REGISTRY):
+        """
+        Initializes a Raycaster object.
+
+        Args:
+            registry (BlockRegistry, optional): Registry providing the solid lookup table.
+                Defaults to the global block registry.
+        """
+
+        self.registry = registry
+
+    def cast(self, world, origin, direction, max_distance):
+        """
+        Finds the first solid block along a ray.
+
+        Args:
+            world (World): The world to cast through.
+            origin (Tuple[float, float, float]): Where the ray starts.
+            direction (Tuple[float, float, float]): Direction of the ray; need not be normalized.
+            max_distance (float): How far the ray reaches.
+
+        Returns:
+            RayHit: The first solid cell within reach, or None if there is none.
+
+        Raises:
+            ValueError: If direction is the zero vector.
+        """
+
+        hits, cells, normals, distances = self.cast_many(
+            world, np.reshape(origin, (1, 3)), np.reshape(direction, (1, 3)), max_distance
+        )
+        if not hits[0]:
+            return None
+        return RayHit(
+            tuple(int(value) for value in cells[0]), tuple(int(value) for value in normals[0]), float(distances[0])
+        )
+
+    def cast_many(self, world, origins, directions, max_distance):
+        """
+        Finds the first solid block along many rays at once.
+
+        Args:
+            world (World): The world to cast through; only its get_blocks() is used.
+            origins (np.ndarray): An (N, 3) array of ray origins.
+            directions (np.ndarray): An (N, 3) array of ray directions; need not be normalized.
+            max_distance (Union[float, np.ndarray]): How far the rays reach, shared or per ray.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Whether each ray hit, as an
+            (N,) bool array; the (N, 3) ``int64`` cells hit; the (N, 3) ``int8`` normals of the
+            faces entered, zero for rays starting inside a solid cell; and the (N,) distances to
+            those faces. Rows of rays that missed hold zeros and an infinite distance.
+
+        Raises:
+            ValueError: If any direction is the zero vector.
+        """
+
+        cells_at, axes, steps, distances, solid = self._traverse(world, origins, directions, max_distance, True)
+        hits = solid.any(axis=1)
+        first = np.argmax(solid, axis=1)
+        rays = np.arange(len(solid))
+
+        normals = np.zeros((len(solid), 3), dtype=np.int8)
+        hit_rays, hit_visits = rays[hits], first[hits]
+        # Rays that entered their cell did so across a face, against the step direction on that axis
+        entered = hit_visits > 0
+        entering_rays, entering_visits = hit_rays[entered], hit_visits[entered]
+        crossed = axes[entering_rays, entering_visits]
+        normals[entering_rays, crossed] = -steps[entering_rays, crossed]
+
+        hit_cells = np.zeros(normals.shape, dtype=np.int64)
+        hit_cells[hits] = cells_at(hit_rays, hit_visits)
+        hit_distances = np.full(len(hits), np.inf)
+        hit_distances[hits] = distances[hit_rays, hit_visits]
+        return hits, hit_cells, normals, hit_distances
+
+    def line_of_sight(self, world, origins, targets):
+        """
+        Tells whether the segments between pairs of points are free of solid blocks.
+
+        Args:
+            world (World): The world to cast through.
+            origins (np.ndarray): An (N, 3) array of start points, e.g. mobs' eyes.
+            targets (np.ndarray): An (N, 3) array of end points.
+
+        Returns:
+            np.ndarray: An (N,) bool array, True where nothing solid lies in between.
+        """
+
+        origins, offsets, lengths = self._segments(origins, targets)
+        visible = lengths == 0
+        apart = ~visible
+        if apart.any():
+            hits, _, _, _ = self.cast_many(world, origins[apart], offsets[apart], lengths[apart])
+            visible[apart] = ~hits
+        return visible
+
+    def occluding_blocks(self, world, origins, targets):
+        """
+        Counts the solid blocks between pairs of points, e.g. to muffle sounds heard through walls.
+
+        Args:
+            world (World): The world to cast through.
+            origins (np.ndarray): An (N, 3) array of start points, e.g. sound sources.
+            targets (np.ndarray): An (N, 3) array of end points, e.g. listeners.
+
+        Returns:
+            np.ndarray: An (N,) ``int64`` array of solid cells each segment passes through.
+        """
+
+        origins, offsets, lengths = self._segments(origins, targets)
+        counts = np.zeros(len(origins), dtype=np.int64)
+        apart = lengths > 0
+        if apart.any():
+            solid = self._traverse(world, origins[apart], offsets[apart], lengths[apart])[-1]
+            counts[apart] = solid.sum(axis=1)
+        return counts
+
+    @staticmethod
+    def _segments(origins, targets):
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        offsets = np.asarray(targets, dtype=np.float64).reshape(-1, 3) - origins
+        return origins, offsets, np.linalg.norm(offsets, axis=1)
+
+    def _traverse(self, world, origins, directions, max_distance, first_only=False):
+        """
+        Walks rays through the cells they visit within range, in order.
+
+        Args:
+            first_only (bool, optional): Whether a ray's cells past its first solid one may be
+                left unexamined. Defaults to False.
+
+        Returns:
+            Tuple: A function giving the cells of given (ray, visit) index pairs; the (N, M) axis
+            of the boundary crossed on each visit, -1 for the starting cell; the (N, 3) step
+            direction on each axis; the (N, M) distances at which the visits begin; and an (N, M)
+            mask of the visits found to be in range and solid.
+        """
+
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        lengths = np.linalg.norm(directions, axis=1)
+        if (lengths == 0).any():
+            raise ValueError("Ray directions must not be zero")
+        directions = directions / lengths[:, None]
+        max_distance = np.broadcast_to(np.asarray(max_distance, dtype=np.float64), (len(origins),))
+
+        starts = np.floor(origins).astype(np.int64)
+        steps = np.sign(directions).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Distance to the first boundary on each axis, and between boundaries after that;
+            # an axis the ray runs parallel to is never crossed
+            first_crossing = np.where(steps != 0, (starts + (steps > 0) - origins) / directions, np.inf)
+            spacing = np.where(steps != 0, 1.0 / np.abs(directions), 0.0)
+
+        # A ray crosses at most ceil(range) + 1 boundaries per axis, since every component is at most 1.
+        # Visit 0 is the starting cell, at distance 0 and axis -1; visit k is entered across the k-th boundary
+        crossings = int(np.ceil(max_distance.max(initial=0.0))) + 1
+        times = first_crossing[:, :, None] + spacing[:, :, None] * np.arange(crossings)
+        times = np.concatenate((np.zeros((len(origins), 1)), times.reshape(len(origins), -1)), axis=1)
+        order = np.argsort(times, axis=1, kind="stable")
+        distances = np.take_along_axis(times, order, axis=1)
+        axes = (order - 1) // crossings
+        moves = np.stack([np.cumsum(axes == axis, axis=1, dtype=np.int32) for axis in range(3)], axis=-1)
+
+        def cells_at(rays, visits):
+            return starts[rays] + moves[rays, visits] * steps[rays]
+
+        # Cells are looked up a window of visits at a time, so rays that already hit stop early
+        in_range = distances <= max_distance[:, None]
+        solid = np.zeros(in_range.shape, dtype=bool)
+        window = VISIT_WINDOW if first_only else in_range.shape[1]
+        pending = np.arange(len(origins))
+        for first in range(0, in_range.shape[1], window):
+            rows, columns = np.nonzero(in_range[pending, first:first + window])
+            rays, visits = pending[rows], columns + first
+            hit = np.asarray(self.registry.solid)[world.get_blocks(cells_at(rays, visits))]
+            solid[rays[hit], visits[hit]] = True
+
+            following = first + window
+            if following >= in_range.shape[1]:
+                break
+            done = np.zeros(len(pending), dtype=bool)
+            done[rows[hit]] = first_only
+            pending = pending[~done & in_range[pending, following]]
+            if len(pending) == 0:
+                break
+        return cells_at, axes, steps, distances, solid
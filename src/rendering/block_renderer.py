@@ -1,18 +1,56 @@
+import glm
 import numpy as np
 import pygame
 from OpenGL.GL import *
 from OpenGL.arrays import vbo
 from OpenGL.GL.shaders import *
-from src.rendering.shader import Shader
-from src.game.block import Block
+from src.rendering.gl_state import CAMERA_BINDING, CAMERA_BLOCK_SIZE, GL_STATE, UniformBuffer
+from src.rendering.render_stats import RENDER_STATS
+from src.rendering.shader_manager import SHADER_MANAGER
+from src.rendering.texture_array import TextureArray
+from src.game.block_registry import BlockType
+
+# Per-instance layout: block offset (3), texture layer (1)
+INSTANCE_COMPONENTS = 4
+INSTANCE_STRIDE = INSTANCE_COMPONENTS * 4
+
+
+def instance_data(positions, block_ids, layers=None):
+    """
+    Packs blocks into the per-instance attribute layout of the instanced cube.
+
+    Args:
+        positions (np.ndarray): An (N, 3) array with the minimum corner of each block, the
+            same convention as chunk mesh vertices.
+        block_ids (np.ndarray): The N registry block IDs.
+        layers (np.ndarray, optional): Texture layer for each block ID. Defaults to the block ID.
+
+    Returns:
+        np.ndarray: An (N, 4) ``float32`` array of offsets and texture layers.
+    """
+
+    block_ids = np.asarray(block_ids).reshape(-1)
+    data = np.empty((len(block_ids), INSTANCE_COMPONENTS), dtype=np.float32)
+    # The cube spans -0.5..0.5, so its center is offset to the middle of the block cell
+    data[:, 0:3] = np.asarray(positions, dtype=np.float32).reshape(-1, 3) + 0.5
+    data[:, 3] = block_ids if layers is None else np.asarray(layers)[block_ids]
+    return data
 
 
 class BlockRenderer:
-    def __init__(self):
-        self.shader = Shader("C:\\Users\\gavri\\PycharmProjects\\minecraft\\assets\\shaders\\vertex.glsl",
-                             "C:\\Users\\gavri\\PycharmProjects\\minecraft\\assets\\shaders\\fragment.glsl")
+    def __init__(self, shader_manager=SHADER_MANAGER, state=GL_STATE, stats=RENDER_STATS):
+        self.state = state
+        self.stats = stats
+        self.shader = shader_manager.get("vertex.glsl", "fragment.glsl")
+        # View and projection live in a uniform buffer shared by every program with a Camera block
+        self.camera_buffer = UniformBuffer(state, CAMERA_BLOCK_SIZE, CAMERA_BINDING, stats)
+        state.bind_uniform_block(self.shader.program, "Camera", CAMERA_BINDING)
         self.vao = glGenVertexArrays(1)
         self.vbo = glGenBuffers(1)
+        self.instance_vbo = glGenBuffers(1)
+        self.instance_capacity = 0
+        self.textures = TextureArray()
+        self.textures.upload(state)
 
         vertices = [
             # Positions            # Texture Coords
@@ -68,19 +106,19 @@ class BlockRenderer:
         self.unbind()
 
     def bind(self):
-        glBindVertexArray(self.vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        self.state.bind_vertex_array(self.vao)
+        self.state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
 
     def unbind(self):
-        glBindVertexArray(0)
-        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.state.bind_vertex_array(0)
+        self.state.bind_buffer(GL_ARRAY_BUFFER, 0)
 
     def vbo_data(self, data, usage):
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        self.state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
         glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, usage)
 
     def setup_vertex_attributes(self):
-        self.shader.use()
+        self.state.use_program(self.shader.program)
 
         stride = 5 * 4  # 5 float components per vertex (position + texture coords)
 
@@ -92,23 +130,60 @@ class BlockRenderer:
         glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(12))
         glEnableVertexAttribArray(1)
 
-    def render_block(self, block: Block, model_matrix: np.array):
-        ...
+        # The cube has no per-vertex light, so the shader reads this constant (full brightness)
+        glVertexAttrib1f(3, 1.0)
+
+        # Per-instance block offset and texture layer, advancing once per cube instead of per vertex
+        self.state.bind_buffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        glVertexAttribPointer(4, 3, GL_FLOAT, GL_FALSE, INSTANCE_STRIDE, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(4)
+        glVertexAttribDivisor(4, 1)
+        glVertexAttribPointer(2, 1, GL_FLOAT, GL_FALSE, INSTANCE_STRIDE, ctypes.c_void_p(12))
+        glEnableVertexAttribArray(2)
+        glVertexAttribDivisor(2, 1)
+        self.state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+
+    def render_instances(self, instances, model_matrix=None):
         """
-        self.shader.use()
-
-        # Ensure the model matrix is a 4x4 matrix
-        if model_matrix.shape != (4, 4):
-            raise ValueError("Invalid model matrix shape. Expected a 4x4 matrix.")
-        self.shader.set_uniform("model", model_matrix)
-        self.shader.set_uniform("texture_sampler", 0)
-
-        # Bind the appropriate texture for this block
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(GL_TEXTURE_2D, block.texture.id)
-
-        # Draw the block
-        glBindVertexArray(self.vao)
-        glDrawArrays(GL_TRIANGLES, 0, 36)
-        glBindVertexArray(0)
-        """
\ No newline at end of file
+        Draws a batch of cubes with one instanced draw call.
+
+        This is the path for dynamic or entity blocks that change too often to be worth
+        meshing; static terrain goes through chunk meshes instead.
+
+        Args:
+            instances (np.ndarray): An (N, 4) ``float32`` array from instance_data(), with
+                ``self.textures.layers`` as its layer lookup.
+            model_matrix (glm.mat4, optional): Transform applied to the whole batch.
+                Defaults to the identity.
+        """
+
+        count = len(instances)
+        if count == 0:
+            return
+
+        instances = np.ascontiguousarray(instances, dtype=np.float32)
+        self.state.bind_buffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        if count > self.instance_capacity:
+            # Grow geometrically so batches of slowly increasing size do not reallocate every frame
+            self.instance_capacity = max(count, self.instance_capacity * 2)
+            glBufferData(GL_ARRAY_BUFFER, self.instance_capacity * INSTANCE_STRIDE, None, GL_STREAM_DRAW)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, instances.nbytes, instances)
+        self.stats.record_upload(instances.nbytes)
+
+        self.state.set_uniform(self.shader.program, "model", glm.mat4(1.0) if model_matrix is None else model_matrix)
+        self.textures.bind(self.state)
+        self.state.bind_vertex_array(self.vao)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, 36, count)
+        self.stats.record_draw(36, count)
+
+    def render_block(self, block: BlockType, model_matrix: glm.mat4):
+        """
+        Draws a single block as a one-instance batch.
+
+        Args:
+            block (BlockType): The block to draw.
+            model_matrix (glm.mat4): Transform placing the cube, centered on the origin, in the world.
+        """
+
+        instances = np.array([[0.0, 0.0, 0.0, self.textures.layers[block.id]]], dtype=np.float32)
+        self.render_instances(instances, model_matrix)
\ No newline at end of file
@@ -1,9 +1,110 @@
+import math
+
+import glm
+import numpy as np
 from OpenGL.raw.GLES1.VERSION.GLES1_1_0 import glTranslatef
 
 
 class Camera:
-    def __init__(self):
-        self.position = (0, 0, 0)
+    def __init__(self, position=(0, 0, 0), yaw=-90.0, pitch=0.0, fov=70.0, aspect=4 / 3, near=0.1, far=1000.0):
+        """
+        Initializes a Camera object.
+
+        Args:
+            position (Tuple[float, float, float], optional): Eye position. Defaults to the origin.
+            yaw (float, optional): Heading in degrees; -90 looks down -Z. Defaults to -90.
+            pitch (float, optional): Elevation in degrees, clamped to +-89. Defaults to 0.
+            fov (float, optional): Vertical field of view in degrees. Defaults to 70.
+            aspect (float, optional): Viewport width divided by height. Defaults to 4 / 3.
+            near (float, optional): Near clipping distance. Defaults to 0.1.
+            far (float, optional): Far clipping distance. Defaults to 1000.
+        """
+
+        self.position = position
+        self.yaw = yaw
+        self.pitch = pitch
+        self.fov = fov
+        self.aspect = aspect
+        self.near = near
+        self.far = far
 
     def set_view(self):
         glTranslatef(-self.position[0], -self.position[1], -self.position[2])
+
+    def front(self):
+        """Returns the unit vector the camera looks along."""
+        pitch = math.radians(max(-89.0, min(89.0, self.pitch)))
+        yaw = math.radians(self.yaw)
+        return glm.normalize(glm.vec3(math.cos(pitch) * math.cos(yaw), math.sin(pitch), math.cos(pitch) * math.sin(yaw)))
+
+    def view_matrix(self):
+        """Returns the world-to-camera transform."""
+        eye = glm.vec3(*self.position)
+        return glm.lookAt(eye, eye + self.front(), glm.vec3(0, 1, 0))
+
+    def projection_matrix(self):
+        """Returns the perspective projection."""
+        return glm.perspective(math.radians(self.fov), self.aspect, self.near, self.far)
+
+    def apply(self, camera_buffer):
+        """
+        Writes the view and projection matrices into the shared camera uniform buffer.
+
+        Args:
+            camera_buffer (UniformBuffer): Buffer backing the shaders' ``Camera`` block.
+        """
+
+        camera_buffer.write(0, self.view_matrix())
+        camera_buffer.write(64, self.projection_matrix())
+
+    def frustum_planes(self):
+        """
+        Extracts the six frustum planes from the combined view-projection matrix.
+
+        Returns:
+            np.ndarray: A (6, 4) array of planes (a, b, c, d) with unit normals pointing into
+            the frustum, so a point p is inside a plane when a*p.x + b*p.y + c*p.z + d >= 0.
+            The order is left, right, bottom, top, near, far.
+        """
+
+        rows = np.array(self.projection_matrix() * self.view_matrix(), dtype=np.float64)
+        planes = np.array([
+            rows[3] + rows[0],
+            rows[3] - rows[0],
+            rows[3] + rows[1],
+            rows[3] - rows[1],
+            rows[3] + rows[2],
+            rows[3] - rows[2],
+        ])
+        return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+    def boxes_visible(self, minimums, maximums, max_distance=None):
+        """
+        Tests axis-aligned boxes against the view frustum and an optional distance limit.
+
+        A box counts as visible unless it lies entirely outside one frustum plane, so a few
+        boxes near the frustum's corners are kept conservatively.
+
+        Args:
+            minimums (np.ndarray): An (N, 3) array of box minimum corners.
+            maximums (np.ndarray): An (N, 3) array of box maximum corners.
+            max_distance (float, optional): Boxes whose nearest point is farther than this from
+                the camera are culled. Defaults to None, which disables the distance test.
+
+        Returns:
+            np.ndarray: An (N,) boolean array, True for boxes that may be visible.
+        """
+
+        minimums = np.asarray(minimums, dtype=np.float64).reshape(-1, 3)
+        maximums = np.asarray(maximums, dtype=np.float64).reshape(-1, 3)
+        planes = self.frustum_planes()
+
+        # For each plane, the box corner farthest along its normal decides whether the box is outside
+        corners = np.where(planes[None, :, :3] >= 0, maximums[:, None, :], minimums[:, None, :])
+        visible = (np.einsum("npk,pk->np", corners, planes[:, :3]) + planes[:, 3] >= 0).all(axis=1)
+
+        if max_distance is not None:
+            eye = np.asarray(self.position, dtype=np.float64)
+            nearest = np.clip(eye, minimums, maximums)
+            visible &= ((nearest - eye) ** 2).sum(axis=1) <= max_distance * max_distance
+        return visible
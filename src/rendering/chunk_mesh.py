@@ -0,0 +1,76 @@
+import ctypes
+
+import glm
+from OpenGL.GL import *
+
+from src.rendering.chunk_mesher import VERTEX_STRIDE
+from src.rendering.gl_state import GL_STATE
+from src.rendering.render_stats import RENDER_STATS
+
+
+class ChunkMesh:
+    """GPU copy of one chunk's vertex array: a single VBO drawn with one call."""
+
+    def __init__(self, origin, state=GL_STATE, stats=RENDER_STATS):
+        """
+        Initializes a ChunkMesh object.
+
+        Args:
+            origin (Tuple[int, int, int]): World position the chunk-local vertices are relative to.
+            state (GLState, optional): State cache the mesh binds through. Defaults to the shared one.
+            stats (RenderStats, optional): Counters the mesh's uploads and draws are recorded in.
+                Defaults to the shared ones.
+        """
+
+        self.origin = origin
+        self.state = state
+        self.stats = stats
+        self.model_matrix = glm.translate(glm.mat4(1.0), glm.vec3(*origin))
+        self.vertex_count = 0
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+
+        state.bind_vertex_array(self.vao)
+        state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+
+        # Position, texture coords, texture layer and light, matching chunk_mesher.VERTEX_COMPONENTS
+        for location, (size, offset) in enumerate(((3, 0), (2, 12), (1, 20), (1, 24))):
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, VERTEX_STRIDE, ctypes.c_void_p(offset))
+            glEnableVertexAttribArray(location)
+
+    def upload(self, vertices):
+        """
+        Replaces the mesh's vertices.
+
+        Args:
+            vertices (np.ndarray): An (N, 7) ``float32`` vertex array from the chunk mesher.
+        """
+
+        self.state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices if len(vertices) else None, GL_STATIC_DRAW)
+        self.vertex_count = len(vertices)
+        self.stats.record_upload(vertices.nbytes)
+
+    def draw(self, shader):
+        """
+        Draws the mesh with the given shader. Bindings are left in place for the next mesh.
+
+        Args:
+            shader (Shader): Shader with a ``model`` uniform.
+        """
+
+        if self.vertex_count == 0:
+            return
+        self.state.set_uniform(shader.program, "model", self.model_matrix)
+        self.state.bind_vertex_array(self.vao)
+        glDrawArrays(GL_TRIANGLES, 0, self.vertex_count)
+        self.stats.record_draw(self.vertex_count)
+
+    def delete(self):
+        """Frees the mesh's GPU buffers."""
+        glDeleteBuffers(1, [self.vbo])
+        glDeleteVertexArrays(1, [self.vao])
+        # Deleted names may be reused by the driver, so they must not look bound
+        self.state.forget_vertex_array(self.vao)
+        self.state.forget_buffer(GL_ARRAY_BUFFER, self.vbo)
+        self.vertex_count = 0
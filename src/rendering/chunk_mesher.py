@@ -0,0 +1,248 @@
+import numpy as np
+
+from src.game.block_registry import BLOCK_REGISTRY
+
+# Interleaved vertex layout: position (3), texture coords (2), texture layer (1), light (1)
+VERTEX_COMPONENTS = 7
+VERTEX_STRIDE = VERTEX_COMPONENTS * 4
+
+# Face directions as (axis, sign), in the order +x, -x, +y, -y, +z, -z
+FACE_DIRECTIONS = ((0, 1), (0, -1), (1, 1), (1, -1), (2, 1), (2, -1))
+
+# Simple directional shading so faces stay distinguishable under uniform light
+FACE_SHADES = (0.8, 0.8, 1.0, 0.5, 0.9, 0.9)
+
+# Brightness of each light level 0-15; every level is 80% as bright as the next
+LIGHT_LEVELS = 16
+LIGHT_CURVE = (0.8 ** np.arange(LIGHT_LEVELS - 1, -1, -1)).astype(np.float32)
+
+# Axes the texture's u and v run along for faces on each axis; v always points up on side faces
+TEXTURE_AXES = ((2, 1), (0, 2), (0, 1))
+
+# Two counter-clockwise triangles per quad, as indices into its four corners
+QUAD_TRIANGLES = np.array([0, 1, 2, 0, 2, 3])
+
+# Meshing modes: one quad per visible block face, or coplanar faces merged into larger quads
+MESH_NAIVE = "naive"
+MESH_GREEDY = "greedy"
+
+
+def empty_mesh():
+    """Returns a vertex array with no vertices."""
+    return np.zeros((0, VERTEX_COMPONENTS), dtype=np.float32)
+
+
+def build_chunk_mesh(padded_ids, registry=BLOCK_REGISTRY, layers=None, mode=MESH_NAIVE, scale=1, light=None):
+    """
+    Builds the face-culled mesh of one chunk as a single interleaved vertex array.
+
+    Only faces of visible blocks whose neighbour in that direction is not opaque are
+    emitted. The input carries a one-voxel border from the neighbouring chunks, so faces
+    against adjacent chunks are culled the same way as faces inside the chunk. Runs on
+    NumPy alone and needs no GL context.
+
+    Args:
+        padded_ids (np.ndarray): An (18, 18, 18) array of block IDs: the chunk at
+            [1:17, 1:17, 1:17] surrounded by one layer of its neighbours' voxels. A
+            downsampled chunk of n voxels per side is passed as (n + 2, n + 2, n + 2).
+        registry (BlockRegistry, optional): Registry providing the visibility and opacity
+            lookup tables. Defaults to the global block registry.
+        layers (np.ndarray, optional): Texture layer for each block ID. Defaults to the block ID.
+        mode (str, optional): MESH_NAIVE for one quad per face, or MESH_GREEDY to merge
+            adjacent coplanar faces of the same block type. Defaults to MESH_NAIVE.
+        scale (int, optional): Size of one voxel in blocks, for downsampled chunks. Defaults to 1.
+        light (np.ndarray, optional): Light levels (0-15) shaped like ``padded_ids``. Each
+            face is lit by the cell it faces. Defaults to None, which lights every face fully.
+
+    Returns:
+        np.ndarray: An (N, 7) ``float32`` vertex array in chunk-local coordinates, six
+        vertices (two triangles) per quad.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+
+    if mode == MESH_GREEDY:
+        return build_greedy_chunk_mesh(padded_ids, registry, layers, scale, light)
+    if mode != MESH_NAIVE:
+        raise ValueError(f"Unknown meshing mode {mode!r}")
+
+    visible, opaque = _face_masks(padded_ids, registry)
+    inner = padded_ids[1:-1, 1:-1, 1:-1]
+
+    parts = []
+    for direction, (axis, sign) in enumerate(FACE_DIRECTIONS):
+        faces = visible & ~_shift(opaque, axis, sign)
+        cells = np.argwhere(faces)
+        if len(cells) == 0:
+            continue
+        block_ids = inner[faces]
+        sizes = np.ones((len(cells), 2), dtype=np.int64)
+        levels = _shift(light, axis, sign)[faces] if light is not None else None
+        parts.append(emit_quads(direction, cells, sizes, _layers(block_ids, layers), scale, levels))
+
+    if not parts:
+        return empty_mesh()
+    return np.concatenate(parts)
+
+
+def build_greedy_chunk_mesh(padded_ids, registry=BLOCK_REGISTRY, layers=None, scale=1, light=None):
+    """
+    Builds a chunk mesh that merges adjacent coplanar faces of the same block type and light level.
+
+    Visible faces are first merged into runs along one in-plane axis, and runs with the
+    same start, length and block type on consecutive rows are then merged along the other
+    axis. Both passes are vectorized. Texture coordinates span the merged quad in blocks,
+    so the texture must be sampled with repeat wrapping to keep its per-block scale.
+
+    Args:
+        padded_ids (np.ndarray): An (18, 18, 18) array of block IDs; see build_chunk_mesh.
+        registry (BlockRegistry, optional): Registry providing the visibility and opacity
+            lookup tables. Defaults to the global block registry.
+        layers (np.ndarray, optional): Texture layer for each block ID. Defaults to the block ID.
+        scale (int, optional): Size of one voxel in blocks, for downsampled chunks. Defaults to 1.
+        light (np.ndarray, optional): Light levels shaped like ``padded_ids``; see build_chunk_mesh.
+
+    Returns:
+        np.ndarray: An (N, 7) ``float32`` vertex array in chunk-local coordinates.
+    """
+
+    visible, opaque = _face_masks(padded_ids, registry)
+    inner = padded_ids[1:-1, 1:-1, 1:-1]
+
+    parts = []
+    for direction, (axis, sign) in enumerate(FACE_DIRECTIONS):
+        faces = visible & ~_shift(opaque, axis, sign)
+        if not faces.any():
+            continue
+
+        # Face keys combine block type and light level, with the face axis first, then the two
+        # in-plane axes in increasing order; 0 is "no face"
+        u_axis, v_axis = sorted({0, 1, 2} - {axis})
+        levels = _shift(light, axis, sign) if light is not None else LIGHT_LEVELS - 1
+        keys = np.where(faces, (inner.astype(np.int64) + 1) * LIGHT_LEVELS + levels, 0)
+        keys = keys.transpose(axis, u_axis, v_axis)
+
+        cells, sizes, merged_keys = _merge_faces(keys)
+        block_ids = merged_keys // LIGHT_LEVELS - 1
+        corners = np.empty_like(cells)
+        corners[:, axis] = cells[:, 0]
+        corners[:, u_axis] = cells[:, 1]
+        corners[:, v_axis] = cells[:, 2]
+        parts.append(
+            emit_quads(direction, corners, sizes, _layers(block_ids, layers), scale, merged_keys % LIGHT_LEVELS)
+        )
+
+    if not parts:
+        return empty_mesh()
+    return np.concatenate(parts)
+
+
+def _merge_faces(keys):
+    """
+    Merges equal, non-zero face keys of a (slice, u, v) volume into rectangles.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The (slice, u, v) minimum cell of each
+        rectangle, its (u, v) size and the key it covers.
+    """
+
+    # Runs along v: a run starts where the key changes from the previous cell and ends before the next change
+    padded = np.pad(keys, ((0, 0), (0, 0), (1, 1)))
+    changes = padded[:, :, 1:] != padded[:, :, :-1]
+    starts = np.argwhere(changes[:, :, :-1] & (keys != 0))
+    ends = np.argwhere(changes[:, :, 1:] & (keys != 0))
+    run_slices, run_u, run_v = starts.T
+    run_length = ends[:, 2] - run_v + 1
+    run_key = keys[run_slices, run_u, run_v]
+
+    # Runs on consecutive rows with the same slice, start, length and key merge along u
+    order = np.lexsort((run_u, run_key, run_length, run_v, run_slices))
+    run_slices, run_u, run_v, run_length, run_key = (
+        values[order] for values in (run_slices, run_u, run_v, run_length, run_key)
+    )
+    continues = np.zeros(len(order), dtype=bool)
+    continues[1:] = (
+        (run_slices[1:] == run_slices[:-1])
+        & (run_v[1:] == run_v[:-1])
+        & (run_length[1:] == run_length[:-1])
+        & (run_key[1:] == run_key[:-1])
+        & (run_u[1:] == run_u[:-1] + 1)
+    )
+    first = np.flatnonzero(~continues)
+    height = np.diff(np.append(first, len(order)))
+
+    cells = np.stack((run_slices[first], run_u[first], run_v[first]), axis=1)
+    sizes = np.stack((height, run_length[first]), axis=1)
+    return cells, sizes, run_key[first]
+
+
+def emit_quads(direction, cells, sizes, layers, scale=1, light=None):
+    """
+    Turns axis-aligned quads into interleaved triangle vertices.
+
+    Args:
+        direction (int): Index into FACE_DIRECTIONS of the side the quads face.
+        cells (np.ndarray): An (M, 3) array with the minimum voxel of each quad.
+        sizes (np.ndarray): An (M, 2) array with each quad's extent, in voxels, along the
+            two axes perpendicular to the face (in increasing axis order).
+        layers (np.ndarray): The M texture layers.
+        scale (int, optional): Size of one voxel in blocks. Defaults to 1.
+        light (np.ndarray, optional): The M light levels (0-15). Defaults to full light.
+
+    Returns:
+        np.ndarray: An (M * 6, 7) ``float32`` vertex array. Texture coordinates run from
+        0 to the quad's size in blocks so a repeating texture tiles once per block.
+    """
+
+    axis, sign = FACE_DIRECTIONS[direction]
+    u_axis, v_axis = sorted({0, 1, 2} - {axis})
+    count = len(cells)
+
+    # Corner offsets of the quad in the (u, v) plane, counter-clockwise seen from outside
+    corner_u = np.array([0, 1, 1, 0])
+    corner_v = np.array([0, 0, 1, 1])
+    if (sign > 0) != ((u_axis, v_axis, axis) in ((0, 1, 2), (1, 2, 0), (2, 0, 1))):
+        corner_u, corner_v = corner_v, corner_u
+
+    corners = np.zeros((count, 4, 3), dtype=np.float32)
+    corners += cells[:, None, :]
+    corners[:, :, axis] += 1 if sign > 0 else 0
+    corners[:, :, u_axis] += corner_u[None, :] * sizes[:, 0:1]
+    corners[:, :, v_axis] += corner_v[None, :] * sizes[:, 1:2]
+    corners *= scale
+
+    texture_u, texture_v = TEXTURE_AXES[axis]
+    origin = cells.astype(np.float32) * scale
+
+    vertices = np.empty((count, 4, VERTEX_COMPONENTS), dtype=np.float32)
+    vertices[:, :, 0:3] = corners
+    vertices[:, :, 3] = corners[:, :, texture_u] - origin[:, None, texture_u]
+    vertices[:, :, 4] = corners[:, :, texture_v] - origin[:, None, texture_v]
+    vertices[:, :, 5] = np.asarray(layers, dtype=np.float32)[:, None]
+    if light is None:
+        vertices[:, :, 6] = FACE_SHADES[direction]
+    else:
+        vertices[:, :, 6] = FACE_SHADES[direction] * LIGHT_CURVE[np.asarray(light)][:, None]
+
+    return vertices[:, QUAD_TRIANGLES].reshape(-1, VERTEX_COMPONENTS)
+
+
+def _face_masks(padded_ids, registry):
+    """Returns the visible mask of the chunk's voxels and the opaque mask of the padded volume."""
+    visible = np.asarray(registry.visible)[padded_ids[1:-1, 1:-1, 1:-1]]
+    opaque = np.asarray(registry.opacity)[padded_ids] > 0
+    return visible, opaque
+
+
+def _shift(padded, axis, sign):
+    """Returns, for every inner voxel, the value of its neighbour in the given direction."""
+    index = [slice(1, -1)] * 3
+    index[axis] = slice(2, None) if sign > 0 else slice(0, -2)
+    return padded[tuple(index)]
+
+
+def _layers(block_ids, layers):
+    if layers is None:
+        return block_ids
+    return np.asarray(layers)[block_ids]
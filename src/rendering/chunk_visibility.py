@@ -0,0 +1,110 @@
+from collections import deque
+
+import numpy as np
+
+from src.game.block_registry import BLOCK_REGISTRY
+from src.rendering.chunk_mesher import FACE_DIRECTIONS
+
+# Every face connects to every other: the graph of an empty or not yet meshed chunk
+FULLY_CONNECTED = np.ones((6, 6), dtype=bool)
+
+
+def face_connectivity(block_ids, registry=BLOCK_REGISTRY):
+    """
+    Computes which faces of a chunk can see each other through its non-opaque voxels.
+
+    Connected regions of non-opaque voxels are labeled with a vectorized flood fill:
+    every voxel repeatedly takes the smallest label among itself and its open
+    neighbours, and labels then jump to their own label's label until nothing changes.
+
+    Args:
+        block_ids (np.ndarray): A (16, 16, 16) array of the chunk's block IDs.
+        registry (BlockRegistry, optional): Registry providing the opacity lookup table.
+            Defaults to the global block registry.
+
+    Returns:
+        np.ndarray: A (6, 6) boolean matrix in FACE_DIRECTIONS order; entry [i, j] is True
+        if a path of non-opaque voxels leads from face i to face j.
+    """
+
+    open_cells = np.asarray(registry.opacity)[block_ids] == 0
+    if open_cells.all():
+        return FULLY_CONNECTED.copy()
+    if not open_cells.any():
+        return np.zeros((6, 6), dtype=bool)
+
+    size = open_cells.shape[0]
+    volume = open_cells.size
+    # Closed voxels carry a label larger than any real one so they never spread
+    labels = np.where(open_cells, np.arange(volume).reshape(open_cells.shape), volume)
+    padded = np.full((size + 2,) * 3, volume, dtype=labels.dtype)
+    while True:
+        padded[1:-1, 1:-1, 1:-1] = labels
+        smallest = labels
+        for axis, sign in FACE_DIRECTIONS:
+            index = [slice(1, -1)] * 3
+            index[axis] = slice(2, None) if sign > 0 else slice(0, -2)
+            smallest = np.minimum(smallest, padded[tuple(index)])
+        smallest = np.where(open_cells, smallest, volume)
+
+        # Pointer jumping: a label names a voxel in the same region, so its label is valid too
+        flat = np.append(smallest.reshape(-1), volume)
+        jumped = flat[flat]
+        while not np.array_equal(jumped, flat):
+            flat, jumped = jumped, jumped[jumped]
+        smallest = flat[:-1].reshape(open_cells.shape)
+
+        if np.array_equal(smallest, labels):
+            break
+        labels = smallest
+
+    # Which regions touch which face, then faces sharing a region are connected
+    touches = np.zeros((6, volume + 1), dtype=bool)
+    for face, (axis, sign) in enumerate(FACE_DIRECTIONS):
+        index = [slice(None)] * 3
+        index[axis] = -1 if sign > 0 else 0
+        touches[face, labels[tuple(index)].reshape(-1)] = True
+    touches[:, volume] = False
+    return (touches.astype(np.int32) @ touches.T.astype(np.int32)) > 0
+
+
+def potentially_visible(start, connectivity, within):
+    """
+    Finds the chunks that may be visible from a chunk with a breadth-first search over
+    the face-connectivity graph.
+
+    A search step leaves a chunk through a face only if that face connects to the face it
+    entered through, and never reverses a direction already taken on the way, so sight
+    lines only travel outward from the start.
+
+    Args:
+        start (Tuple[int, int, int]): Chunk coordinates holding the camera.
+        connectivity (Callable[[Tuple[int, int, int]], np.ndarray]): Returns a chunk's (6, 6)
+            face connectivity; unknown chunks should report FULLY_CONNECTED.
+        within (Callable[[Tuple[int, int, int]], bool]): Returns whether the search may
+            enter the given chunk coordinates.
+
+    Returns:
+        Set[Tuple[int, int, int]]: The potentially visible chunk coordinates, including start.
+    """
+
+    visible = {start}
+    # Queue entries: chunk, face it was entered through (None for the start), directions taken
+    queue = deque([(start, None, 0)])
+    while queue:
+        coords, entered, taken = queue.popleft()
+        graph = connectivity(coords)
+        for face, (axis, sign) in enumerate(FACE_DIRECTIONS):
+            # Faces come in (+, -) pairs, so face ^ 1 is the opposite direction
+            if taken & (1 << (face ^ 1)):
+                continue
+            if entered is not None and not graph[entered, face]:
+                continue
+            neighbour = list(coords)
+            neighbour[axis] += sign
+            neighbour = tuple(neighbour)
+            if neighbour in visible or not within(neighbour):
+                continue
+            visible.add(neighbour)
+            queue.append((neighbour, face ^ 1, taken | (1 << face)))
+    return visible
@@ -0,0 +1,258 @@
+import glm
+import numpy as np
+import OpenGL.GL as GL
+
+from src.rendering.render_stats import RENDER_STATS
+
+# Uniform block binding point of the shared camera matrices, matching vertex.glsl
+CAMERA_BINDING = 0
+# std140 layout of the Camera block: mat4 view, mat4 projection
+CAMERA_BLOCK_SIZE = 2 * 64
+
+
+class GLState:
+    """
+    Shadow copy of the GL binding state that skips calls which would change nothing.
+
+    Every bind and uniform write of the render path goes through one GLState, so the
+    cache stays in sync with the context. Code that binds objects behind its back must
+    call invalidate() afterwards, and code that deletes objects must forget them.
+    """
+
+    def __init__(self, gl=GL):
+        """
+        Initializes a GLState object.
+
+        Args:
+            gl (module, optional): The GL backend providing the gl* functions and GL_*
+                constants. Defaults to PyOpenGL; tests pass a mock.
+        """
+
+        self.gl = gl
+        self.issued = 0
+        self.saved = 0
+        self.last_frame = {"issued": 0, "saved": 0}
+        self.invalidate()
+
+    def invalidate(self):
+        """Forgets all cached state, so the next call of every kind is issued."""
+        self.program = None
+        self.vertex_array = None
+        self.active_texture_unit = None
+        self.buffers = {}
+        self.buffer_bases = {}
+        self.textures = {}
+        self.uniform_values = {}
+        self.uniform_locations = {}
+        self.uniform_blocks = {}
+
+    def begin_frame(self):
+        """Stores the previous frame's issued and saved call counts in ``last_frame`` and resets them."""
+        self.last_frame = {"issued": self.issued, "saved": self.saved}
+        self.issued = 0
+        self.saved = 0
+
+    def count(self, changed):
+        """
+        Counts a call as issued or saved, for callers that skip redundant GL work of their own.
+
+        Args:
+            changed (bool): Whether the call changes anything and is issued.
+
+        Returns:
+            bool: The value of changed, so the count can guard the call.
+        """
+
+        if changed:
+            self.issued += 1
+        else:
+            self.saved += 1
+        return changed
+
+    def forget_vertex_array(self, vertex_array):
+        """Stops treating a deleted vertex array as bound, since the driver may reuse its name."""
+        if self.vertex_array == vertex_array:
+            self.vertex_array = None
+
+    def forget_buffer(self, target, buffer):
+        """Stops treating a deleted buffer as bound to a target or its indexed binding points."""
+        if self.buffers.get(target) == buffer:
+            del self.buffers[target]
+        for key in [key for key, bound in self.buffer_bases.items() if key[0] == target and bound == buffer]:
+            del self.buffer_bases[key]
+
+    def use_program(self, program):
+        """Makes a program current unless it already is."""
+        if self.count(self.program != program):
+            self.gl.glUseProgram(program)
+            self.program = program
+
+    def bind_vertex_array(self, vertex_array):
+        """Binds a vertex array object unless it is already bound."""
+        if self.count(self.vertex_array != vertex_array):
+            self.gl.glBindVertexArray(vertex_array)
+            self.vertex_array = vertex_array
+
+    def bind_buffer(self, target, buffer):
+        """Binds a buffer to a target, e.g. GL_ARRAY_BUFFER, unless it is already bound there."""
+        if self.count(self.buffers.get(target) != buffer):
+            self.gl.glBindBuffer(target, buffer)
+            self.buffers[target] = buffer
+
+    def bind_buffer_base(self, target, index, buffer):
+        """Binds a buffer to an indexed binding point, e.g. a uniform block binding."""
+        if self.count(self.buffer_bases.get((target, index)) != buffer):
+            self.gl.glBindBufferBase(target, index, buffer)
+            self.buffer_bases[(target, index)] = buffer
+            # Binding to an indexed point also binds the buffer to the generic target
+            self.buffers[target] = buffer
+
+    def bind_texture(self, target, texture, unit=0):
+        """Binds a texture to a texture unit, switching the active unit only when needed."""
+        if self.textures.get((unit, target)) == texture:
+            self.saved += 1
+            return
+        if self.count(self.active_texture_unit != unit):
+            self.gl.glActiveTexture(self.gl.GL_TEXTURE0 + unit)
+            self.active_texture_unit = unit
+        self.issued += 1
+        self.gl.glBindTexture(target, texture)
+        self.textures[(unit, target)] = texture
+
+    def uniform_location(self, program, name):
+        """Returns a uniform's location, queried once per program."""
+        key = (program, name)
+        location = self.uniform_locations.get(key)
+        if location is None:
+            location = self.uniform_locations[key] = self.gl.glGetUniformLocation(program, name)
+        return location
+
+    def bind_uniform_block(self, program, name, binding):
+        """Connects a program's uniform block to a binding point, once per program."""
+        key = (program, name)
+        if self.count(self.uniform_blocks.get(key) != binding):
+            index = self.gl.glGetUniformBlockIndex(program, name)
+            self.gl.glUniformBlockBinding(program, index, binding)
+            self.uniform_blocks[key] = binding
+
+    def set_uniform(self, program, name, value):
+        """
+        Writes a uniform of a program unless it already holds the same value.
+
+        The program is made current first. NumPy arrays are handed to GL without copying
+        when they are already contiguous ``float32``; 4x4 and 3x3 arrays are row-major
+        matrices, 1-D arrays of 1-4 elements are vectors.
+
+        Args:
+            program (int): The program owning the uniform.
+            name (str): Uniform name.
+            value (Union[int, float, tuple, glm.mat4, np.ndarray]): The value. Python ints
+                and bools are written as integers, e.g. for samplers.
+
+        Raises:
+            ValueError: If the value has an unsupported type or shape.
+        """
+
+        self.use_program(program)
+        location = self.uniform_location(program, name)
+        if location < 0:
+            return
+
+        if isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value, dtype=np.int32 if value.dtype.kind in "iub" else np.float32)
+            key = (np.ndarray, value.dtype.char, value.shape, value.tobytes())
+        elif isinstance(value, glm.mat4):
+            key = (glm.mat4, bytes(value))
+        else:
+            # 1, 1.0 and True compare equal but are written by different calls
+            key = (type(value), value)
+        if self.uniform_values.get((program, location)) == key:
+            self.count(False)
+            return
+
+        gl = self.gl
+        if isinstance(value, int):
+            gl.glUniform1i(location, int(value))
+        elif isinstance(value, float):
+            gl.glUniform1f(location, value)
+        elif isinstance(value, tuple) and 2 <= len(value) <= 4:
+            (gl.glUniform2f, gl.glUniform3f, gl.glUniform4f)[len(value) - 2](location, *value)
+        elif isinstance(value, glm.mat4):
+            gl.glUniformMatrix4fv(location, 1, gl.GL_FALSE, glm.value_ptr(value))
+        elif isinstance(value, np.ndarray) and value.shape == (4, 4) and value.dtype == np.float32:
+            gl.glUniformMatrix4fv(location, 1, gl.GL_TRUE, value)
+        elif isinstance(value, np.ndarray) and value.shape == (3, 3) and value.dtype == np.float32:
+            gl.glUniformMatrix3fv(location, 1, gl.GL_TRUE, value)
+        elif isinstance(value, np.ndarray) and value.ndim == 1 and 1 <= len(value) <= 4:
+            if value.dtype == np.float32:
+                functions = (gl.glUniform1fv, gl.glUniform2fv, gl.glUniform3fv, gl.glUniform4fv)
+            else:
+                functions = (gl.glUniform1iv, gl.glUniform2iv, gl.glUniform3iv, gl.glUniform4iv)
+            functions[len(value) - 1](location, 1, value)
+        else:
+            raise ValueError(f"Invalid uniform value: {value}")
+        # Stored only once written, so a rejected value is rejected again next time
+        self.count(True)
+        self.uniform_values[(program, location)] = key
+
+
+class UniformBuffer:
+    """A uniform buffer object shared by every program that binds its block, e.g. camera matrices."""
+
+    def __init__(self, state, size, binding, stats=RENDER_STATS):
+        """
+        Initializes a UniformBuffer object and attaches it to a binding point.
+
+        Args:
+            state (GLState): State cache the buffer binds through.
+            size (int): Size of the block in bytes, following its std140 layout.
+            binding (int): Uniform block binding point.
+            stats (RenderStats, optional): Counters the uploads are recorded in. Defaults to the shared ones.
+        """
+
+        gl = state.gl
+        self.state = state
+        self.stats = stats
+        self.binding = binding
+        self.contents = bytearray(size)
+        self.buffer = gl.glGenBuffers(1)
+        state.bind_buffer(gl.GL_UNIFORM_BUFFER, self.buffer)
+        gl.glBufferData(gl.GL_UNIFORM_BUFFER, size, None, gl.GL_DYNAMIC_DRAW)
+        self.bind()
+
+    def bind(self):
+        """Attaches the buffer to its binding point unless it already is."""
+        self.state.bind_buffer_base(self.state.gl.GL_UNIFORM_BUFFER, self.binding, self.buffer)
+
+    def write(self, offset, value):
+        """
+        Updates part of the buffer unless it already holds the same bytes.
+
+        Args:
+            offset (int): Byte offset within the block.
+            value (Union[glm.mat4, np.ndarray]): The data. A glm.mat4 is written column-major,
+                as std140 expects; NumPy arrays are written as their raw ``float32`` bytes.
+        """
+
+        if isinstance(value, glm.mat4):
+            data = bytes(value)
+        else:
+            data = np.ascontiguousarray(value, dtype=np.float32).tobytes()
+        end = offset + len(data)
+        if not self.state.count(self.contents[offset:end] != data):
+            return
+
+        self.contents[offset:end] = data
+        gl = self.state.gl
+        self.state.bind_buffer(gl.GL_UNIFORM_BUFFER, self.buffer)
+        gl.glBufferSubData(gl.GL_UNIFORM_BUFFER, offset, len(data), data)
+        self.stats.record_upload(len(data))
+
+    def delete(self):
+        """Frees the buffer."""
+        self.state.gl.glDeleteBuffers(1, [self.buffer])
+        self.state.forget_buffer(self.state.gl.GL_UNIFORM_BUFFER, self.buffer)
+
+
+# Shared by the whole render path, which runs on the one thread owning the GL context
+GL_STATE = GLState()
@@ -0,0 +1,262 @@
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.game.block_registry import BLOCK_REGISTRY
+from src.rendering.chunk_mesher import MESH_GREEDY, build_chunk_mesh
+from src.rendering.chunk_visibility import face_connectivity
+
+# Times a chunk is meshed before a failing request is given up on
+MAX_ATTEMPTS = 3
+
+
+def build_chunk(padded_ids, registry=BLOCK_REGISTRY, layers=None, mode=MESH_GREEDY, scale=1, block_ids=None,
+                light=None):
+    """
+    Worker entry point: meshes a chunk and computes its face connectivity.
+
+    Connectivity is computed from ``block_ids`` when given, so a downsampled mesh can keep
+    the full-resolution graph; otherwise from the inside of ``padded_ids``.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The vertex array and the (6, 6) face connectivity.
+    """
+
+    vertices = build_chunk_mesh(padded_ids, registry, layers, mode, scale, light)
+    if block_ids is None:
+        block_ids = padded_ids[1:-1, 1:-1, 1:-1]
+    return vertices, face_connectivity(block_ids, registry)
+
+
+class MeshBuilder:
+    """Builds chunk meshes on a thread pool and hands them out for upload under a per-frame budget.
+
+    Alongside each mesh the builder computes the chunk's face connectivity for occlusion culling.
+    """
+
+    def __init__(self, workers=None, registry=BLOCK_REGISTRY, layers=None, time_budget=0.004, byte_budget=None):
+        """
+        Initializes a MeshBuilder object.
+
+        Meshing is NumPy work that releases the GIL for most of its time, so threads keep
+        the render thread responsive without copying chunk data between processes.
+
+        Args:
+            workers (int, optional): Number of worker threads. Defaults to one less than the
+                number of CPUs, at least one. Zero builds meshes inline during poll().
+            registry (BlockRegistry, optional): Registry providing the mesher's lookup tables.
+                Defaults to the global block registry.
+            layers (np.ndarray, optional): Texture layer for each block ID, e.g. from a
+                TextureArray. Defaults to the block ID.
+            time_budget (float, optional): Seconds per frame spent uploading finished meshes.
+                None disables the limit. Defaults to 0.004.
+            byte_budget (int, optional): Vertex bytes uploaded per frame. None disables the
+                limit. Defaults to None.
+        """
+
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) - 1)
+        if workers < 0:
+            raise ValueError("workers must be zero or positive")
+
+        self.workers = workers
+        self.registry = registry
+        self.layers = layers
+        self.time_budget = time_budget
+        self.byte_budget = byte_budget
+        self.focus = (0, 0, 0)
+
+        # Latest requested version per chunk; results of older versions are stale. Versions come from
+        # the builder-wide counter, so a chunk cancelled and requested again never reuses one
+        self._versions = {}
+        self._queue = []
+        self._queued = {}
+        self._counter = itertools.count()
+        self._in_flight = []
+        self._ready = {}
+        # Failed attempts of the requests that failed so far, by chunk
+        self._attempts = {}
+        # The last error of each request given up on after MAX_ATTEMPTS, by chunk
+        self.failed = {}
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="mesh") if workers > 0 else None
+
+    def request(self, coords, padded_ids, mode=MESH_GREEDY, scale=1, block_ids=None, light=None):
+        """
+        Queues a chunk for meshing, superseding any earlier request for it.
+
+        Args:
+            coords (Tuple[int, int, int]): Integer chunk coordinates.
+            padded_ids (np.ndarray): The chunk's (18, 18, 18) padded block IDs. The builder
+                keeps a reference, so pass a snapshot rather than a view of live chunk data.
+            mode (str, optional): Meshing mode passed to build_chunk_mesh. Defaults to MESH_GREEDY.
+            scale (int, optional): Size of one voxel in blocks for downsampled chunks. Defaults to 1.
+            block_ids (np.ndarray, optional): Full-resolution block IDs to compute the face
+                connectivity from. Defaults to the inside of ``padded_ids``.
+            light (np.ndarray, optional): Snapshot of the light levels, shaped like ``padded_ids``.
+                Defaults to None, which lights the mesh fully.
+
+        Returns:
+            int: The version number of the request.
+        """
+
+        version = next(self._counter)
+        self._versions[coords] = version
+        self._ready.pop(coords, None)
+        self._attempts.pop(coords, None)
+        self.failed.pop(coords, None)
+        self._enqueue(coords, version, (padded_ids, mode, scale, block_ids, light))
+        return version
+
+    def cancel(self, coords):
+        """
+        Forgets a chunk: queued work is dropped and results still being built are discarded.
+
+        Args:
+            coords (Tuple[int, int, int]): Integer chunk coordinates.
+        """
+
+        self._versions.pop(coords, None)
+        self._queued.pop(coords, None)
+        self._ready.pop(coords, None)
+        self._attempts.pop(coords, None)
+
+    def set_focus(self, coords):
+        """
+        Sets the chunk, usually the camera's, that building and uploading are prioritized by.
+
+        Args:
+            coords (Tuple[int, int, int]): Integer chunk coordinates.
+        """
+
+        self.focus = tuple(coords)
+        self._queue = [(self._distance(queued), next(self._counter), queued) for queued in self._queued]
+        heapq.heapify(self._queue)
+
+    def pending(self):
+        """Returns the number of meshes queued, being built or waiting for upload."""
+        return len(self._queued) + len(self._in_flight) + len(self._ready)
+
+    def poll(self):
+        """
+        Collects finished meshes without waiting and dispatches queued requests.
+
+        A chunk whose meshing raised is queued again, up to MAX_ATTEMPTS times in all;
+        after that the request is dropped and its error kept in ``failed``.
+        """
+
+        if self._executor is None:
+            # Failed builds are queued again behind the rest, so the loop ends once those are given up on
+            while self._queue:
+                coords, version, job = self._pop_request()
+                if coords is None:
+                    break
+                try:
+                    result = self._build(job)
+                except Exception as error:
+                    self._retry(coords, version, job, error)
+                    continue
+                self._finish(coords, version, result)
+            return
+
+        in_flight, self._in_flight = self._in_flight, []
+        for coords, version, job, future in in_flight:
+            if not future.done():
+                self._in_flight.append((coords, version, job, future))
+                continue
+            try:
+                result = future.result()
+            except Exception as error:
+                self._retry(coords, version, job, error)
+                continue
+            self._finish(coords, version, result)
+
+        # Keep the backlog in flight short so a moving camera reprioritizes quickly
+        while len(self._in_flight) < self.workers * 2:
+            coords, version, job = self._pop_request()
+            if coords is None:
+                break
+            future = self._executor.submit(self._build, job)
+            self._in_flight.append((coords, version, job, future))
+
+    def upload(self, upload_mesh):
+        """
+        Hands finished meshes, nearest to the focus first, to an upload function until the
+        frame's time or byte budget is spent. At least one mesh is uploaded per call so
+        progress never stalls on a single large mesh.
+
+        Args:
+            upload_mesh (Callable[[Tuple[int, int, int], np.ndarray, np.ndarray], None]): Uploads
+                one chunk's vertex array, e.g. into its VBO, and receives its face connectivity.
+
+        Returns:
+            int: The number of meshes uploaded.
+        """
+
+        self.poll()
+        if not self._ready:
+            return 0
+
+        start = time.perf_counter()
+        uploaded_bytes = 0
+        uploaded = 0
+        for coords in sorted(self._ready, key=self._distance):
+            if uploaded > 0:
+                if self.time_budget is not None and time.perf_counter() - start >= self.time_budget:
+                    break
+                if self.byte_budget is not None and uploaded_bytes + self._ready[coords][0].nbytes > self.byte_budget:
+                    break
+            vertices, connectivity = self._ready.pop(coords)
+            upload_mesh(coords, vertices, connectivity)
+            uploaded_bytes += vertices.nbytes
+            uploaded += 1
+        return uploaded
+
+    def close(self):
+        """Stops the worker threads and drops all outstanding work."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._queue.clear()
+        self._queued.clear()
+        self._in_flight.clear()
+        self._ready.clear()
+
+    def _finish(self, coords, version, result):
+        if self._versions.get(coords) == version:
+            self._attempts.pop(coords, None)
+            self._ready[coords] = result
+
+    def _retry(self, coords, version, job, error):
+        # A newer request or a cancel supersedes the failed one
+        if self._versions.get(coords) != version:
+            return
+        attempts = self._attempts.get(coords, 0) + 1
+        if attempts < MAX_ATTEMPTS:
+            self._attempts[coords] = attempts
+            self._enqueue(coords, version, job)
+        else:
+            self._attempts.pop(coords, None)
+            self._versions.pop(coords, None)
+            self.failed[coords] = error
+
+    def _enqueue(self, coords, version, job):
+        if coords not in self._queued:
+            heapq.heappush(self._queue, (self._distance(coords), next(self._counter), coords))
+        self._queued[coords] = (version, job)
+
+    def _pop_request(self):
+        while self._queue:
+            _, _, coords = heapq.heappop(self._queue)
+            request = self._queued.pop(coords, None)
+            if request is not None:
+                return (coords, *request)
+        return None, None, None
+
+    def _build(self, job):
+        padded_ids, mode, scale, block_ids, light = job
+        return build_chunk(padded_ids, self.registry, self.layers, mode, scale, block_ids, light)
+
+    def _distance(self, coords):
+        return sum((coords[axis] - self.focus[axis]) ** 2 for axis in range(3))
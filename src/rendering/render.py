@@ -14,7 +14,7 @@ class Renderer:
         camera.set_view()
 
         # Draw world (chunks and blocks)
-        for chunk in world.chunks:
+        for chunk in world.chunks.values():
             for block in chunk.blocks:
                 # Draw block using its texture and position
                 pass
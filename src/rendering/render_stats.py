@@ -0,0 +1,210 @@
+import collections
+import contextlib
+import json
+import time
+
+import numpy as np
+import OpenGL.GL as GL
+
+# Frames of history kept, about two seconds at 60 frames per second
+HISTORY_LENGTH = 120
+# Counters summed over a frame, in the order they appear in a frame record
+COUNTERS = ("draw_calls", "vertices", "triangles", "instances", "bytes_uploaded", "state_changes", "state_changes_saved")
+
+
+class RenderStats:
+    """
+    Per-frame counters of the render path: draw calls, submitted geometry, uploaded bytes,
+    GL state changes, and CPU and GPU time of named passes.
+
+    The counts are kept on the CPU, so they are exact with any GL backend, including a
+    software renderer or a mock. GPU times come from GL_TIME_ELAPSED queries; they are
+    read back frames later, when the driver reports them available, so measuring never
+    stalls the pipeline, and stay absent where queries are unsupported.
+    """
+
+    def __init__(self, gl=GL, history=HISTORY_LENGTH, gpu_timing=True):
+        """
+        Initializes a RenderStats object.
+
+        Args:
+            gl (module, optional): The GL backend providing the gl* functions and GL_*
+                constants. Defaults to PyOpenGL; tests pass a mock.
+            history (int, optional): Number of finished frames kept. Defaults to HISTORY_LENGTH.
+            gpu_timing (bool, optional): Whether to time passes on the GPU when the context
+                supports timer queries. Defaults to True.
+
+        Raises:
+            ValueError: If history is not positive.
+        """
+
+        if history <= 0:
+            raise ValueError("history must be positive")
+
+        self.gl = gl
+        self.gpu_timing = gpu_timing
+        self.history = collections.deque(maxlen=history)
+        self.frame = None
+        self.frame_count = 0
+        self._pass = None
+        self._free_queries = []
+        # (frame record, pass name, query) of GPU timings not yet read back
+        self._pending_queries = []
+        self._queries_supported = None
+
+    def begin_frame(self):
+        """Starts a new frame record, finishing the current one first if end_frame() was skipped."""
+        if self.frame is not None:
+            self.end_frame()
+        self.frame = {"frame": self.frame_count, **{name: 0 for name in COUNTERS}, "cpu_ms": {}, "gpu_ms": {}}
+        self.frame_count += 1
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self, state=None):
+        """
+        Finishes the current frame and appends it to the history.
+
+        Args:
+            state (GLState, optional): State cache whose issued and saved call counts for
+                this frame are recorded; read before the cache's own begin_frame() resets them.
+
+        Returns:
+            dict: The finished frame record, or None if no frame was started.
+        """
+
+        frame = self.frame
+        if frame is None:
+            return None
+        if state is not None:
+            frame["state_changes"] += state.issued
+            frame["state_changes_saved"] += state.saved
+        frame["cpu_ms"]["frame"] = (time.perf_counter() - self._frame_start) * 1000.0
+        self.history.append(frame)
+        self.frame = None
+        self.poll_queries()
+        return frame
+
+    def record_draw(self, vertex_count, instances=1):
+        """
+        Counts one draw call of triangles.
+
+        Args:
+            vertex_count (int): Vertices per instance.
+            instances (int, optional): Number of instances drawn. Defaults to 1.
+        """
+
+        if self.frame is None:
+            return
+        self.frame["draw_calls"] += 1
+        self.frame["vertices"] += vertex_count * instances
+        self.frame["triangles"] += vertex_count // 3 * instances
+        self.frame["instances"] += instances
+
+    def record_upload(self, byte_count):
+        """Counts bytes written to GPU buffers or textures."""
+        if self.frame is not None:
+            self.frame["bytes_uploaded"] += int(byte_count)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """
+        Times a render pass on the CPU and, where supported, on the GPU.
+
+        Passes may not nest, since only one GL_TIME_ELAPSED query can be active at a time.
+
+        Args:
+            name (str): Pass name, the key of the times in the frame record.
+
+        Raises:
+            ValueError: If called inside another pass.
+        """
+
+        if self._pass is not None:
+            raise ValueError(f"Pass {name!r} started inside pass {self._pass!r}")
+        self._pass = name
+        frame = self.frame
+        query = self._begin_query() if frame is not None else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000.0
+            if query is not None:
+                self.gl.glEndQuery(self.gl.GL_TIME_ELAPSED)
+                self._pending_queries.append((frame, name, query))
+            if frame is not None:
+                frame["cpu_ms"][name] = frame["cpu_ms"].get(name, 0.0) + elapsed
+            self._pass = None
+
+    def poll_queries(self):
+        """Moves the GPU times of finished queries into their frame records, without waiting for the GPU."""
+        gl = self.gl
+        pending = []
+        for frame, name, query in self._pending_queries:
+            available = np.zeros(1, dtype=np.uint32)
+            gl.glGetQueryObjectuiv(query, gl.GL_QUERY_RESULT_AVAILABLE, available)
+            if not available[0]:
+                pending.append((frame, name, query))
+                continue
+            nanoseconds = np.zeros(1, dtype=np.uint64)
+            gl.glGetQueryObjectui64v(query, gl.GL_QUERY_RESULT, nanoseconds)
+            frame["gpu_ms"][name] = frame["gpu_ms"].get(name, 0.0) + int(nanoseconds[0]) / 1e6
+            self._free_queries.append(query)
+        self._pending_queries = pending
+
+    def latest(self):
+        """Returns the most recently finished frame record, or None before the first frame."""
+        return self.history[-1] if self.history else None
+
+    def averages(self):
+        """
+        Returns the mean of every counter and time over the history.
+
+        Returns:
+            dict: Counter means, plus ``cpu_ms`` and ``gpu_ms`` dictionaries of mean pass
+            times over the frames that recorded each pass.
+        """
+
+        frames = list(self.history)
+        if not frames:
+            return {}
+        result = {name: sum(frame[name] for frame in frames) / len(frames) for name in COUNTERS}
+        for timing in ("cpu_ms", "gpu_ms"):
+            times = collections.defaultdict(list)
+            for frame in frames:
+                for name, value in frame[timing].items():
+                    times[name].append(value)
+            result[timing] = {name: sum(values) / len(values) for name, values in times.items()}
+        return result
+
+    def to_json(self, indent=None):
+        """Returns the history and its averages as a JSON document."""
+        return json.dumps({"frames": list(self.history), "averages": self.averages()}, indent=indent)
+
+    def dump(self, path):
+        """Writes to_json() to a file, e.g. for a CI job comparing draw-call counts between builds."""
+        with open(path, "w") as file:
+            file.write(self.to_json(indent=2))
+
+    def delete(self):
+        """Frees every timer query. Requires the GL context the queries were created in."""
+        queries = self._free_queries + [query for _, _, query in self._pending_queries]
+        if queries:
+            self.gl.glDeleteQueries(len(queries), queries)
+        self._free_queries = []
+        self._pending_queries = []
+
+    def _begin_query(self):
+        if self._queries_supported is None:
+            # PyOpenGL functions are falsy when the context does not provide them
+            self._queries_supported = self.gpu_timing and bool(getattr(self.gl, "glGenQueries", None))
+        if not self._queries_supported:
+            return None
+
+        query = self._free_queries.pop() if self._free_queries else int(np.ravel(self.gl.glGenQueries(1))[0])
+        self.gl.glBeginQuery(self.gl.GL_TIME_ELAPSED, query)
+        return query
+
+
+# Shared by the whole render path, like GL_STATE
+RENDER_STATS = RenderStats()
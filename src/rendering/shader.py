@@ -1,13 +1,15 @@
 import glm
+import numpy as np
 import pygame
 from OpenGL.GL import *
 from OpenGL.GL.shaders import *
 
 class Shader:
-    def __init__(self, vertex_file, fragment_file):
+    def __init__(self, vertex_file, fragment_file, program=None):
         self.vertex_file = vertex_file
         self.fragment_file = fragment_file
-        self.program = self.compile_shader()
+        # An already linked program, e.g. from ShaderManager, skips compilation
+        self.program = self.compile_shader() if program is None else program
         self.uniform_locations = {}
 
     def compile_shader(self):
@@ -66,5 +68,13 @@ class Shader:
             glUniform4f(location, *value)
         elif isinstance(value, glm.mat4):
             glUniformMatrix4fv(location, 1, GL_FALSE, glm.value_ptr(value))
+        elif isinstance(value, np.ndarray) and value.shape == (4, 4):
+            # Row-major NumPy matrices are transposed by GL; float32 arrays are passed without a copy
+            glUniformMatrix4fv(location, 1, GL_TRUE, np.ascontiguousarray(value, dtype=np.float32))
+        elif isinstance(value, np.ndarray) and value.shape == (3, 3):
+            glUniformMatrix3fv(location, 1, GL_TRUE, np.ascontiguousarray(value, dtype=np.float32))
+        elif isinstance(value, np.ndarray) and value.ndim == 1 and 1 <= len(value) <= 4:
+            functions = (glUniform1fv, glUniform2fv, glUniform3fv, glUniform4fv)
+            functions[len(value) - 1](location, 1, np.ascontiguousarray(value, dtype=np.float32))
         else:
             raise ValueError(f"Invalid uniform value: {value}")
@@ -0,0 +1,269 @@
+import ctypes
+import hashlib
+import os
+import struct
+
+from OpenGL.GL import *
+
+from src.rendering.shader import Shader
+
+ASSETS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "assets")
+SHADER_DIRECTORY = os.path.join(ASSETS_DIRECTORY, "shaders")
+PROGRAM_CACHE_DIRECTORY = os.path.join(ASSETS_DIRECTORY, "cache", "shaders")
+
+PROGRAM_MAGIC = b"VXSP"
+# Magic and the driver-specific binary format of the program that follows
+PROGRAM_HEADER = struct.Struct("<4sI")
+
+
+def program_key(vertex_source, fragment_source, driver):
+    """
+    Returns the cache key of a linked program.
+
+    A program binary is only valid for the exact sources it was built from and the driver
+    that built it, so both go into the key; changing either makes the old entry unreachable.
+
+    Args:
+        vertex_source (str): GLSL source of the vertex shader.
+        fragment_source (str): GLSL source of the fragment shader.
+        driver (str): Identification of the GL driver, e.g. from driver_string().
+
+    Returns:
+        str: A hexadecimal SHA-256 digest.
+    """
+
+    digest = hashlib.sha256()
+    for part in (vertex_source, fragment_source, driver):
+        encoded = part.encode("utf-8")
+        # Length-prefix every part so moving text between them changes the key
+        digest.update(struct.pack("<Q", len(encoded)))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def driver_string():
+    """Returns the vendor, renderer and version of the current GL context. Requires a GL context."""
+    parts = (glGetString(GL_VENDOR), glGetString(GL_RENDERER), glGetString(GL_VERSION))
+    return "|".join(part.decode("utf-8", "replace") if part else "" for part in parts)
+
+
+class ProgramCache:
+    """Linked program binaries on disk, one file per program key. Needs no GL context."""
+
+    def __init__(self, directory=PROGRAM_CACHE_DIRECTORY):
+        """
+        Initializes a ProgramCache object.
+
+        Args:
+            directory (str, optional): Directory holding the cached binaries; created on the
+                first store. Defaults to assets/cache/shaders.
+        """
+
+        self.directory = directory
+
+    def path(self, key):
+        """Returns the file a program key is cached in."""
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def load(self, key):
+        """
+        Reads a cached program binary.
+
+        Args:
+            key (str): Key from program_key().
+
+        Returns:
+            Tuple[int, bytes]: The binary format and the binary, or None if the key is not
+            cached or the file is not a valid cache entry.
+        """
+
+        try:
+            with open(self.path(key), "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        if len(data) <= PROGRAM_HEADER.size:
+            return None
+        magic, binary_format = PROGRAM_HEADER.unpack_from(data)
+        if magic != PROGRAM_MAGIC:
+            return None
+        return binary_format, data[PROGRAM_HEADER.size:]
+
+    def store(self, key, binary_format, binary):
+        """
+        Writes a program binary, replacing any previous entry for the key.
+
+        Args:
+            key (str): Key from program_key().
+            binary_format (int): Driver-specific format reported by glGetProgramBinary.
+            binary (bytes): The program binary.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        # Write to a temporary file first so an interrupted save never leaves a truncated entry
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(PROGRAM_HEADER.pack(PROGRAM_MAGIC, binary_format))
+            file.write(bytes(binary))
+        os.replace(temporary_path, path)
+
+    def invalidate(self, key):
+        """Deletes a cache entry, e.g. one the driver refused to load."""
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+
+class ShaderManager:
+    """Loads shader programs from assets/shaders once, shared by every renderer, through a binary cache."""
+
+    def __init__(self, directory=SHADER_DIRECTORY, cache_directory=PROGRAM_CACHE_DIRECTORY):
+        """
+        Initializes a ShaderManager object. No GL calls are made until a program is requested.
+
+        Args:
+            directory (str, optional): Directory shader file names are resolved against.
+                Defaults to assets/shaders.
+            cache_directory (str, optional): Directory of cached program binaries, or None to
+                disable caching. Defaults to assets/cache/shaders.
+        """
+
+        self.directory = directory
+        self.cache = ProgramCache(cache_directory) if cache_directory is not None else None
+        self.programs = {}
+        self._driver = None
+
+    def resolve(self, name):
+        """Returns the absolute path of a shader file name relative to the shader directory."""
+        return os.path.abspath(os.path.join(self.directory, name))
+
+    def get(self, vertex_name, fragment_name):
+        """
+        Returns the program built from two shader files, building it on first use.
+
+        Args:
+            vertex_name (str): Vertex shader file name, relative to the shader directory.
+            fragment_name (str): Fragment shader file name, relative to the shader directory.
+
+        Returns:
+            Shader: The program; the same object for every caller asking for the same files.
+        """
+
+        return self.preload([(vertex_name, fragment_name)])[0]
+
+    def preload(self, pairs):
+        """
+        Builds several programs at once.
+
+        Every program missing from the binary cache is compiled and linked before any
+        status is queried, so drivers that compile in the background can work on all of
+        them in parallel instead of stalling on each one in turn.
+
+        Args:
+            pairs (List[Tuple[str, str]]): (vertex, fragment) shader file names.
+
+        Returns:
+            List[Shader]: The programs, in the order requested.
+        """
+
+        pending = []
+        for vertex_name, fragment_name in pairs:
+            paths = (self.resolve(vertex_name), self.resolve(fragment_name))
+            if paths in self.programs or any(paths == entry[0] for entry in pending):
+                continue
+            sources = tuple(self._read(path) for path in paths)
+            key = program_key(*sources, self.driver()) if self.cache is not None else None
+            program = self._load_binary(key)
+            if program is not None:
+                self.programs[paths] = Shader(*paths, program=program)
+            else:
+                pending.append((paths, sources, key, self._start_build(sources)))
+
+        for paths, sources, key, (program, shaders) in pending:
+            self._finish_build(paths, program, shaders)
+            self._store_binary(key, program)
+            self.programs[paths] = Shader(*paths, program=program)
+
+        return [self.programs[(self.resolve(vertex_name), self.resolve(fragment_name))]
+                for vertex_name, fragment_name in pairs]
+
+    def driver(self):
+        """Returns the driver string, queried once. Requires a GL context."""
+        if self._driver is None:
+            self._driver = driver_string()
+        return self._driver
+
+    def delete(self):
+        """Deletes every program built by the manager."""
+        for shader in self.programs.values():
+            glDeleteProgram(shader.program)
+        self.programs.clear()
+
+    @staticmethod
+    def _read(path):
+        with open(path, "r") as file:
+            return file.read()
+
+    def _load_binary(self, key):
+        if key is None:
+            return None
+        entry = self.cache.load(key)
+        if entry is None:
+            return None
+
+        binary_format, binary = entry
+        program = glCreateProgram()
+        glProgramBinary(program, binary_format, binary, len(binary))
+        if glGetProgramiv(program, GL_LINK_STATUS):
+            return program
+
+        # Driver updates can reject old binaries even under the same driver string
+        glDeleteProgram(program)
+        self.cache.invalidate(key)
+        return None
+
+    def _store_binary(self, key, program):
+        if key is None or not glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS):
+            return
+        length = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+        binary = (ctypes.c_ubyte * length)()
+        written = ctypes.c_int(0)
+        binary_format = ctypes.c_uint(0)
+        glGetProgramBinary(program, length, ctypes.byref(written), ctypes.byref(binary_format), binary)
+        self.cache.store(key, binary_format.value, bytes(binary[:written.value]))
+
+    @staticmethod
+    def _start_build(sources):
+        shaders = []
+        for source, shader_type in zip(sources, (GL_VERTEX_SHADER, GL_FRAGMENT_SHADER)):
+            shader = glCreateShader(shader_type)
+            glShaderSource(shader, source)
+            glCompileShader(shader)
+            shaders.append(shader)
+
+        program = glCreateProgram()
+        for shader in shaders:
+            glAttachShader(program, shader)
+        glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+        glLinkProgram(program)
+        return program, shaders
+
+    @staticmethod
+    def _finish_build(paths, program, shaders):
+        for path, shader in zip(paths, shaders):
+            if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+                info_log = glGetShaderInfoLog(shader)
+                raise ValueError(f"Error compiling {path}: {info_log}")
+        if not glGetProgramiv(program, GL_LINK_STATUS):
+            info_log = glGetProgramInfoLog(program)
+            raise ValueError(f"Error linking shader program: {info_log}")
+        for shader in shaders:
+            glDetachShader(program, shader)
+            glDeleteShader(shader)
+
+
+# Shared by every renderer so each program is built once per context
+SHADER_MANAGER = ShaderManager()
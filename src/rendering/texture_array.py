@@ -0,0 +1,237 @@
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+from src.game.block_registry import BLOCK_REGISTRY
+
+ASSETS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "assets")
+TEXTURE_DIRECTORY = os.path.join(ASSETS_DIRECTORY, "textures")
+CACHE_DIRECTORY = os.path.join(ASSETS_DIRECTORY, "cache")
+
+TEXTURE_SIZE = 16
+# Bumped whenever the packing changes, so caches written by older code are not reused
+PACK_VERSION = 1
+
+
+def texture_names(registry=BLOCK_REGISTRY):
+    """Returns the distinct texture file names of the registry's visible block types, in registration order."""
+    return list(dict.fromkeys(block_type.texture for block_type in registry if block_type.texture is not None))
+
+
+def source_key(names, directory=TEXTURE_DIRECTORY, size=TEXTURE_SIZE):
+    """
+    Returns a hash of everything the packed textures depend on: the texture names, the
+    contents of their source files and the layer size.
+
+    Args:
+        names (List[str]): Texture file names in layer order.
+        directory (str, optional): Directory the textures are loaded from.
+        size (int, optional): Width and height of each layer in texels.
+
+    Returns:
+        str: A hexadecimal SHA-256 digest.
+    """
+
+    digest = hashlib.sha256(f"{PACK_VERSION}:{size}".encode("utf-8"))
+    for name in names:
+        digest.update(name.encode("utf-8") + b"\0")
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                digest.update(hashlib.sha256(file.read()).digest())
+        else:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def load_texture(path, size=TEXTURE_SIZE):
+    """
+    Loads a texture as RGBA texels, substituting a placeholder if the file does not exist.
+
+    Args:
+        path (str): Path of the image file.
+        size (int, optional): Width and height the texture is scaled to. Defaults to TEXTURE_SIZE.
+
+    Returns:
+        np.ndarray: A (size, size, 4) ``uint8`` array indexed as [row, column], top row first.
+    """
+
+    if not os.path.exists(path):
+        return placeholder_texture(os.path.basename(path), size)
+
+    surface = pygame.image.load(path)
+    if surface.get_size() != (size, size):
+        surface = pygame.transform.scale(surface, (size, size))
+    texels = np.empty((size, size, 4), dtype=np.uint8)
+    # surfarray is indexed [x, y]; transpose to rows of texels
+    texels[:, :, 0:3] = pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+    if surface.get_flags() & pygame.SRCALPHA:
+        texels[:, :, 3] = pygame.surfarray.array_alpha(surface).T
+    else:
+        texels[:, :, 3] = 255
+    return texels
+
+
+def placeholder_texture(name, size=TEXTURE_SIZE):
+    """Returns a solid texture with a darker border, colored from a hash of its name so blocks stay distinguishable."""
+    red, green, blue = hashlib.sha256(name.encode("utf-8")).digest()[:3]
+    texels = np.empty((size, size, 4), dtype=np.uint8)
+    texels[...] = (red, green, blue, 255)
+    border = (np.array([red, green, blue]) * 0.6).astype(np.uint8)
+    texels[[0, -1], :, 0:3] = border
+    texels[:, [0, -1], 0:3] = border
+    return texels
+
+
+def build_mip_chain(layers):
+    """
+    Builds every mip level of a stack of square textures by averaging 2x2 texel blocks.
+
+    Args:
+        layers (np.ndarray): An (L, size, size, 4) ``uint8`` array; size must be a power of two.
+
+    Returns:
+        List[np.ndarray]: The levels from full size down to 1x1.
+    """
+
+    levels = [layers]
+    current = layers.astype(np.float32)
+    while current.shape[1] > 1:
+        count, size = current.shape[0], current.shape[1] // 2
+        current = current.reshape(count, size, 2, size, 2, 4).mean(axis=(2, 4))
+        levels.append(np.round(current).astype(np.uint8))
+    return levels
+
+
+class TextureArray:
+    """Every block texture packed into the layers of one 2D array texture, with a mip chain."""
+
+    def __init__(self, registry=BLOCK_REGISTRY, directory=TEXTURE_DIRECTORY, size=TEXTURE_SIZE,
+                 cache_directory=CACHE_DIRECTORY):
+        """
+        Initializes a TextureArray object and packs the registry's textures.
+
+        Packing runs on the CPU and needs no GL context; call upload() once one exists. The
+        packed texels are cached on disk under a hash of the sources, so later startups
+        load the cache instead of decoding and downsampling every image again.
+
+        Args:
+            registry (BlockRegistry, optional): Registry whose block textures are packed.
+                Defaults to the global block registry.
+            directory (str, optional): Directory the texture files are loaded from.
+                Defaults to assets/textures.
+            size (int, optional): Width and height of each layer; must be a power of two.
+                Defaults to TEXTURE_SIZE.
+            cache_directory (str, optional): Directory of packed texture caches, or None to
+                disable caching. Defaults to assets/cache.
+
+        Raises:
+            ValueError: If size is not a power of two.
+        """
+
+        if size <= 0 or size & (size - 1):
+            raise ValueError("size must be a power of two")
+
+        self.registry = registry
+        self.directory = directory
+        self.size = size
+        self.cache_directory = cache_directory
+        self.texture_id = None
+
+        self.names = texture_names(registry)
+        self.key = source_key(self.names, directory, size)
+        self.levels = self._load_cache()
+        if self.levels is None:
+            self.levels = self.pack()
+            self._save_cache()
+
+        # Texture layer of every block ID, for the mesher and the instanced renderer
+        layer_of = {name: index for index, name in enumerate(self.names)}
+        self.layers = np.zeros(max(len(registry), 1), dtype=np.float32)
+        for block_type in registry:
+            if block_type.texture is not None:
+                self.layers[block_type.id] = layer_of[block_type.texture]
+
+    def pack(self):
+        """Loads every texture and returns its mip chain, from (L, size, size, 4) down to (L, 1, 1, 4)."""
+        layers = np.zeros((max(len(self.names), 1), self.size, self.size, 4), dtype=np.uint8)
+        for index, name in enumerate(self.names):
+            layers[index] = load_texture(os.path.join(self.directory, name), self.size)
+        return build_mip_chain(layers)
+
+    def cache_path(self):
+        """Returns the path of the cache file for the current sources, or None if caching is disabled."""
+        if self.cache_directory is None:
+            return None
+        return os.path.join(self.cache_directory, f"textures-{self.key[:32]}.npz")
+
+    def _load_cache(self):
+        """Returns the cached mip chain, or None if there is none or the file is not a valid cache."""
+        path = self.cache_path()
+        if path is None:
+            return None
+        try:
+            with np.load(path) as cache:
+                levels = [cache[f"level_{level}"] for level in range(len(cache.files))]
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            # Missing or damaged: the textures are packed again from the sources and the cache rewritten
+            return None
+
+        count = max(len(self.names), 1)
+        expected = [(count, self.size >> level, self.size >> level, 4) for level in range(self.size.bit_length())]
+        if [level.shape for level in levels] != expected or any(level.dtype != np.uint8 for level in levels):
+            return None
+        return levels
+
+    def _save_cache(self):
+        path = self.cache_path()
+        if path is None:
+            return
+        os.makedirs(self.cache_directory, exist_ok=True)
+        # Write to a temporary file first so an interrupted save never leaves a truncated cache
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            np.savez(file, **{f"level_{level}": texels for level, texels in enumerate(self.levels)})
+        os.replace(temporary_path, path)
+
+    def upload(self, state):
+        """
+        Creates the GL_TEXTURE_2D_ARRAY with every mip level. Requires a GL context.
+
+        Args:
+            state (GLState): State cache the texture is bound through.
+        """
+
+        self.texture_id = glGenTextures(1)
+        state.bind_texture(GL_TEXTURE_2D_ARRAY, self.texture_id)
+        for level, texels in enumerate(self.levels):
+            count, size = texels.shape[0], texels.shape[1]
+            glTexImage3D(GL_TEXTURE_2D_ARRAY, level, GL_RGBA8, size, size, count, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                         np.ascontiguousarray(texels))
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MAX_LEVEL, len(self.levels) - 1)
+        # Greedy meshes tile a texture across merged quads, so texture coordinates must repeat
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MIN_FILTER, GL_NEAREST_MIPMAP_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+
+    def bind(self, state, unit=0):
+        """
+        Binds the array texture to a texture unit; one bind serves every block type.
+
+        Args:
+            state (GLState): State cache that skips the bind if the texture is already bound.
+            unit (int, optional): Texture unit. Defaults to 0.
+        """
+
+        state.bind_texture(GL_TEXTURE_2D_ARRAY, self.texture_id, unit)
+
+    def delete(self):
+        """Frees the GPU texture."""
+        if self.texture_id is not None:
+            glDeleteTextures(1, [self.texture_id])
+            self.texture_id = None
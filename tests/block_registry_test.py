@@ -0,0 +1,104 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from src.game.block import Block
+from src.game.block_registry import AIR, BLOCK_REGISTRY, GLOWSTONE, STONE, BlockRegistry, BlockType
+
+
+def small_registry():
+    registry = BlockRegistry()
+    registry.register("air", None, hardness=0, opaque=False, solid=False)
+    registry.register("glass", "glass.png", hardness=0.3, opaque=False)
+    registry.register("lamp", "lamp.png", hardness=2, light_level=12)
+    registry.register("mist", "mist.png", opaque=False, solid=False)
+    return registry
+
+
+def test_lookup_tables_follow_the_registered_types():
+    registry = small_registry()
+    assert [block_type.id for block_type in registry] == [0, 1, 2, 3]
+    assert registry.hardness.dtype == np.float32
+    assert registry.hardness.tolist() == pytest.approx([0, 0.3, 2, 1])
+    assert registry.opacity.tolist() == [0, 0, 15, 0]
+    assert registry.light_emission.tolist() == [0, 0, 12, 0]
+    assert registry.solid.tolist() == [False, True, True, False]
+    assert registry.visible.tolist() == [False, True, True, True]
+
+
+def test_lookup_tables_are_read_only():
+    registry = small_registry()
+    for table in (registry.hardness, registry.opacity, registry.light_emission, registry.solid, registry.visible):
+        with pytest.raises(ValueError):
+            table[0] = 1
+
+
+def test_lookup_tables_index_block_ids():
+    block_ids = np.array([[AIR.id, STONE.id], [GLOWSTONE.id, STONE.id]], dtype=np.uint16)
+    assert BLOCK_REGISTRY.solid[block_ids].tolist() == [[False, True], [True, True]]
+    assert BLOCK_REGISTRY.light_emission[block_ids].tolist() == [[0, 0], [15, 0]]
+
+
+@pytest.mark.parametrize("key", [2, np.uint16(2), "lamp", Block((0, 0, 0), "lamp")])
+def test_types_resolve_from_ids_names_and_blocks(key):
+    registry = small_registry()
+    lamp = registry["lamp"]
+    assert registry.get(key) is lamp
+    assert registry.get(lamp) is lamp
+
+
+def test_unknown_keys_are_rejected():
+    registry = small_registry()
+    with pytest.raises(KeyError):
+        registry.get("lava")
+    with pytest.raises(KeyError):
+        registry.get(4)
+    with pytest.raises(TypeError):
+        registry.get(1.0)
+
+
+def test_names_are_unique():
+    registry = small_registry()
+    with pytest.raises(ValueError):
+        registry.register("glass", "other_glass.png")
+    assert len(registry) == 4
+
+
+def test_registry_is_bounded():
+    registry = small_registry()
+    registry.MAX_BLOCK_TYPES = 4
+    with pytest.raises(ValueError):
+        registry.register("lava", "lava.png")
+    assert "lava" not in registry
+
+
+def test_block_types_are_immutable():
+    with pytest.raises(AttributeError):
+        STONE.hardness = 0
+    with pytest.raises(AttributeError):
+        STONE.extra = 1
+    with pytest.raises(AttributeError):
+        del STONE.name
+    assert STONE.hardness == 1.5 and STONE.name == "stone"
+
+
+def test_registries_survive_pickling():
+    registry = pickle.loads(pickle.dumps(small_registry()))
+    lamp = registry["lamp"]
+    assert (lamp.id, lamp.texture, lamp.hardness, lamp.light_level, lamp.opaque, lamp.solid) == (
+        2, "lamp.png", 2, 12, True, True
+    )
+    assert registry.get(2) is lamp
+    assert registry.opacity.tolist() == [0, 0, 15, 0]
+    with pytest.raises(AttributeError):
+        lamp.hardness = 0
+
+
+@pytest.mark.parametrize(
+    "arguments, error",
+    [({"hardness": "hard"}, TypeError), ({"light_level": -1}, ValueError), ({"light_level": 16}, ValueError)],
+)
+def test_block_types_validate_their_properties(arguments, error):
+    with pytest.raises(error):
+        BlockType(0, "broken", "broken.png", **arguments)
@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.game.block_registry import AIR, DIRT, GLOWSTONE, STONE
+from src.rendering.block_renderer import INSTANCE_COMPONENTS, INSTANCE_STRIDE, instance_data
+
+
+def test_instances_hold_block_centers_and_ids():
+    positions = np.array([[0, 0, 0], [-3, 64, 17]])
+    data = instance_data(positions, [STONE.id, GLOWSTONE.id])
+    assert data.dtype == np.float32
+    assert data.shape == (2, INSTANCE_COMPONENTS)
+    assert data.tolist() == [[0.5, 0.5, 0.5, STONE.id], [-2.5, 64.5, 17.5, GLOWSTONE.id]]
+
+
+def test_rows_match_the_attribute_stride():
+    data = instance_data(np.zeros((3, 3)), np.full(3, DIRT.id))
+    assert data.flags.c_contiguous
+    assert data.strides[0] == INSTANCE_STRIDE
+    # The texture layer follows the three offset components, at byte 12 of each row
+    assert data.view(np.uint8)[0, 12:16].view(np.float32)[0] == DIRT.id
+
+
+def test_layers_are_looked_up_by_block_id():
+    layers = np.array([0, 5, 6, 7], dtype=np.float32)
+    data = instance_data([[1, 2, 3], [4, 5, 6], [7, 8, 9]], np.array([[DIRT.id], [STONE.id], [AIR.id]]), layers)
+    assert data[:, 3].tolist() == [6, 5, 0]
+    assert data[:, 0:3].tolist() == [[1.5, 2.5, 3.5], [4.5, 5.5, 6.5], [7.5, 8.5, 9.5]]
+
+
+def test_flat_positions_are_accepted():
+    data = instance_data(np.arange(6), [STONE.id, DIRT.id])
+    assert data[:, 0:3].tolist() == [[0.5, 1.5, 2.5], [3.5, 4.5, 5.5]]
+
+
+def test_empty_batch():
+    data = instance_data(np.zeros((0, 3)), [])
+    assert data.shape == (0, INSTANCE_COMPONENTS)
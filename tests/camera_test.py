@@ -0,0 +1,62 @@
+import numpy as np
+
+from src.rendering.camera import Camera
+
+HALF = np.sqrt(0.5)
+
+
+def forward_camera(position=(0.0, 0.0, 0.0)):
+    """Looks down +X with a 90 degree square frustum from 1 to 100 blocks, so its planes are known exactly."""
+    return Camera(position=position, yaw=0.0, fov=90.0, aspect=1.0, near=1.0, far=100.0)
+
+
+def test_frustum_planes_are_extracted_from_the_view_projection():
+    planes = forward_camera().frustum_planes()
+    # Left, right, bottom, top, near, far; +Z is to the camera's right
+    expected = [
+        (HALF, 0, HALF, 0),
+        (HALF, 0, -HALF, 0),
+        (HALF, HALF, 0, 0),
+        (HALF, -HALF, 0, 0),
+        (1, 0, 0, -1),
+        (-1, 0, 0, 100),
+    ]
+    assert np.allclose(planes, expected)
+
+
+def test_frustum_planes_follow_the_camera():
+    planes = forward_camera((10.0, 2.0, -3.0)).frustum_planes()
+    assert np.allclose(planes[4], (1, 0, 0, -11))
+    assert np.allclose(planes[5], (-1, 0, 0, 110))
+    # The eye lies on the four side planes
+    assert np.allclose(planes[:4, :3] @ (10.0, 2.0, -3.0) + planes[:4, 3], 0)
+
+
+def test_boxes_outside_any_plane_are_culled():
+    camera = forward_camera()
+    boxes = {
+        "ahead": ((5, -1, -1), (6, 1, 1)),
+        "behind": ((-6, -1, -1), (-5, 1, 1)),
+        "to the right": ((5, -1, 20), (6, 1, 21)),
+        "above": ((5, 20, -1), (6, 21, 1)),
+        "across the near plane": ((0.5, -0.1, -0.1), (1.5, 0.1, 0.1)),
+        "across the edge": ((5, -1, 4), (6, 1, 8)),
+        "beyond the far plane": ((150, -1, -1), (151, 1, 1)),
+    }
+    minimums, maximums = (np.array(corners, dtype=np.float64) for corners in zip(*boxes.values()))
+    visible = dict(zip(boxes, camera.boxes_visible(minimums, maximums)))
+    assert visible == {
+        "ahead": True,
+        "behind": False,
+        "to the right": False,
+        "above": False,
+        "across the near plane": True,
+        "across the edge": True,
+        "beyond the far plane": False,
+    }
+
+
+def test_boxes_beyond_the_distance_limit_are_culled():
+    camera = forward_camera()
+    visible = camera.boxes_visible([(5, -1, -1), (50, -1, -1)], [(6, 1, 1), (51, 1, 1)], max_distance=20)
+    assert list(visible) == [True, False]
@@ -0,0 +1,120 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+import pytest
+
+from src.game import chunk_generator
+from src.game.block_registry import BlockRegistry
+from src.game.chunk import Chunk
+from src.game.chunk_generator import MAX_ATTEMPTS, ChunkGenerator
+
+
+@pytest.fixture
+def threaded_generator():
+    """A generator whose workers are threads of this process, so the worker function can be replaced."""
+    generator = ChunkGenerator(seed=4, workers=1)
+    generator._executor.shutdown()
+    generator._executor = ThreadPoolExecutor(1)
+    yield generator
+    generator.close()
+    chunk_generator._close_attached_buffers()
+
+
+def poll_until_idle(generator):
+    finished = []
+    for _ in range(20):
+        finished += generator.poll()
+        if generator.pending() == 0:
+            break
+        wait([future for _, future in generator._in_flight.values()], timeout=5)
+    return finished
+
+
+def test_inline_generation_is_nearest_first():
+    generator = ChunkGenerator(seed=4, workers=0)
+    generator.set_focus((0, 0, 0))
+    for position in [(64, 0, 0), (0, 0, 0), (-16, 0, 0)]:
+        generator.request(position)
+    generator.cancel((64, 0, 0))
+    assert [chunk.position for chunk in generator.poll(max_chunks=1)] == [(0, 0, 0)]
+    assert [chunk.position for chunk in generator.poll()] == [(-16, 0, 0)]
+    assert generator.pending() == 0
+
+
+def test_workers_write_chunks_through_shared_memory(threaded_generator):
+    threaded_generator.request((16, 0, -16))
+    (chunk,) = poll_until_idle(threaded_generator)
+    assert np.array_equal(chunk.block_ids(), Chunk((16, 0, -16), 4).block_ids())
+    assert len(threaded_generator._free_slots) == 2
+
+
+def test_workers_generate_with_the_generator_registry(monkeypatch):
+    registry = BlockRegistry()
+    for name in ("glass", "stone", "air", "dirt"):
+        registry.register(name, None if name == "air" else f"{name}.png")
+    generator = ChunkGenerator(seed=4, workers=1, registry=registry)
+    generator._executor.shutdown()
+    # Threads share this module's globals, so keep the registry the initializer replaces
+    monkeypatch.setattr(chunk_generator, "_registry", chunk_generator._registry)
+    (worker_registry,) = pickle.loads(pickle.dumps((registry,)))
+    generator._executor = ThreadPoolExecutor(1, initializer=chunk_generator._initialize_worker,
+                                             initargs=(worker_registry,))
+    try:
+        generator.request((0, 0, 0))
+        (chunk,) = poll_until_idle(generator)
+    finally:
+        generator.close()
+        chunk_generator._close_attached_buffers()
+    expected = ChunkGenerator(seed=4, workers=0, registry=registry)
+    expected.request((0, 0, 0))
+    assert np.array_equal(chunk.block_ids(), expected.poll()[0].block_ids())
+    assert chunk.palette == [registry[name] for name in ("stone", "air", "dirt")]
+
+
+def test_failed_generation_frees_its_slot_and_is_retried(threaded_generator, monkeypatch):
+    calls = []
+
+    def failing(position, seed, buffer_name, slot):
+        calls.append(position)
+        raise RuntimeError("worker crashed")
+
+    monkeypatch.setattr(chunk_generator, "_generate_into_slot", failing)
+    threaded_generator.request((0, 0, 0))
+    assert poll_until_idle(threaded_generator) == []
+    assert calls == [(0, 0, 0)] * MAX_ATTEMPTS
+    assert isinstance(threaded_generator.failed[(0, 0, 0)], RuntimeError)
+    assert len(threaded_generator._free_slots) == 2
+
+    # Later requests still get a slot
+    monkeypatch.undo()
+    threaded_generator.request((0, 0, 0))
+    assert [chunk.position for chunk in poll_until_idle(threaded_generator)] == [(0, 0, 0)]
+    assert threaded_generator.failed == {}
+
+
+def test_broken_pool_is_replaced(threaded_generator):
+    def failing_initializer():
+        raise RuntimeError("worker died")
+
+    # A pool whose worker never starts breaks on the first request, as one with a killed worker does
+    threaded_generator._executor.shutdown()
+    threaded_generator._executor = ThreadPoolExecutor(1, initializer=failing_initializer)
+    threaded_generator._create_executor = lambda: ThreadPoolExecutor(1)
+    threaded_generator.request((0, 0, 0))
+    threaded_generator.request((16, 0, 0))
+
+    finished = poll_until_idle(threaded_generator)
+    assert sorted(chunk.position for chunk in finished) == [(0, 0, 0), (16, 0, 0)]
+    assert threaded_generator.failed == {}
+    assert len(threaded_generator._free_slots) == 2
+
+
+def test_worker_closes_the_segments_it_attached(threaded_generator):
+    threaded_generator.request((0, 0, 0))
+    poll_until_idle(threaded_generator)
+    (attached,) = chunk_generator._attached_buffers.values()
+    chunk_generator._close_attached_buffers()
+    assert chunk_generator._attached_buffers == {}
+    with pytest.raises((TypeError, ValueError)):
+        attached.buf[0]
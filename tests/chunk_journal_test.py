@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from src.game.block_registry import AIR, STONE
+from src.game.chunk import Chunk
+from src.game.chunk_journal import ChangeJournal
+
+
+def edits(start, count):
+    """Positions (n, 0, 0) for n in [start, start + count), so entries can be told apart."""
+    return np.stack([np.arange(start, start + count), np.zeros(count, int), np.zeros(count, int)], axis=1)
+
+
+def test_changes_are_read_in_order_from_a_cursor():
+    journal = ChangeJournal(capacity=8)
+    journal.record(edits(0, 3), 0, 1, tick=5)
+    changes, cursor = journal.changes_since(0)
+    assert list(changes["x"]) == [0, 1, 2]
+    assert set(changes["tick"]) == {5}
+    assert cursor == 3
+
+    journal.record(edits(3, 2), [1, 2], [3, 4], tick=6)
+    changes, cursor = journal.changes_since(cursor)
+    assert list(changes["x"]) == [3, 4]
+    assert list(changes["old_id"]) == [1, 2] and list(changes["new_id"]) == [3, 4]
+    assert journal.changes_since(cursor)[0].size == 0
+
+
+def test_ring_buffer_wraps_around_and_reports_overflow():
+    journal = ChangeJournal(capacity=4)
+    journal.record(edits(0, 3), 0, 1, tick=0)
+    assert journal.tail == 0
+    journal.record(edits(3, 3), 0, 1, tick=1)
+    # Six edits in a journal of four: the first two were overwritten
+    assert (journal.head, journal.tail) == (6, 2)
+    changes, _ = journal.changes_since(2)
+    assert list(changes["x"]) == [2, 3, 4, 5]
+    assert journal.changes_since(1) == (None, 6)
+
+    # A batch larger than the journal keeps only its last edits
+    journal.record(edits(10, 7), 0, 1, tick=2)
+    assert journal.tail == 9
+    assert list(journal.changes_since(9)[0]["x"]) == [13, 14, 15, 16]
+
+
+def test_subscribers_read_independently():
+    journal = ChangeJournal(capacity=4)
+    assert journal.consume("mesh") is None
+    journal.record(edits(0, 2), 0, 1, tick=0)
+    assert journal.consume("network") is None
+    assert list(journal.consume("mesh")["x"]) == [0, 1]
+    journal.record(edits(2, 1), 0, 1, tick=0)
+    assert list(journal.consume("mesh")["x"]) == [2]
+    assert list(journal.consume("network")["x"]) == [2]
+
+    journal.record(edits(3, 5), 0, 1, tick=0)
+    assert journal.consume("mesh") is None
+    assert journal.consume("mesh").size == 0
+
+
+def test_invalidated_journal_has_every_cursor_rebuild():
+    journal = ChangeJournal(capacity=4)
+    journal.record(edits(0, 2), 0, 1, tick=0)
+    journal.consume("mesh")
+    cursor = journal.head
+    journal.invalidate()
+    assert journal.changes_since(cursor)[0] is None
+    assert journal.consume("mesh") is None
+
+    # Edits after the invalidation are replayed as usual
+    journal.record(edits(2, 1), 0, 1, tick=0)
+    assert list(journal.consume("mesh")["x"]) == [2]
+    assert journal.changes_since(journal.head)[0].size == 0
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        ChangeJournal(capacity=0)
+
+
+def test_chunk_journals_each_changed_position_once():
+    chunk = Chunk((0, 0, 0))
+    chunk.fill_region(AIR)
+    cursor = chunk.journal.head
+    chunk.set_blocks([(1, 2, 3), (1, 2, 3), (4, 5, 6), (1, 2, 3)], STONE, tick=9)
+    changes, cursor = chunk.journal.changes_since(cursor)
+    assert sorted(zip(changes["x"], changes["y"], changes["z"])) == [(1, 2, 3), (4, 5, 6)]
+    assert set(changes["old_id"]) == {AIR.id} and set(changes["new_id"]) == {STONE.id}
+
+    # Unchanged positions are not journaled at all
+    chunk.set_blocks([(1, 2, 3), (0, 0, 0), (0, 0, 0)], STONE)
+    changes, _ = chunk.journal.changes_since(cursor)
+    assert list(zip(changes["x"], changes["y"], changes["z"])) == [(0, 0, 0)]
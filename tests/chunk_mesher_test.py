@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+
+from src.game.block_registry import AIR, DIRT, STONE
+from src.game.chunk import Chunk
+from src.rendering.chunk_mesher import MESH_GREEDY, VERTEX_COMPONENTS, build_chunk_mesh
+
+
+def padded_air():
+    return np.full((18, 18, 18), AIR.id, dtype=np.uint16)
+
+
+def face_count(mesh):
+    return len(mesh) // 6
+
+
+def test_empty_chunk_has_no_vertices():
+    mesh = build_chunk_mesh(padded_air())
+    assert mesh.shape == (0, VERTEX_COMPONENTS)
+    assert mesh.dtype == np.float32
+
+
+def test_single_block_emits_six_outward_faces():
+    padded = padded_air()
+    padded[5, 6, 7] = STONE.id
+    mesh = build_chunk_mesh(padded)
+    assert face_count(mesh) == 6
+
+    triangles = mesh[:, :3].reshape(-1, 3, 3)
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    outward = triangles.mean(axis=1) - np.array([4.5, 5.5, 6.5])
+    assert (np.einsum("ij,ij->i", normals, outward) > 0).all()
+    assert (mesh[:, 5] == STONE.id).all()
+
+
+def test_shared_faces_between_blocks_are_culled():
+    padded = padded_air()
+    padded[5, 5, 5] = STONE.id
+    padded[6, 5, 5] = DIRT.id
+    assert face_count(build_chunk_mesh(padded)) == 10
+
+
+def test_faces_against_neighbouring_chunks_are_culled():
+    padded = padded_air()
+    padded[1, 5, 5] = STONE.id
+    assert face_count(build_chunk_mesh(padded)) == 6
+
+    # An opaque voxel in the neighbouring chunk hides the face on the chunk border
+    padded[0, 5, 5] = STONE.id
+    assert face_count(build_chunk_mesh(padded)) == 5
+
+
+def test_border_voxels_are_not_meshed():
+    padded = padded_air()
+    padded[0, 5, 5] = STONE.id
+    assert face_count(build_chunk_mesh(padded)) == 0
+
+
+def test_solid_chunk_only_meshes_its_surface():
+    padded = padded_air()
+    padded[1:-1, 1:-1, 1:-1] = STONE.id
+    mesh = build_chunk_mesh(padded)
+    assert face_count(mesh) == 6 * 16 * 16
+    assert mesh[:, :3].min() == 0 and mesh[:, :3].max() == 16
+
+
+def test_texture_layers_are_mapped():
+    padded = padded_air()
+    padded[5, 5, 5] = DIRT.id
+    layers = np.zeros(3, dtype=np.float32)
+    layers[DIRT.id] = 7
+    assert (build_chunk_mesh(padded, layers=layers)[:, 5] == 7).all()
+
+
+def triangle_areas(mesh):
+    triangles = mesh[:, :3].reshape(-1, 3, 3)
+    return 0.5 * np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1)
+
+
+def test_greedy_mesh_merges_a_flat_layer_into_one_quad_per_side():
+    padded = padded_air()
+    padded[1:-1, 1, 1:-1] = STONE.id
+    mesh = build_chunk_mesh(padded, mode=MESH_GREEDY)
+    assert face_count(mesh) == 6
+
+    # Texture coordinates span the quad in blocks so the texture repeats once per block
+    top = mesh[mesh[:, 1] == 1]
+    assert top[:, 3].max() == 16 and top[:, 4].max() == 16
+
+
+def test_greedy_mesh_keeps_block_types_apart():
+    padded = padded_air()
+    padded[1:-1, 1, 1:-1] = STONE.id
+    padded[1:9, 1, 1:-1] = DIRT.id
+    mesh = build_chunk_mesh(padded, mode=MESH_GREEDY)
+    assert face_count(mesh[mesh[:, 5] == DIRT.id]) == 5
+    assert face_count(mesh[mesh[:, 5] == STONE.id]) == 5
+    assert triangle_areas(mesh[mesh[:, 5] == DIRT.id]).sum() == pytest.approx(2 * 8 * 16 + 2 * 8 + 16)
+
+
+def test_greedy_mesh_covers_the_same_surface_as_the_naive_mesh():
+    rng = np.random.default_rng(3)
+    padded = rng.choice([AIR.id, AIR.id, STONE.id, DIRT.id], size=(18, 18, 18)).astype(np.uint16)
+    naive = build_chunk_mesh(padded)
+    greedy = build_chunk_mesh(padded, mode=MESH_GREEDY)
+    assert len(greedy) <= len(naive)
+    for block_id in (STONE.id, DIRT.id):
+        assert triangle_areas(greedy[greedy[:, 5] == block_id]).sum() == pytest.approx(
+            triangle_areas(naive[naive[:, 5] == block_id]).sum()
+        )
+
+
+def test_unknown_mesh_mode_is_rejected():
+    with pytest.raises(ValueError):
+        build_chunk_mesh(padded_air(), mode="marching")
+
+
+def test_faces_are_lit_by_the_cell_they_face():
+    padded = padded_air()
+    padded[5, 5, 5] = STONE.id
+    light = np.full(padded.shape, 15, dtype=np.uint8)
+    light[6, 5, 5] = 0
+
+    lit = build_chunk_mesh(padded, light=light)
+    unlit = build_chunk_mesh(padded)
+    # Only the +x face, which faces the dark cell, gets darker
+    darker = lit[:, 6] < unlit[:, 6]
+    assert darker.sum() == 6
+    assert np.allclose(lit[darker][:, 0], 5)
+
+
+def test_greedy_mesh_keeps_light_levels_apart():
+    padded = padded_air()
+    padded[1:-1, 1, 1:-1] = STONE.id
+    light = np.full(padded.shape, 15, dtype=np.uint8)
+    light[1:9, 2, 1:-1] = 10
+
+    mesh = build_chunk_mesh(padded, mode=MESH_GREEDY, light=light)
+    quads = mesh.reshape(-1, 6, VERTEX_COMPONENTS)
+    top = quads[np.isclose(quads[:, :, 1], 1).all(axis=1)]
+    assert len(top) == 2
+    assert len(np.unique(top[:, 0, 6])) == 2
+
+
+def test_downsampled_mesh_covers_the_chunk_border_with_skirts():
+    chunk = Chunk((0, 0, 0))
+    chunk.fill_region(AIR)
+    chunk.fill_region(STONE, y=slice(0, 8))
+    padded = np.pad(chunk.lod_block_ids(4), 1, constant_values=AIR.id)
+
+    mesh = build_chunk_mesh(padded, mode=MESH_GREEDY, scale=4)
+    positions = mesh[:, :3]
+    assert positions.min(axis=0).tolist() == [0, 0, 0]
+    assert positions.max(axis=0).tolist() == [16, 8, 16]
+
+    # Every border face is kept, so the skirts cover the whole solid part of each side
+    areas = triangle_areas(mesh)
+    for axis, side, area in [(0, 0, 128), (0, 16, 128), (2, 0, 128), (2, 16, 128), (1, 0, 256), (1, 8, 256)]:
+        triangles = positions.reshape(-1, 3, 3)[:, :, axis]
+        assert np.isclose(areas[(triangles == side).all(axis=1)].sum(), area)
@@ -0,0 +1,99 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from src.game.block_registry import AIR, DIRT, STONE
+from src.game.chunk import Chunk
+from src.game.chunk_serializer import (
+    MODE_PACKED,
+    MODE_RLE,
+    MODE_SINGLE,
+    HEADER,
+    bits_per_index,
+    deserialize_chunk,
+    pack_bits,
+    serialize_chunk,
+    unpack_bits,
+)
+
+
+def round_trip(chunk):
+    data = serialize_chunk(chunk)
+    restored = deserialize_chunk(data, chunk.position, chunk.seed)
+    assert np.array_equal(restored.block_ids(), chunk.block_ids())
+    return data
+
+
+def encoding_mode(data):
+    return HEADER.unpack_from(data, 0)[2]
+
+
+def filled_chunk(block_type):
+    chunk = Chunk((0, 0, 0))
+    chunk.fill_region(block_type)
+    return chunk
+
+
+@pytest.mark.parametrize("block_type", [AIR, STONE])
+def test_single_block_chunk_encodes_to_a_few_bytes(block_type):
+    data = round_trip(filled_chunk(block_type))
+    assert encoding_mode(data) == MODE_SINGLE
+    assert len(data) < 16
+
+
+def test_generated_terrain_round_trips():
+    for seed in range(3):
+        chunk = Chunk((16 * seed, 0, -16), seed)
+        round_trip(chunk)
+
+
+def test_random_noise_is_bit_packed():
+    chunk = Chunk((0, 0, 0))
+    rng = np.random.default_rng(1)
+    chunk.load_block_ids(rng.choice([AIR.id, DIRT.id, STONE.id], size=(16, 16, 16)).astype(np.uint16))
+    data = round_trip(chunk)
+    assert encoding_mode(data) == MODE_PACKED
+    # Three block types need two bits per voxel
+    assert len(data) < 16 * 16 * 16 * 2 // 8 + 32
+
+
+def test_layered_chunk_uses_run_length_encoding():
+    chunk = filled_chunk(AIR)
+    chunk.fill_region(STONE, y=slice(0, 4))
+    chunk.fill_region(DIRT, y=slice(4, 5))
+    data = round_trip(chunk)
+    assert encoding_mode(data) == MODE_RLE
+    assert len(data) < len(pickle.dumps(chunk.blocks)) // 10
+
+
+def test_stale_palette_entries_are_dropped():
+    chunk = filled_chunk(STONE)
+    chunk.set_block(1, 2, 3, DIRT)
+    chunk.set_block(1, 2, 3, STONE)
+    assert len(chunk.palette) > 1
+    assert encoding_mode(round_trip(chunk)) == MODE_SINGLE
+
+
+def test_deserialize_accepts_memoryview():
+    chunk = Chunk((0, 0, 0), 7)
+    data = bytearray(b"prefix" + serialize_chunk(chunk))
+    restored = deserialize_chunk(memoryview(data)[6:], chunk.position)
+    assert np.array_equal(restored.block_ids(), chunk.block_ids())
+
+
+def test_deserialize_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        deserialize_chunk(b"not a chunk at all", (0, 0, 0))
+
+
+@pytest.mark.parametrize("bits", [1, 2, 3, 5, 8, 11, 16])
+def test_pack_bits_round_trip(bits):
+    values = np.random.default_rng(bits).integers(0, 1 << bits, size=4096).astype(np.uint16)
+    packed = pack_bits(values, bits)
+    assert len(packed) == 4096 * bits // 8
+    assert np.array_equal(unpack_bits(packed, bits, 4096), values)
+
+
+def test_bits_per_index():
+    assert [bits_per_index(size) for size in (1, 2, 3, 4, 5, 256, 257)] == [1, 1, 2, 2, 3, 8, 9]
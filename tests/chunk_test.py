@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from src.game.block import Block
+from src.game.block_registry import AIR, DIRT, GLOWSTONE, STONE, BlockRegistry
+from src.game.chunk import Chunk
+from src.game.chunk_journal import DirtyFlag
+
+SIZE = Chunk.CHUNK_SIZE
+
+
+def chunk_of(block_ids):
+    return Chunk((0, 0, 0), block_ids=np.asarray(block_ids, dtype=np.uint16))
+
+
+def air_ids():
+    return np.full((SIZE,) * 3, AIR.id, dtype=np.uint16)
+
+
+def test_loaded_ids_are_remapped_to_a_palette_of_the_types_present():
+    block_ids = air_ids()
+    block_ids[0, 0, 0] = GLOWSTONE.id
+    block_ids[1:3, :, :] = STONE.id
+    chunk = chunk_of(block_ids)
+
+    assert chunk.palette == [AIR, STONE, GLOWSTONE]
+    assert chunk.palette_ids().tolist() == [AIR.id, STONE.id, GLOWSTONE.id]
+    assert chunk.blocks.dtype == np.uint16
+    assert chunk.blocks[0, 0, 0] == 2 and chunk.blocks[1, 0, 0] == 1 and chunk.blocks[5, 5, 5] == 0
+    assert np.array_equal(chunk.block_ids(), block_ids)
+    assert chunk.get_block(0, 0, 0) is GLOWSTONE
+
+    # Reloading drops types no longer present and restarts the dirty state and journal
+    chunk.clear_dirty(DirtyFlag.ALL)
+    chunk.set_block(5, 5, 5, DIRT)
+    cursor = chunk.journal.head
+    chunk.load_block_ids(np.full((SIZE,) * 3, DIRT.id))
+    assert chunk.palette == [DIRT]
+    assert chunk.dirty == DirtyFlag.ALL
+    assert chunk.journal.changes_since(cursor)[0] is None
+
+
+def test_palette_grows_as_new_types_are_set():
+    chunk = chunk_of(air_ids())
+    assert chunk.palette == [AIR]
+    chunk.set_block(1, 2, 3, STONE)
+    chunk.set_block(4, 5, 6, STONE)
+    chunk.set_block(7, 8, 9, Block((7, 8, 9), "dirt"))
+    assert chunk.palette == [AIR, STONE, DIRT]
+    assert chunk.palette_index(GLOWSTONE) == 3
+    assert chunk.palette_ids().tolist() == [AIR.id, STONE.id, DIRT.id, GLOWSTONE.id]
+    assert chunk.get_block(7, 8, 9) is DIRT and chunk.get_block(4, 5, 6) is STONE
+    assert chunk.block_ids()[1, 2, 3] == STONE.id
+
+    # Setting a type back to air leaves the palette as it is
+    chunk.set_block(1, 2, 3, AIR)
+    assert len(chunk.palette) == 4
+
+
+def test_set_block_rejects_bad_arguments():
+    chunk = chunk_of(air_ids())
+    with pytest.raises(ValueError):
+        chunk.set_block(16, 0, 0, STONE)
+    with pytest.raises(ValueError):
+        chunk.set_block(0, -1, 0, STONE)
+    with pytest.raises(ValueError):
+        chunk.set_block(0, 0, 0, "stone")
+    assert chunk.get_block(16, 0, 0) is None
+
+
+def test_palette_is_bounded():
+    registry = BlockRegistry()
+    block_types = [registry.register(f"type {index}", None) for index in range(4)]
+    chunk = Chunk((0, 0, 0), registry=registry, block_ids=np.zeros((SIZE,) * 3, dtype=np.uint16))
+    chunk.MAX_PALETTE_SIZE = 3
+    chunk.set_block(0, 0, 0, block_types[1])
+    chunk.set_block(0, 0, 1, block_types[2])
+    with pytest.raises(ValueError):
+        chunk.set_block(0, 0, 2, block_types[3])
+
+
+def test_lod_cells_are_opaque_when_at_least_half_of_them_is():
+    block_ids = air_ids()
+    block_ids[0:2, 0:2, 0] = STONE.id  # 4 of 8: opaque
+    block_ids[2:4, 0, 0:2] = STONE.id  # 3 of 8: air
+    block_ids[3, 0, 1] = AIR.id
+    block_ids[4:6, 0:2, 0:2] = DIRT.id  # 4 dirt, 2 stone, 2 air: the commonest opaque type
+    block_ids[4, 0, 0:2] = STONE.id
+    block_ids[5, 1, 0:2] = AIR.id
+    block_ids[6:8, 0:2, 0:2] = GLOWSTONE.id
+
+    lod = chunk_of(block_ids).lod_block_ids(2)
+    assert lod.shape == (8, 8, 8)
+    assert lod.dtype == np.uint16
+    assert lod[0, 0, 0] == STONE.id
+    assert lod[1, 0, 0] == AIR.id
+    assert lod[2, 0, 0] == DIRT.id
+    assert lod[3, 0, 0] == GLOWSTONE.id
+    assert (lod[4:, :, :] == AIR.id).all()
+
+
+def test_lod_of_terrain_keeps_its_materials_at_every_factor():
+    chunk = Chunk((0, 0, 0), seed=2)
+    assert np.array_equal(chunk.lod_block_ids(1), chunk.block_ids())
+    for factor in Chunk.LOD_FACTORS[1:]:
+        lod = chunk.lod_block_ids(factor)
+        assert lod.shape == (SIZE // factor,) * 3
+        assert set(np.unique(lod)) <= set(np.unique(chunk.block_ids()))
+
+
+def test_unknown_lod_factor_is_rejected():
+    with pytest.raises(ValueError):
+        chunk_of(air_ids()).lod_block_ids(3)
@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.game.block_registry import AIR, GLOWSTONE, STONE
+from src.rendering.chunk_visibility import FULLY_CONNECTED, face_connectivity, potentially_visible
+
+SIZE = 16
+# Face indices in FACE_DIRECTIONS order
+POS_X, NEG_X, POS_Y, NEG_Y, POS_Z, NEG_Z = range(6)
+
+
+def filled(block_type):
+    return np.full((SIZE,) * 3, block_type.id, dtype=np.uint16)
+
+
+def test_solid_chunk_connects_no_faces():
+    assert not face_connectivity(filled(STONE)).any()
+    assert not face_connectivity(filled(GLOWSTONE)).any()
+
+
+def test_air_chunk_connects_every_face():
+    assert np.array_equal(face_connectivity(filled(AIR)), FULLY_CONNECTED)
+
+
+def test_wall_splits_the_faces_on_either_side():
+    block_ids = filled(AIR)
+    block_ids[8, :, :] = STONE.id
+    connectivity = face_connectivity(block_ids)
+    assert np.array_equal(connectivity, connectivity.T)
+    assert not connectivity[POS_X, NEG_X]
+    # Both halves reach the faces running along the wall
+    for face in (POS_Y, NEG_Y, POS_Z, NEG_Z):
+        assert connectivity[POS_X, face] and connectivity[NEG_X, face]
+
+
+def test_winding_tunnel_connects_only_its_ends():
+    block_ids = filled(STONE)
+    block_ids[:9, 4, 4] = AIR.id  # From the -x face to the middle
+    block_ids[8, 4, 4:] = AIR.id  # Then out of the +z face
+    connectivity = face_connectivity(block_ids)
+    assert connectivity[NEG_X, POS_Z] and connectivity[POS_Z, NEG_X]
+    assert connectivity.sum() == 4  # The two ends, each also connected to itself
+    assert not connectivity[NEG_X, POS_X]
+
+
+def within(radius):
+    return lambda coords: all(abs(value) <= radius for value in coords)
+
+
+def test_search_reaches_every_chunk_through_open_space():
+    visible = potentially_visible((0, 0, 0), lambda coords: FULLY_CONNECTED, within(2))
+    assert len(visible) == 5 ** 3
+
+
+def test_chunks_behind_a_solid_shell_are_not_visible():
+    def connectivity(coords):
+        shell = max(abs(value) for value in coords) == 1
+        return np.zeros((6, 6), dtype=bool) if shell else FULLY_CONNECTED
+
+    visible = potentially_visible((0, 0, 0), connectivity, within(3))
+    # Sight stops at the shell's faces: only the six chunks sharing a face with the start are reached
+    assert visible == {(0, 0, 0), (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)}
+
+
+def test_search_does_not_turn_back():
+    # A chunk seen past a wall to the +x can only be reached by going around it, which needs a -z step after +z
+    wall = np.zeros((6, 6), dtype=bool)
+
+    def connectivity(coords):
+        return wall if coords == (1, 0, 0) else FULLY_CONNECTED
+
+    def flat(coords):
+        return coords[1] == 0 and all(abs(value) <= 3 for value in coords)
+
+    visible = potentially_visible((0, 0, 0), connectivity, flat)
+    assert (1, 0, 0) in visible
+    assert (2, 0, 0) not in visible
+    assert (2, 0, 1) in visible
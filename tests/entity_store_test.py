@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from src.game.block_registry import AIR, DIRT, STONE
+from src.game.chunk import Chunk
+from src.game.chunk_index import CHANGE_HISTORY, ChunkIndex
+from src.physics.entity_store import DEFAULT_FLAGS, EntityFlag, EntityStore
+
+SIZE = Chunk.CHUNK_SIZE
+
+
+def test_store_grows_and_reuses_removed_rows():
+    store = EntityStore(capacity=1)
+    first = store.add((0, 0, 0), (1, 1, 1))
+    second = store.add((1, 2, 3), (1, 1, 1), velocity=(0, -1, 0))
+    assert (first, second) == (0, 1)
+    assert np.array_equal(store.position[second], (1, 2, 3))
+    assert store.has_flags(second, DEFAULT_FLAGS | EntityFlag.ALIVE)
+
+    store.remove(first)
+    assert len(store) == 1
+    assert list(store.alive()) == [second]
+    assert store.add((5, 5, 5), (1, 1, 1)) == first
+    with pytest.raises(ValueError):
+        store.remove(7)
+
+
+def test_add_many_appends_entities_with_shared_size():
+    store = EntityStore(capacity=2)
+    store.add((0, 0, 0), (1, 1, 1))
+    indices = store.add_many(np.arange(15.0).reshape(5, 3), (0.5, 0.5, 0.5), flags=EntityFlag.GRAVITY)
+    assert list(indices) == [1, 2, 3, 4, 5]
+    assert np.array_equal(store.position[3], (6, 7, 8))
+    assert np.all(store.size[indices] == 0.5)
+    assert not store.has_flags(3, EntityFlag.COLLIDES)
+
+    store.set_flags(3, EntityFlag.JUMPING)
+    assert store.has_flags(3, EntityFlag.JUMPING | EntityFlag.ALIVE)
+    store.set_flags(3, EntityFlag.JUMPING, False)
+    assert not store.has_flags(3, EntityFlag.JUMPING)
+
+
+def test_chunk_index_matches_the_chunks():
+    chunks = {coords: Chunk(tuple(value * SIZE for value in coords), seed=3) for coords in [(0, 0, 0), (1, 0, -1), (-2, 1, 0)]}
+    index = ChunkIndex(chunks)
+    cells = np.random.default_rng(0).integers(-3 * SIZE, 2 * SIZE, (5000, 3))
+
+    expected = [
+        chunks[coords].get_block(*(int(value) for value in cell % SIZE)).id if coords in chunks else AIR.id
+        for cell, coords in zip(cells, map(tuple, cells // SIZE))
+    ]
+    assert np.array_equal(index.get_blocks(cells), expected)
+    assert np.array_equal(index.get_blocks(cells + 0.5), expected)
+    assert np.all(index.get_blocks(cells + 100 * SIZE, default=DIRT.id) == DIRT.id)
+
+
+def test_chunk_index_follows_reported_edits_and_unloads():
+    chunks = {(0, 0, 0): Chunk((0, 0, 0), block_ids=np.zeros((SIZE,) * 3, dtype=np.uint16))}
+    index = ChunkIndex(chunks)
+    assert index.get_blocks([(3, 4, 5)])[0] == AIR.id
+
+    chunks[(0, 0, 0)].set_block(3, 4, 5, STONE)
+    chunks[(0, -1, 0)] = Chunk((0, -SIZE, 0), block_ids=np.full((SIZE,) * 3, DIRT.id, dtype=np.uint16))
+    index.mark_dirty((0, 0, 0))
+    index.mark_dirty((0, -1, 0))
+    assert list(index.get_blocks([(3, 4, 5), (0, -1, 0)])) == [STONE.id, DIRT.id]
+
+    del chunks[(0, 0, 0)]
+    index.mark_dirty((0, 0, 0))
+    assert list(index.get_blocks([(3, 4, 5), (0, -1, 0)])) == [AIR.id, DIRT.id]
+    chunks.clear()
+    index.mark_dirty((0, -1, 0))
+    assert list(index.get_blocks([(0, -1, 0)])) == [AIR.id]
+
+
+def test_chunk_index_only_copies_reported_chunks():
+    chunks = {(x, 0, 0): Chunk((x * SIZE, 0, 0), block_ids=np.zeros((SIZE,) * 3, dtype=np.uint16)) for x in range(4)}
+    index = ChunkIndex(chunks)
+    index.refresh()
+
+    # An unreported edit is not seen, because lookups do not walk the loaded chunks
+    chunks[(1, 0, 0)].set_block(0, 0, 0, STONE)
+    chunks[(2, 0, 0)].set_block(0, 0, 0, STONE)
+    index.mark_dirty((2, 0, 0))
+    assert list(index.get_blocks([(SIZE, 0, 0), (2 * SIZE, 0, 0)])) == [AIR.id, STONE.id]
+
+
+def test_chunk_index_air_boxes_never_hide_a_block():
+    rng = np.random.default_rng(1)
+    chunks = {}
+    for coords in [(0, 0, 0), (-1, 0, 0), (0, -1, 1)]:
+        block_ids = np.zeros((SIZE,) * 3, dtype=np.uint16)
+        block_ids[tuple(rng.integers(0, SIZE, (3, 4)))] = STONE.id
+        chunks[coords] = Chunk(tuple(value * SIZE for value in coords), block_ids=block_ids)
+    index = ChunkIndex(chunks)
+    minimums = rng.integers(-2 * SIZE, 2 * SIZE, (2000, 3))
+    maximums = minimums + rng.integers(1, 6, (2000, 3))
+
+    air = index.air_boxes(minimums, maximums)
+    for low, high, reported in zip(minimums, maximums, air):
+        cells = np.stack(np.meshgrid(*map(np.arange, low, high), indexing="ij"), axis=-1).reshape(-1, 3)
+        if reported:
+            assert np.all(index.get_blocks(cells) == AIR.id)
+    # Most small boxes in these nearly empty chunks, or outside them, are recognized as air
+    assert air.mean() > 0.5
+    assert not index.air_boxes([(0, 0, 0)], [(9, 1, 1)])[0]
+
+
+def test_chunk_index_replays_chunk_journals():
+    chunk = Chunk((0, 0, 0), block_ids=np.zeros((SIZE,) * 3, dtype=np.uint16))
+    index = ChunkIndex({(0, 0, 0): chunk})
+    index.refresh()
+    full_copies = []
+    block_ids = chunk.block_ids
+    chunk.block_ids = lambda: full_copies.append(1) or block_ids()
+
+    chunk.set_block(1, 2, 3, STONE)
+    chunk.set_blocks([(1, 2, 3), (9, 9, 9)], DIRT)
+    chunk.set_block(9, 9, 9, AIR)
+    index.mark_dirty((0, 0, 0))
+    assert index.get_blocks([(1, 2, 3), (9, 9, 9), (0, 0, 0)]).tolist() == [DIRT.id, AIR.id, AIR.id]
+    assert full_copies == []
+    # The brick whose only block was removed is clear again
+    assert index.air_boxes([(8, 8, 8), (0, 0, 0)], [(12, 12, 12), (4, 4, 4)]).tolist() == [True, False]
+
+    # Edits the journal no longer holds, or a reload it cannot replay, are caught up by copying the chunk
+    chunk.fill_region(STONE)
+    chunk.fill_region(AIR, x=slice(0, 8))
+    index.mark_dirty((0, 0, 0))
+    index.refresh()
+    assert np.array_equal(index.blocks[0], block_ids())
+    chunk.load_block_ids(np.full((SIZE,) * 3, DIRT.id))
+    index.mark_dirty((0, 0, 0))
+    assert index.get_blocks([(0, 0, 0)]).tolist() == [DIRT.id]
+    assert len(full_copies) == 2
+
+
+def test_chunk_index_reports_changed_chunks():
+    chunks = {(x, 0, 0): Chunk((x * SIZE, 0, 0), block_ids=np.zeros((SIZE,) * 3, dtype=np.uint16)) for x in range(3)}
+    index = ChunkIndex(chunks)
+    version, changed = index.changed_chunks(None)
+    assert changed is None
+    assert index.changed_chunks(version) == (version, set())
+
+    chunks[(1, 0, 0)].set_block(1, 2, 3, STONE)
+    index.mark_dirty((1, 0, 0))
+    # A chunk reported without any edits did not change
+    index.mark_dirty((0, 0, 0))
+    middle, changed = index.changed_chunks(version)
+    assert changed == {(1, 0, 0)}
+    del chunks[(2, 0, 0)]
+    index.mark_dirty((2, 0, 0))
+    index.refresh()
+    assert index.changed_chunks(version)[1] == {(1, 0, 0), (2, 0, 0)}
+    assert index.changed_chunks(middle)[1] == {(2, 0, 0)}
+
+    for step in range(CHANGE_HISTORY):
+        chunks[(0, 0, 0)].set_block(0, 0, 0, STONE if step % 2 == 0 else AIR)
+        index.mark_dirty((0, 0, 0))
+        index.refresh()
+    # Changes older than the retained history may have been anything
+    assert index.changed_chunks(version)[1] is None
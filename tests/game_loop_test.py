@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.game.game_loop import FixedTimestep
+from src.physics.entity_store import EntityStore
+
+
+class FakeClock:
+    """A clock that advances only when slept on or stepped by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_ticks_are_fixed_whatever_the_frame_times():
+    timestep = FixedTimestep(tick_rate=10)
+    ticks = []
+    for elapsed in (0.05, 0.03, 0.27, 0.0, 0.15):
+        timestep.advance(elapsed, ticks.append)
+    assert ticks == [0.1] * 5
+    assert timestep.tick_count == 5
+    assert np.isclose(timestep.alpha, 0.0, atol=1e-6)
+
+
+def test_alpha_is_the_unsimulated_fraction_of_a_tick():
+    timestep = FixedTimestep(tick_rate=10)
+    assert np.isclose(timestep.advance(0.125, lambda delta_time: None), 0.25)
+    assert np.isclose(timestep.advance(0.05, lambda delta_time: None), 0.75)
+    with pytest.raises(ValueError):
+        timestep.advance(-1.0, lambda delta_time: None)
+
+
+def test_long_frames_drop_time_instead_of_spiralling():
+    timestep = FixedTimestep(tick_rate=10, max_ticks_per_frame=3)
+    ticks = []
+    timestep.advance(2.05, ticks.append)
+    assert len(ticks) == 3
+    assert np.isclose(timestep.dropped_time, 1.7)
+    assert np.isclose(timestep.alpha, 0.5)
+
+
+def test_headless_loop_waits_for_each_tick():
+    clock = FakeClock()
+    timestep = FixedTimestep(tick_rate=20)
+    ticks = []
+    frames = timestep.run(ticks.append, max_frames=40, clock=clock, sleep=clock.sleep)
+    assert frames == 40
+    assert len(ticks) == 39
+    assert np.allclose(clock.slept, 0.05)
+
+
+def test_frame_cap_and_stop_request():
+    clock = FakeClock()
+    timestep = FixedTimestep(tick_rate=60)
+    alphas = []
+
+    def render(alpha):
+        alphas.append(alpha)
+        clock.now += 0.004
+
+    frames = timestep.run(lambda delta_time: None, render, frame_cap=100, clock=clock, sleep=clock.sleep,
+                          should_stop=lambda: len(alphas) == 50)
+    assert frames == 50
+    assert np.allclose(clock.slept, 0.006)
+    assert all(0 <= alpha < 1 for alpha in alphas)
+    assert timestep.tick_count == int(49 * 0.01 * 60)
+
+
+def test_interpolated_positions_blend_the_last_two_ticks():
+    store = EntityStore()
+    entity = store.add((0, 0, 0), (1, 1, 1))
+    store.save_positions()
+    store.position[entity] = (2, 4, 0)
+    assert np.allclose(store.interpolated_position(0.25, entity), (0.5, 1, 0))
+    assert np.allclose(store.interpolated_position(1.0)[entity], (2, 4, 0))
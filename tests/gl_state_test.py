@@ -0,0 +1,229 @@
+import glm
+import numpy as np
+import pytest
+
+from src.rendering.gl_state import GLState, UniformBuffer
+
+
+class MockGL:
+    """Records every gl* call instead of talking to a driver."""
+
+    GL_FALSE = 0
+    GL_TRUE = 1
+    GL_TEXTURE0 = 0x84C0
+    GL_ARRAY_BUFFER = 0x8892
+    GL_UNIFORM_BUFFER = 0x8A11
+    GL_DYNAMIC_DRAW = 0x88E8
+    GL_TEXTURE_2D_ARRAY = 0x8C1A
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        if not name.startswith("gl"):
+            raise AttributeError(name)
+
+        def record(*args):
+            self.calls.append((name, args))
+            if name == "glGetUniformLocation":
+                return {"model": 0, "light": 1}.get(args[1], -1)
+            if name == "glGenBuffers":
+                return 7
+            return 0
+
+        return record
+
+    def names(self):
+        return [name for name, _ in self.calls]
+
+
+def test_redundant_binds_are_skipped():
+    gl = MockGL()
+    state = GLState(gl)
+
+    for _ in range(3):
+        state.use_program(1)
+        state.bind_vertex_array(2)
+        state.bind_buffer(gl.GL_ARRAY_BUFFER, 3)
+        state.bind_texture(gl.GL_TEXTURE_2D_ARRAY, 4)
+
+    assert gl.names() == ["glUseProgram", "glBindVertexArray", "glBindBuffer", "glActiveTexture", "glBindTexture"]
+    assert state.saved == 8
+
+
+def test_changed_binds_are_issued():
+    gl = MockGL()
+    state = GLState(gl)
+    state.bind_vertex_array(1)
+    state.bind_vertex_array(2)
+    state.bind_vertex_array(1)
+    assert gl.names() == ["glBindVertexArray"] * 3
+
+
+def test_texture_units_are_tracked_separately():
+    gl = MockGL()
+    state = GLState(gl)
+    state.bind_texture(gl.GL_TEXTURE_2D_ARRAY, 4, unit=0)
+    state.bind_texture(gl.GL_TEXTURE_2D_ARRAY, 4, unit=1)
+    state.bind_texture(gl.GL_TEXTURE_2D_ARRAY, 4, unit=0)
+    assert gl.names() == ["glActiveTexture", "glBindTexture", "glActiveTexture", "glBindTexture"]
+    assert gl.calls[2] == ("glActiveTexture", (gl.GL_TEXTURE0 + 1,))
+
+
+def test_uniform_writes_are_deduplicated():
+    gl = MockGL()
+    state = GLState(gl)
+    matrix = glm.translate(glm.mat4(1.0), glm.vec3(1, 2, 3))
+
+    state.set_uniform(1, "model", matrix)
+    state.set_uniform(1, "model", glm.mat4(matrix))
+    state.set_uniform(1, "model", glm.mat4(1.0))
+
+    assert gl.names() == ["glUseProgram", "glGetUniformLocation", "glUniformMatrix4fv", "glUniformMatrix4fv"]
+
+
+def test_missing_uniforms_are_ignored():
+    gl = MockGL()
+    state = GLState(gl)
+    state.set_uniform(1, "missing", 1.0)
+    state.set_uniform(1, "missing", 2.0)
+    assert gl.names() == ["glUseProgram", "glGetUniformLocation"]
+
+
+def test_uniform_values_of_different_types_are_written():
+    gl = MockGL()
+    state = GLState(gl)
+    state.set_uniform(1, "light", 1)
+    state.set_uniform(1, "light", 1.0)
+    state.set_uniform(1, "light", np.array([1], dtype=np.int32))
+    state.set_uniform(1, "light", np.array([1], dtype=np.float32))
+    state.set_uniform(1, "light", np.array([1], dtype=np.float32))
+    assert gl.calls[2:] == [
+        ("glUniform1i", (1, 1)),
+        ("glUniform1f", (1, 1.0)),
+        ("glUniform1iv", gl.calls[4][1]),
+        ("glUniform1fv", gl.calls[5][1]),
+    ]
+    # Besides the repeated array, the program was already current for every write after the first
+    assert (state.issued, state.saved) == (5, 5)
+
+
+def test_invalid_uniform_values_are_rejected_every_time():
+    gl = MockGL()
+    state = GLState(gl)
+    state.set_uniform(1, "light", 0.5)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            state.set_uniform(1, "light", "bright")
+    # The value written before is still known to be in place
+    state.set_uniform(1, "light", 0.5)
+    assert gl.names().count("glUniform1f") == 1
+
+
+def test_numpy_matrices_are_passed_transposed_without_copy():
+    gl = MockGL()
+    state = GLState(gl)
+    matrix = np.arange(16, dtype=np.float32).reshape(4, 4)
+
+    state.set_uniform(1, "model", matrix)
+
+    name, (location, count, transpose, data) = gl.calls[-1]
+    assert name == "glUniformMatrix4fv"
+    assert (location, count, transpose) == (0, 1, gl.GL_TRUE)
+    assert data is matrix
+
+
+def test_numpy_vectors_and_ints():
+    gl = MockGL()
+    state = GLState(gl)
+
+    state.set_uniform(1, "light", np.array([0.5, 0.25, 1.0], dtype=np.float32))
+    assert gl.calls[-1][0] == "glUniform3fv"
+    state.set_uniform(1, "light", np.array([1, 2], dtype=np.int32))
+    assert gl.calls[-1][0] == "glUniform2iv"
+    state.set_uniform(1, "light", 3)
+    assert gl.calls[-1] == ("glUniform1i", (1, 3))
+
+
+def test_uniform_buffer_skips_unchanged_writes():
+    gl = MockGL()
+    state = GLState(gl)
+    buffer = UniformBuffer(state, 128, 0)
+    view = glm.lookAt(glm.vec3(1, 2, 3), glm.vec3(0, 0, 0), glm.vec3(0, 1, 0))
+
+    buffer.write(0, view)
+    buffer.write(0, view)
+    buffer.bind()
+
+    writes = [args for name, args in gl.calls if name == "glBufferSubData"]
+    assert len(writes) == 1
+    assert writes[0][1:3] == (0, 64)
+    assert writes[0][3] == bytes(view)
+    assert gl.names().count("glBindBufferBase") == 1
+
+
+def test_uniform_buffer_writes_are_counted():
+    gl = MockGL()
+    state = GLState(gl)
+    buffer = UniformBuffer(state, 128, 0)
+    state.begin_frame()
+
+    buffer.write(64, np.eye(4))
+    buffer.write(64, np.eye(4))
+
+    # The buffer is still bound from its creation, so only the upload is issued
+    assert (state.issued, state.saved) == (1, 2)
+
+
+def test_deleted_objects_are_forgotten():
+    gl = MockGL()
+    state = GLState(gl)
+    state.bind_vertex_array(2)
+    state.bind_buffer(gl.GL_ARRAY_BUFFER, 3)
+
+    # Other objects stay bound
+    state.forget_vertex_array(5)
+    state.forget_buffer(gl.GL_ARRAY_BUFFER, 6)
+    state.forget_buffer(gl.GL_UNIFORM_BUFFER, 3)
+    state.bind_vertex_array(2)
+    state.bind_buffer(gl.GL_ARRAY_BUFFER, 3)
+    assert gl.names() == ["glBindVertexArray", "glBindBuffer"]
+
+    # The driver may hand a deleted name out again, so binding it must be issued
+    state.forget_vertex_array(2)
+    state.forget_buffer(gl.GL_ARRAY_BUFFER, 3)
+    state.bind_vertex_array(2)
+    state.bind_buffer(gl.GL_ARRAY_BUFFER, 3)
+    assert gl.names() == ["glBindVertexArray", "glBindBuffer"] * 2
+
+
+def test_deleted_uniform_buffer_is_unbound():
+    gl = MockGL()
+    state = GLState(gl)
+    buffer = UniformBuffer(state, 128, 0)
+    buffer.delete()
+    assert state.buffers == {} and state.buffer_bases == {}
+
+    UniformBuffer(state, 128, 0)
+    assert gl.names().count("glBindBufferBase") == 2
+
+
+def test_invalidate_forgets_cached_state():
+    gl = MockGL()
+    state = GLState(gl)
+    state.use_program(1)
+    state.invalidate()
+    state.use_program(1)
+    assert gl.names() == ["glUseProgram", "glUseProgram"]
+
+
+def test_begin_frame_resets_counters():
+    gl = MockGL()
+    state = GLState(gl)
+    state.use_program(1)
+    state.use_program(1)
+
+    state.begin_frame()
+
+    assert state.last_frame == {"issued": 1, "saved": 1}
+    assert (state.issued, state.saved) == (0, 0)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from src.game.block_registry import AIR, DIRT, GLOWSTONE, STONE
+from src.game.chunk import Chunk
+from src.game.lighting import MAX_LIGHT, LightEngine
+
+SIZE = Chunk.CHUNK_SIZE
+
+
+def make_world(layout):
+    """Returns a LightEngine over chunks built from {coords: block IDs}, each lit in turn."""
+    chunks = {}
+    engine = LightEngine(chunks)
+    for coords, block_ids in layout.items():
+        chunks[coords] = Chunk(tuple(value * SIZE for value in coords), block_ids=block_ids)
+        engine.light_chunk(coords)
+    return engine
+
+
+def filled(block_type):
+    return np.full((SIZE,) * 3, block_type.id, dtype=np.uint16)
+
+
+def set_block(engine, x, y, z, block_type):
+    chunk = engine.chunks[(x // SIZE, y // SIZE, z // SIZE)]
+    chunk.set_block(x % SIZE, y % SIZE, z % SIZE, block_type)
+    return engine.update_block(x, y, z)
+
+
+def test_open_chunk_is_in_full_sunlight():
+    engine = make_world({(0, 0, 0): filled(AIR)})
+    chunk = engine.chunks[(0, 0, 0)]
+    assert (chunk.sky_light == MAX_LIGHT).all()
+    assert (chunk.block_light == 0).all()
+
+
+def test_sunlight_travels_down_and_fades_sideways():
+    block_ids = filled(AIR)
+    block_ids[:, 8, :] = STONE.id
+    block_ids[0, 8, 0] = AIR.id
+    engine = make_world({(0, 0, 0): block_ids})
+
+    assert engine.get_light(0, 0, 0) == (MAX_LIGHT, 0)
+    assert engine.get_light(3, 7, 0) == (MAX_LIGHT - 3, 0)
+    assert engine.get_light(5, 8, 5) == (0, 0)
+
+
+def test_placing_a_block_shades_the_column_below():
+    engine = make_world({(0, 0, 0): filled(AIR)})
+    changed = set_block(engine, 4, 10, 4, STONE)
+
+    assert changed == {(0, 0, 0)}
+    assert engine.get_light(4, 9, 4) == (MAX_LIGHT - 1, 0)
+    assert engine.get_light(4, 0, 4) == (MAX_LIGHT - 1, 0)
+
+    set_block(engine, 4, 10, 4, AIR)
+    assert engine.get_light(4, 0, 4) == (MAX_LIGHT, 0)
+
+
+def test_block_light_crosses_chunk_borders():
+    engine = make_world({(0, 0, 0): filled(DIRT), (1, 0, 0): filled(DIRT)})
+    for x in range(10, 20):
+        set_block(engine, x, 5, 5, AIR)
+    changed = set_block(engine, 10, 5, 5, GLOWSTONE)
+
+    assert changed == {(0, 0, 0), (1, 0, 0)}
+    assert engine.get_light(11, 5, 5) == (0, MAX_LIGHT - 1)
+    assert engine.get_light(19, 5, 5) == (0, MAX_LIGHT - 9)
+
+    set_block(engine, 10, 5, 5, AIR)
+    assert all(engine.get_light(x, 5, 5) == (0, 0) for x in range(10, 20))
+
+
+def test_loading_a_neighbour_spreads_light_into_it():
+    block_ids = filled(DIRT)
+    block_ids[SIZE - 1, 5, 5] = GLOWSTONE.id
+    engine = make_world({(0, 0, 0): block_ids})
+    tunnel = filled(DIRT)
+    tunnel[:4, 5, 5] = AIR.id
+
+    chunks = engine.chunks
+    chunks[(1, 0, 0)] = Chunk((SIZE, 0, 0), block_ids=tunnel)
+    engine.light_chunk((1, 0, 0))
+
+    assert engine.get_light(SIZE + 3, 5, 5) == (0, MAX_LIGHT - 4)
+
+
+def test_covering_a_chunk_removes_its_sunlight():
+    engine = make_world({(0, 0, 0): filled(AIR)})
+    chunks = engine.chunks
+    chunks[(0, 1, 0)] = Chunk((0, SIZE, 0), block_ids=filled(STONE))
+    changed = engine.light_chunk((0, 1, 0))
+
+    assert (0, 0, 0) in changed
+    assert (chunks[(0, 0, 0)].sky_light == 0).all()
+
+
+def test_incremental_edits_match_lighting_from_scratch():
+    rng = np.random.default_rng(3)
+    layout = {}
+    for coords in [(0, 0, 0), (1, 0, 0), (0, 0, 1), (1, 0, 1), (0, 1, 0), (1, 1, 1)]:
+        layout[coords] = rng.choice([AIR.id, AIR.id, AIR.id, DIRT.id], size=(SIZE,) * 3).astype(np.uint16)
+    engine = make_world(layout)
+
+    block_types = (AIR, STONE, DIRT, GLOWSTONE)
+    for _ in range(200):
+        coords = list(layout)[rng.integers(len(layout))]
+        local = rng.integers(0, SIZE, size=3)
+        x, y, z = (int(value) for value in np.array(coords) * SIZE + local)
+        set_block(engine, x, y, z, block_types[rng.integers(len(block_types))])
+
+    reference = make_world({coords: chunk.block_ids() for coords, chunk in engine.chunks.items()})
+    for coords, chunk in engine.chunks.items():
+        assert np.array_equal(chunk.sky_light, reference.chunks[coords].sky_light)
+        assert np.array_equal(chunk.block_light, reference.chunks[coords].block_light)
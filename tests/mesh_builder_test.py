@@ -0,0 +1,128 @@
+import threading
+
+import numpy as np
+
+from src.game.block_registry import AIR, STONE
+from src.rendering.mesh_builder import MAX_ATTEMPTS, MeshBuilder
+
+
+def padded_air():
+    return np.full((18, 18, 18), AIR.id, dtype=np.uint16)
+
+
+def one_block():
+    padded = padded_air()
+    padded[5, 6, 7] = STONE.id
+    return padded
+
+
+def test_inline_builder_hands_out_the_latest_request():
+    builder = MeshBuilder(workers=0)
+    builder.request((0, 0, 0), one_block())
+    builder.request((0, 0, 0), padded_air())
+    uploaded = {}
+    assert builder.upload(lambda coords, vertices, connectivity: uploaded.setdefault(coords, vertices)) == 1
+    assert len(uploaded[(0, 0, 0)]) == 0
+    assert builder.pending() == 0
+
+
+def failing_once(builder):
+    """Makes the builder's next build raise, and every later one succeed."""
+    build = builder._build
+    calls = []
+
+    def flaky_build(job):
+        calls.append(job)
+        if len(calls) == 1:
+            raise RuntimeError("mesher crashed")
+        return build(job)
+
+    builder._build = flaky_build
+    return calls
+
+
+def test_failed_inline_build_is_retried():
+    builder = MeshBuilder(workers=0)
+    calls = failing_once(builder)
+    builder.request((0, 0, 0), one_block())
+    builder.poll()
+    assert len(calls) == 2
+    assert (0, 0, 0) in builder._ready
+    assert builder.failed == {}
+
+
+def test_failed_build_does_not_break_later_polls():
+    builder = MeshBuilder(workers=1)
+    calls = failing_once(builder)
+    try:
+        builder.request((0, 0, 0), one_block())
+        builder.request((1, 0, 0), one_block())
+        builder.poll()
+        for _ in range(20):
+            for *_, future in builder._in_flight:
+                future.exception(5)
+            # The failure surfaces here; the next poll dispatches the retry
+            builder.poll()
+            if not builder._in_flight and not builder._queued:
+                break
+        assert len(calls) == 3
+        assert set(builder._ready) == {(0, 0, 0), (1, 0, 0)}
+        assert builder.failed == {} and builder._attempts == {}
+    finally:
+        builder.close()
+
+
+def test_build_failing_every_time_is_given_up_on():
+    builder = MeshBuilder(workers=0)
+    error = RuntimeError("mesher crashed")
+    calls = []
+
+    def failing_build(job):
+        calls.append(job)
+        raise error
+
+    builder._build = failing_build
+    builder.request((0, 0, 0), one_block())
+    builder.poll()
+    assert len(calls) == MAX_ATTEMPTS
+    assert builder.failed == {(0, 0, 0): error}
+    assert builder.pending() == 0
+
+    # A new request for the chunk starts over
+    del builder._build
+    builder.request((0, 0, 0), one_block())
+    builder.poll()
+    assert (0, 0, 0) in builder._ready and builder.failed == {}
+
+
+def test_build_cancelled_while_running_is_not_uploaded_after_a_new_request():
+    builder = MeshBuilder(workers=1)
+    release = threading.Event()
+    build = builder._build
+
+    def held_build(job):
+        release.wait(5)
+        return build(job)
+
+    builder._build = held_build
+    try:
+        builder.request((0, 0, 0), one_block())
+        builder.poll()
+        (_, _, _, stale), = builder._in_flight
+
+        # The chunk is unloaded and reloaded empty while its old mesh is still being built
+        builder.cancel((0, 0, 0))
+        builder.request((0, 0, 0), padded_air())
+        release.set()
+        stale.result(5)
+        builder.poll()
+        assert (0, 0, 0) not in builder._ready
+
+        for *_, future in builder._in_flight:
+            future.result(5)
+        builder.poll()
+        vertices, _ = builder._ready[(0, 0, 0)]
+        assert len(vertices) == 0
+    finally:
+        release.set()
+        builder.close()
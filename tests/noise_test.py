@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.game.noise import PerlinNoise, generate_noise
+
+
+def grid(size=16, origin=(0, 0, 0)):
+    return np.meshgrid(*(np.arange(size) + start for start in origin), indexing="ij")
+
+
+def test_same_seed_gives_the_same_noise():
+    x, y, z = grid(origin=(-8, 20, 40))
+    first = generate_noise(x, y, z, seed=7, scale=10)
+    assert np.array_equal(first, generate_noise(x, y, z, seed=7, scale=10))
+    assert np.array_equal(PerlinNoise(7).fractal(x / 10, y / 10, z / 10), PerlinNoise(7).fractal(x / 10, y / 10, z / 10))
+
+
+def test_different_seeds_give_different_noise():
+    x, y, z = grid()
+    values = [generate_noise(x, y, z, seed=seed, scale=10) for seed in range(3)]
+    for index, value in enumerate(values):
+        for other in values[index + 1:]:
+            assert np.mean(np.abs(value - other)) > 0.01
+
+
+@pytest.mark.parametrize("seed, scale, octaves, persistence", [(0, 1, 1, 0.5), (3, 10, 6, 0.5), (9, 2.5, 16, 0.9)])
+def test_values_stay_between_0_and_1(seed, scale, octaves, persistence):
+    x, y, z = grid(24, origin=(-300, -12, 5000))
+    values = generate_noise(x * 0.37, y * 0.37, z * 0.37, seed=seed, scale=scale, octaves=octaves,
+                            persistence=persistence)
+    assert values.shape == x.shape
+    assert values.min() >= 0 and values.max() <= 1
+    # The noise is spread out instead of stuck at one value
+    assert values.std() > 0.01
+
+
+def test_scalar_coordinates_match_grid_values():
+    x, y, z = grid(4, origin=(5, -3, 11))
+    values = generate_noise(x, y, z, seed=2, scale=10)
+    assert generate_noise(6, -1, 14, seed=2, scale=10) == values[1, 2, 3]
+
+
+def test_open_axes_broadcast_to_the_full_grid():
+    axis = np.arange(16, dtype=np.float64)
+    x, y, z = grid()
+    open_axes = generate_noise(axis[:, None, None], axis[None, :, None], axis[None, None, :], seed=1, scale=10)
+    assert np.allclose(open_axes, generate_noise(x, y, z, seed=1, scale=10))
+
+
+def test_noise_is_coherent():
+    x = np.linspace(0, 4, 401)
+    values = generate_noise(x, 0.5, 0.5, seed=5, octaves=1)
+    assert np.abs(np.diff(values)).max() < 0.05
+
+
+def test_single_octave_noise_is_zero_on_the_lattice():
+    x, y, z = grid(8)
+    assert np.allclose(PerlinNoise(4).noise3(x, y, z), 0)
+
+
+def test_octaves_are_bounded():
+    noise = PerlinNoise()
+    with pytest.raises(ValueError):
+        noise.fractal(0, 0, 0, octaves=0)
+    with pytest.raises(ValueError):
+        noise.fractal(0, 0, 0, octaves=PerlinNoise.MAX_OCTAVES + 1)
@@ -0,0 +1,181 @@
+import numpy as np
+
+from src.game.block_registry import AIR, STONE
+from src.game.chunk import Chunk
+from src.game.chunk_index import ChunkIndex
+from src.game.player import Player
+from src.physics.collision import Collision, overlapped_cells
+from src.physics.entity_store import EntityFlag, EntityStore
+from src.physics.physics import Physics
+
+SIZE = (0.6, 1.8, 0.6)
+TICK = 1 / 60
+
+
+class BlockWorld:
+    """A world of stone at the given cells and air everywhere else, counting the cells queried."""
+
+    def __init__(self, solid_cells):
+        self.solid_cells = {tuple(cell) for cell in solid_cells}
+        self.queried = 0
+
+    def get_blocks(self, positions):
+        cells = np.floor(positions).astype(np.int64)
+        self.queried += len(cells)
+        return np.array([STONE.id if tuple(cell) in self.solid_cells else AIR.id for cell in cells], dtype=np.uint16)
+
+    def get_block(self, x, y, z):
+        return STONE if (x, y, z) in self.solid_cells else AIR
+
+
+def floor(size=5, height=0):
+    return [(x, height, z) for x in range(-size, size) for z in range(-size, size)]
+
+
+def test_overlapped_cells_ignore_touching_faces():
+    cells = overlapped_cells(np.array([1.0, 2.0, 3.0]), np.array([2.0, 3.5, 4.0]))
+    assert sorted(map(tuple, cells)) == [(1, 2, 3), (1, 3, 3)]
+
+
+def test_falling_box_lands_on_the_floor():
+    world = BlockWorld(floor())
+    position, normals = Collision().sweep(world, (0.2, 1.5, 0.2), SIZE, (0, -1.0, 0))
+    assert np.allclose(position, (0.2, 1.0, 0.2))
+    assert normals == [(0, 1, 0)]
+
+
+def test_fast_movement_does_not_tunnel_through_a_wall():
+    world = BlockWorld([(5, y, z) for y in range(1, 4) for z in range(-1, 2)])
+    position, normals = Collision().sweep(world, (0.2, 1.0, 0.2), SIZE, (20.0, 0, 0))
+    assert np.isclose(position[0], 5 - SIZE[0])
+    assert normals == [(-1, 0, 0)]
+
+
+def test_box_slides_along_a_wall():
+    world = BlockWorld([(x, 1, -1) for x in range(-3, 4)])
+    position, normals = Collision().sweep(world, (0.2, 1.0, 0.0), SIZE, (0.5, 0, -0.5))
+    assert np.allclose(position, (0.7, 1.0, 0.0))
+    assert normals == [(0, 0, 1)]
+
+
+def test_box_inside_terrain_can_move_out():
+    world = BlockWorld([(0, 1, 0)])
+    position, normals = Collision().sweep(world, (0.2, 1.0, 0.2), SIZE, (1.0, 0, 0))
+    assert np.allclose(position, (1.2, 1.0, 0.2))
+    assert normals == []
+
+
+def test_query_cost_does_not_depend_on_world_size():
+    collision = Collision()
+    queried = []
+    for size in (2, 50):
+        world = BlockWorld(floor(size))
+        collision.sweep(world, (0.2, 1.0, 0.2), SIZE, (0.3, -0.2, 0.3))
+        queried.append(world.queried)
+    assert queried[0] == queried[1] <= 27
+
+
+def test_physics_sets_on_ground_and_stops_falling():
+    world = BlockWorld(floor())
+    player = Player((0.2, 1.05, 0.2), None)
+    physics = Physics()
+
+    for _ in range(10):
+        physics.update(world, player, TICK)
+    assert player.on_ground
+    assert player.get_velocity()[1] == 0
+    assert np.isclose(player.get_position()[1], 1.0)
+
+
+def test_physics_jumps_only_from_the_ground():
+    world = BlockWorld(floor())
+    player = Player((0.2, 3.0, 0.2), None)
+    player.set_jumping(True)
+    physics = Physics()
+
+    physics.update(world, player, TICK)
+    assert not player.on_ground
+    assert player.get_velocity()[1] < 0
+
+    for _ in range(60):
+        physics.update(world, player, TICK)
+        if player.get_velocity()[1] > 0:
+            break
+    assert player.get_velocity()[1] == physics.jump_force
+
+
+def test_batched_step_matches_single_sweeps():
+    world = BlockWorld(floor(8) + [(3, y, z) for y in range(1, 4) for z in range(-8, 8)])
+    rng = np.random.default_rng(2)
+    positions = rng.uniform((-6, 1, -6), (6, 4, 6), (50, 3))
+    velocities = rng.uniform(-8, 8, (50, 3))
+    store = EntityStore()
+    store.add_many(positions, SIZE, velocities)
+    collision = Collision()
+
+    Physics().step(world, store, 0.1)
+    for index in range(50):
+        velocity = velocities[index] + (0, Physics().gravity * 0.1, 0)
+        position, normals = collision.sweep(world, positions[index], SIZE, velocity * 0.1)
+        assert np.allclose(store.position[index], position)
+        assert store.has_flags(index, EntityFlag.ON_GROUND) == ((0, 1, 0) in normals)
+
+
+def test_step_leaves_non_colliding_entities_free_and_skips_dead_ones():
+    world = BlockWorld(floor())
+    store = EntityStore()
+    ghost = store.add((0.2, 1.05, 0.2), SIZE, flags=EntityFlag.GRAVITY)
+    dead = store.add((0.2, 5.0, 0.2), SIZE)
+    store.remove(dead)
+    physics = Physics()
+    physics.step(world, store, 0.1)
+    assert np.isclose(store.position[ghost, 1], 1.05 + physics.gravity * 0.1 * 0.1)
+    assert np.isclose(store.position[dead, 1], 5.0)
+
+
+def test_resting_entities_sleep_until_the_ground_under_them_changes():
+    block_ids = np.zeros((Chunk.CHUNK_SIZE,) * 3, dtype=np.uint16)
+    block_ids[:, 0, :] = STONE.id
+    chunks = {(0, 0, 0): Chunk((0, 0, 0), block_ids=block_ids)}
+    world = ChunkIndex(chunks)
+    store = EntityStore()
+    crate = store.add((2.2, 1.5, 2.2), (1.0, 1.0, 1.0))
+    physics = Physics()
+    for _ in range(30):
+        physics.step(world, store, TICK)
+    assert store.has_flags(crate, EntityFlag.ON_GROUND | EntityFlag.SLEEPING)
+    assert np.isclose(store.position[crate, 1], 1.0)
+
+    # Edits nobody reports are not seen: a sleeping entity is not even swept
+    for x, z in [(2, 2), (2, 3), (3, 2), (3, 3)]:
+        chunks[(0, 0, 0)].set_block(x, 0, z, AIR)
+    physics.step(world, store, TICK)
+    assert np.isclose(store.position[crate, 1], 1.0)
+
+    world.mark_dirty((0, 0, 0))
+    physics.step(world, store, TICK)
+    assert not store.has_flags(crate, EntityFlag.SLEEPING)
+    assert store.position[crate, 1] < 1.0
+
+
+def test_entities_do_not_sleep_without_change_reports():
+    world = BlockWorld(floor())
+    store = EntityStore()
+    crate = store.add((0.2, 1.0, 0.2), SIZE)
+    Physics().step(world, store, TICK)
+    assert store.has_flags(crate, EntityFlag.ON_GROUND)
+    assert not store.has_flags(crate, EntityFlag.SLEEPING)
+
+
+def test_player_is_an_entity_of_the_shared_store():
+    world = BlockWorld(floor())
+    store = EntityStore()
+    crate = store.add((2.2, 3.0, 2.2), (1.0, 1.0, 1.0))
+    player = Player((0.2, 1.0, 0.2), None, store)
+    player.set_jumping(True)
+
+    physics = Physics()
+    physics.step(world, store, TICK)
+    assert player.on_ground
+    assert player.get_velocity()[1] == physics.jump_force
+    assert store.position[crate, 1] < 3.0
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.game.block_registry import AIR, STONE
+from src.game.player import Player
+from src.physics.raycast import Raycaster
+
+
+class BlockWorld:
+    """A world of stone at the given cells and air everywhere else."""
+
+    def __init__(self, solid_cells):
+        self.solid_cells = {tuple(cell) for cell in solid_cells}
+
+    def get_blocks(self, positions):
+        cells = np.floor(positions).astype(np.int64)
+        return np.array([STONE.id if tuple(cell) in self.solid_cells else AIR.id for cell in cells], dtype=np.uint16)
+
+    def set_block(self, x, y, z, block):
+        if block.solid:
+            self.solid_cells.add((x, y, z))
+        else:
+            self.solid_cells.discard((x, y, z))
+
+
+def test_ray_reports_the_cell_face_and_adjacent_cell():
+    world = BlockWorld([(5, 0, 0), (0, -3, 0)])
+    hit = Raycaster().cast(world, (0.5, 0.5, 0.5), (1, 0, 0), 10)
+    assert hit.cell == (5, 0, 0)
+    assert hit.normal == (-1, 0, 0)
+    assert hit.adjacent == (4, 0, 0)
+    assert np.isclose(hit.distance, 4.5)
+
+    down = Raycaster().cast(world, (0.5, 0.5, 0.5), (0, -2, 0), 10)
+    assert (down.cell, down.normal) == ((0, -3, 0), (0, 1, 0))
+    assert Raycaster().cast(world, (0.5, 0.5, 0.5), (1, 0, 0), 4) is None
+    with pytest.raises(ValueError):
+        Raycaster().cast(world, (0, 0, 0), (0, 0, 0), 4)
+
+
+def test_ray_does_not_skip_blocks_it_only_clips():
+    # Just short of the corner at (1, 1), the ray clips (0, 1, 0) for a sliver; a sampled ray would step over it
+    world = BlockWorld([(0, 1, 0)])
+    hit = Raycaster().cast(world, (0.5, 0.5, 0.5), (1, 1.001, 0), 3)
+    assert hit.cell == (0, 1, 0)
+    assert hit.normal == (0, -1, 0)
+
+
+def test_ray_starting_inside_a_block_hits_it():
+    hit = Raycaster().cast(BlockWorld([(2, 2, 2)]), (2.5, 2.5, 2.5), (0, 1, 0), 3)
+    assert (hit.cell, hit.normal, hit.distance) == ((2, 2, 2), (0, 0, 0), 0.0)
+
+
+def test_batch_matches_fine_sampling():
+    rng = np.random.default_rng(0)
+    world = BlockWorld(rng.integers(-6, 6, (80, 3)))
+    origins = rng.uniform(-6, 6, (100, 3))
+    directions = rng.normal(size=(100, 3))
+    hits, cells, normals, distances = Raycaster().cast_many(world, origins, directions, 8.0)
+
+    samples = np.arange(0, 8, 1e-3)
+    for origin, direction, hit, cell, normal, distance in zip(origins, directions, hits, cells, normals, distances):
+        points = np.floor(origin + samples[:, None] * direction / np.linalg.norm(direction)).astype(np.int64)
+        solid = [index for index, point in enumerate(map(tuple, points)) if point in world.solid_cells]
+        if not solid:
+            assert not hit or distance > 7.99
+            continue
+        first = solid[0]
+        assert hit and tuple(cell) == tuple(points[first])
+        assert abs(distance - samples[first]) < 2e-3
+        if first > 0:
+            assert tuple(cell + normal) == tuple(points[first - 1])
+
+
+def test_line_of_sight_and_occlusion():
+    world = BlockWorld([(3, 0, z) for z in range(-5, 5)] + [(5, 0, z) for z in range(-5, 5)])
+    origins = [(0.5, 0.5, 0.5), (0.5, 0.5, 0.5), (0.5, 0.5, 0.5), (0.5, 0.5, 0.5)]
+    targets = [(2.5, 0.5, 0.5), (4.5, 0.5, 0.5), (8.5, 0.5, 0.5), (0.5, 0.5, 0.5)]
+    raycaster = Raycaster()
+    assert list(raycaster.line_of_sight(world, origins, targets)) == [True, False, False, True]
+    assert list(raycaster.occluding_blocks(world, origins, targets)) == [0, 1, 2, 0]
+
+
+def test_player_breaks_and_places_the_block_looked_at():
+    world = BlockWorld([(3, 1, 0)])
+    player = Player((0.5, 0.0, 0.5), None)
+    player.camera_yaw = 0.0
+    player.camera_pitch = 0.0
+
+    hit = player.interact_with_world(world, 'place', 'stone')
+    assert hit.cell == (3, 1, 0)
+    assert (2, 1, 0) in world.solid_cells
+
+    player.interact_with_world(world, 'break')
+    assert (2, 1, 0) not in world.solid_cells
+    assert player.interact_with_world(world, 'break') is not None
+    assert world.solid_cells == set()
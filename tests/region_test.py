@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.game.block_registry import AIR, DIRT, STONE
+from src.game.chunk import Chunk
+from src.game.chunk_journal import DirtyFlag
+from src.game.region import HEADER_ENTRY, HEADER_PREFIX, SECTOR_SIZE, RegionFile, RegionStorage
+
+
+def noisy_payload(length, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, length, dtype=np.uint8).tobytes()
+
+
+def test_new_region_file_holds_only_its_header(tmp_path):
+    path = str(tmp_path / "r.region")
+    region = RegionFile(path, 4)
+    assert os.path.getsize(path) == HEADER_PREFIX.size + 16 * HEADER_ENTRY.size
+    assert all(region.read(index) is None for index in range(16))
+    region.close()
+
+
+def test_payloads_grow_into_new_sectors_and_reuse_their_space(tmp_path):
+    path = str(tmp_path / "r.region")
+    region = RegionFile(path, 2)
+    region.write(0, b"small")
+    region.write(1, noisy_payload(SECTOR_SIZE + 1))
+    after_two = os.path.getsize(path)
+    # The second payload needs two sectors, starting on a sector boundary after the first
+    assert after_two == 4 * SECTOR_SIZE
+
+    region.write(0, b"still fits")
+    assert os.path.getsize(path) == after_two
+    assert region.read(0) == b"still fits"
+
+    # A larger payload moves to the end of the file and leaves its neighbour alone
+    larger = noisy_payload(3 * SECTOR_SIZE, seed=1)
+    region.write(0, larger)
+    assert os.path.getsize(path) == after_two + 3 * SECTOR_SIZE
+    assert region.read(0) == larger
+    assert region.read(1) == noisy_payload(SECTOR_SIZE + 1)
+    region.close()
+
+
+def test_region_file_reopens_with_its_payloads(tmp_path):
+    path = str(tmp_path / "r.region")
+    region = RegionFile(path, 2)
+    region.write(3, noisy_payload(700))
+    region.write(3, noisy_payload(1500, seed=2))
+    region.close()
+
+    reopened = RegionFile(path, 2)
+    assert reopened.read(3) == noisy_payload(1500, seed=2)
+    assert reopened.read(0) is None
+    reopened.close()
+
+
+@pytest.mark.parametrize("contents", [b"", b"VXRG", b"XXXX" + bytes(100), b"VXRG\x01\x00\x02\x00" + bytes(48)])
+def test_missing_or_corrupt_header_is_rejected(tmp_path, contents):
+    path = tmp_path / "r.region"
+    path.write_bytes(contents)
+    with pytest.raises(ValueError):
+        RegionFile(str(path), 2)
+
+
+def test_region_of_another_size_is_rejected(tmp_path):
+    path = str(tmp_path / "r.region")
+    RegionFile(path, 2).close()
+    with pytest.raises(ValueError):
+        RegionFile(path, 4)
+
+
+def test_storage_round_trips_chunks_across_regions(tmp_path):
+    storage = RegionStorage(str(tmp_path), region_size=2, seed=5, max_open_files=1)
+    chunks = {}
+    for coords in [(0, 0, 0), (1, 0, 1), (-1, 0, -3), (5, 1, 2)]:
+        chunk = Chunk(tuple(value * Chunk.CHUNK_SIZE for value in coords), seed=5)
+        chunk.set_block(1, 2, 3, DIRT)
+        storage.save_chunk(coords, chunk)
+        assert not chunk.is_dirty(DirtyFlag.SAVE)
+        chunks[coords] = chunk
+    storage.close()
+
+    reopened = RegionStorage(str(tmp_path), region_size=2, seed=5)
+    for coords, chunk in chunks.items():
+        loaded = reopened.load_chunk(coords)
+        assert np.array_equal(loaded.block_ids(), chunk.block_ids())
+        assert loaded.position == chunk.position
+        assert not loaded.is_dirty(DirtyFlag.SAVE)
+    assert reopened.load_chunk((0, 0, 1)) is None
+    assert reopened.load_chunk((40, 0, 40)) is None
+    assert not os.path.exists(tmp_path / "r.20.0.20.region")
+    reopened.close()
+
+
+def test_storage_overwrites_a_chunk_with_a_larger_one(tmp_path):
+    storage = RegionStorage(str(tmp_path))
+    chunk = Chunk((0, 0, 0))
+    chunk.fill_region(AIR)
+    storage.save_chunk((0, 0, 0), chunk)
+    path = tmp_path / "r.0.0.0.region"
+    first_size = os.path.getsize(path)
+
+    # Scattered blocks compress poorly, so the payload outgrows its sector
+    cells = np.random.default_rng(3).integers(0, Chunk.CHUNK_SIZE, (600, 3))
+    for x, y, z in cells:
+        chunk.set_block(int(x), int(y), int(z), STONE if (x + y + z) % 2 else DIRT)
+    storage.save_chunk((0, 0, 0), chunk)
+    storage.close()
+    assert os.path.getsize(path) > first_size
+
+    reopened = RegionStorage(str(tmp_path))
+    assert np.array_equal(reopened.load_chunk((0, 0, 0)).block_ids(), chunk.block_ids())
+    reopened.close()
@@ -0,0 +1,163 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.rendering.gl_state import GLState
+from src.rendering.render_stats import RenderStats
+
+
+class NoQueryGL:
+    """A backend without timer queries, like a software renderer."""
+
+    GL_TEXTURE0 = 0x84C0
+
+    def __getattr__(self, name):
+        if not name.startswith("gl") or name.endswith("Queries"):
+            raise AttributeError(name)
+        return lambda *args: 0
+
+
+class TimerGL(NoQueryGL):
+    """A backend whose timer queries report 2 ms, available one poll after they end."""
+
+    GL_TIME_ELAPSED = 0x88BF
+    GL_QUERY_RESULT = 0x8866
+    GL_QUERY_RESULT_AVAILABLE = 0x8867
+
+    def __init__(self):
+        self.generated = 0
+        self.ended = []
+        self.polled = set()
+        self.deleted = []
+
+    def glGenQueries(self, count):
+        self.generated += 1
+        return np.array([self.generated], dtype=np.uint32)
+
+    def glDeleteQueries(self, count, queries):
+        self.deleted.extend(queries)
+
+    def glBeginQuery(self, target, query):
+        pass
+
+    def glEndQuery(self, target):
+        self.ended.append(self.generated)
+
+    def glGetQueryObjectuiv(self, query, name, result):
+        result[0] = query in self.polled
+        self.polled.add(query)
+
+    def glGetQueryObjectui64v(self, query, name, result):
+        result[0] = 2_000_000
+
+
+def test_cpu_counts_without_timer_queries():
+    stats = RenderStats(NoQueryGL())
+    state = GLState(NoQueryGL())
+
+    stats.begin_frame()
+    with stats.measure("terrain"):
+        stats.record_draw(36, instances=10)
+        stats.record_draw(600)
+        stats.record_upload(1024)
+        state.use_program(1)
+        state.use_program(1)
+    frame = stats.end_frame(state)
+
+    assert frame["draw_calls"] == 2
+    assert frame["vertices"] == 960
+    assert frame["triangles"] == 320
+    assert frame["instances"] == 11
+    assert frame["bytes_uploaded"] == 1024
+    assert (frame["state_changes"], frame["state_changes_saved"]) == (1, 1)
+    assert "terrain" in frame["cpu_ms"]
+    assert frame["gpu_ms"] == {}
+
+
+def test_counts_outside_a_frame_are_ignored():
+    stats = RenderStats(NoQueryGL())
+    stats.record_draw(36)
+    stats.record_upload(64)
+    assert stats.end_frame() is None
+    assert stats.latest() is None
+
+
+def test_history_is_bounded():
+    stats = RenderStats(NoQueryGL(), history=3)
+    for draws in range(5):
+        stats.begin_frame()
+        for _ in range(draws):
+            stats.record_draw(3)
+        stats.end_frame()
+
+    assert [frame["draw_calls"] for frame in stats.history] == [2, 3, 4]
+    assert stats.latest()["frame"] == 4
+    assert stats.averages()["draw_calls"] == 3
+
+
+def test_gpu_times_arrive_without_stalling():
+    gl = TimerGL()
+    stats = RenderStats(gl)
+
+    stats.begin_frame()
+    with stats.measure("terrain"):
+        pass
+    first = stats.end_frame()
+    # The first poll finds the query still running
+    assert first["gpu_ms"] == {}
+
+    stats.begin_frame()
+    with stats.measure("terrain"):
+        pass
+    stats.end_frame()
+
+    assert first["gpu_ms"] == {"terrain": 2.0}
+    assert gl.generated == 2
+
+
+def test_finished_queries_are_reused():
+    gl = TimerGL()
+    stats = RenderStats(gl)
+    for _ in range(6):
+        stats.begin_frame()
+        with stats.measure("terrain"):
+            pass
+        stats.end_frame()
+    assert gl.generated <= 2
+
+    stats.delete()
+    assert len(gl.deleted) == gl.generated
+
+
+def test_gpu_timing_can_be_disabled():
+    gl = TimerGL()
+    stats = RenderStats(gl, gpu_timing=False)
+    stats.begin_frame()
+    with stats.measure("terrain"):
+        pass
+    stats.end_frame()
+    assert gl.generated == 0
+
+
+def test_passes_may_not_nest():
+    stats = RenderStats(NoQueryGL())
+    stats.begin_frame()
+    with stats.measure("terrain"):
+        with pytest.raises(ValueError):
+            with stats.measure("player"):
+                pass
+
+
+def test_dump_writes_json(tmp_path):
+    stats = RenderStats(NoQueryGL())
+    stats.begin_frame()
+    stats.record_draw(6)
+    stats.end_frame()
+
+    path = tmp_path / "stats.json"
+    stats.dump(str(path))
+    document = json.loads(path.read_text())
+
+    assert document["frames"][0]["draw_calls"] == 1
+    assert document["averages"]["vertices"] == 6
@@ -0,0 +1,54 @@
+from src.rendering.shader_manager import PROGRAM_HEADER, ProgramCache, program_key
+
+VERTEX = "#version 330 core\nvoid main() {}\n"
+FRAGMENT = "#version 330 core\nout vec4 color;\nvoid main() { color = vec4(1.0); }\n"
+DRIVER = "Vendor|Renderer|4.6"
+
+
+def test_key_is_stable():
+    assert program_key(VERTEX, FRAGMENT, DRIVER) == program_key(VERTEX, FRAGMENT, DRIVER)
+
+
+def test_key_changes_with_sources_and_driver():
+    key = program_key(VERTEX, FRAGMENT, DRIVER)
+    assert program_key(VERTEX + " ", FRAGMENT, DRIVER) != key
+    assert program_key(VERTEX, FRAGMENT + " ", DRIVER) != key
+    assert program_key(VERTEX, FRAGMENT, "Vendor|Renderer|4.5") != key
+
+
+def test_key_distinguishes_text_moved_between_sources():
+    assert program_key("ab", "c", DRIVER) != program_key("a", "bc", DRIVER)
+
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = ProgramCache(str(tmp_path / "shaders"))
+    key = program_key(VERTEX, FRAGMENT, DRIVER)
+    assert cache.load(key) is None
+
+    cache.store(key, 0x8E21, b"\x01\x02\x03")
+    assert cache.load(key) == (0x8E21, b"\x01\x02\x03")
+
+    cache.store(key, 0x8E21, b"\x04")
+    assert cache.load(key) == (0x8E21, b"\x04")
+
+
+def test_invalidate_removes_the_entry(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    key = program_key(VERTEX, FRAGMENT, DRIVER)
+    cache.store(key, 1, b"binary")
+    cache.invalidate(key)
+    assert cache.load(key) is None
+    cache.invalidate(key)
+
+
+def test_corrupt_entries_are_ignored(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    key = program_key(VERTEX, FRAGMENT, DRIVER)
+
+    with open(cache.path(key), "wb") as file:
+        file.write(b"junk")
+    assert cache.load(key) is None
+
+    with open(cache.path(key), "wb") as file:
+        file.write(PROGRAM_HEADER.pack(b"XXXX", 1) + b"binary")
+    assert cache.load(key) is None
@@ -0,0 +1,176 @@
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+from src.game.block_registry import BlockRegistry
+from src.rendering import texture_array
+from src.rendering.texture_array import TextureArray, build_mip_chain, placeholder_texture
+
+
+def registry_of(*textures):
+    registry = BlockRegistry()
+    registry.register("air", None, hardness=0, opaque=False, solid=False)
+    for index, texture in enumerate(textures):
+        registry.register(f"type {index}", texture)
+    return registry
+
+
+def save_texture(directory, name, color, size=16):
+    surface = pygame.Surface((size, size))
+    surface.fill(color)
+    # Mark the top-right texel so the row and column order can be checked
+    surface.set_at((size - 1, 0), (255, 255, 255))
+    pygame.image.save(surface, os.path.join(directory, name))
+
+
+@pytest.fixture
+def textures(tmp_path):
+    directory = tmp_path / "textures"
+    directory.mkdir()
+    save_texture(directory, "red.png", (200, 0, 0))
+    save_texture(directory, "blue.png", (0, 0, 200))
+    return str(directory)
+
+
+def test_textures_are_packed_into_layers_by_block_id(textures):
+    registry = registry_of("red.png", "blue.png", "red.png", "missing.png")
+    array = TextureArray(registry, textures, cache_directory=None)
+    assert array.names == ["red.png", "blue.png", "missing.png"]
+    assert array.layers.tolist() == [0, 0, 1, 0, 2]
+
+    layers = array.levels[0]
+    assert layers.shape == (3, 16, 16, 4) and layers.dtype == np.uint8
+    assert layers[0, 5, 5].tolist() == [200, 0, 0, 255]
+    assert layers[1, 5, 5].tolist() == [0, 0, 200, 255]
+    # Texels are stored as [row, column], top row first
+    assert layers[0, 0, 15].tolist() == [255, 255, 255, 255]
+    assert layers[0, 15, 0].tolist() == [200, 0, 0, 255]
+    assert np.array_equal(layers[2], placeholder_texture("missing.png"))
+
+
+def test_textures_are_scaled_to_the_layer_size(textures):
+    save_texture(textures, "large.png", (0, 90, 0), size=64)
+    array = TextureArray(registry_of("large.png"), textures, size=8, cache_directory=None)
+    assert array.levels[0].shape == (1, 8, 8, 4)
+    assert array.levels[0][0, 4, 4].tolist() == [0, 90, 0, 255]
+
+
+def test_registry_without_textures_still_has_a_layer():
+    array = TextureArray(registry_of(), cache_directory=None)
+    assert array.names == []
+    assert array.levels[0].shape == (1, 16, 16, 4)
+    assert array.layers.tolist() == [0]
+
+
+@pytest.mark.parametrize("size", [0, 12, -4])
+def test_layer_size_must_be_a_power_of_two(size):
+    with pytest.raises(ValueError):
+        TextureArray(registry_of(), size=size, cache_directory=None)
+
+
+def test_mip_chain_halves_down_to_one_texel():
+    layers = np.zeros((2, 8, 8, 4), dtype=np.uint8)
+    layers[0, :4, :4] = 200
+    layers[1] = 10
+    levels = build_mip_chain(layers)
+    assert [level.shape for level in levels] == [(2, 8, 8, 4), (2, 4, 4, 4), (2, 2, 2, 4), (2, 1, 1, 4)]
+    assert all(level.dtype == np.uint8 for level in levels)
+    assert levels[0] is layers
+    assert levels[2][0, :, :, 0].tolist() == [[200, 0], [0, 0]]
+    assert levels[3][0, 0, 0].tolist() == [50] * 4
+    assert levels[3][1, 0, 0].tolist() == [10] * 4
+
+
+def test_mip_levels_average_2x2_blocks():
+    layers = np.array([[[0, 255], [100, 1]]], dtype=np.uint8)[..., None].repeat(4, axis=-1)
+    (_, level) = build_mip_chain(layers)
+    assert level[0, 0, 0, 0] == 89
+
+
+def test_packed_textures_are_loaded_from_the_cache(textures, tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache")
+    registry = registry_of("red.png", "blue.png")
+    packed = TextureArray(registry, textures, cache_directory=cache)
+    assert os.listdir(cache) == [os.path.basename(packed.cache_path())]
+
+    def pack(self):
+        raise AssertionError("the cache should have been used")
+
+    monkeypatch.setattr(TextureArray, "pack", pack)
+    cached = TextureArray(registry, textures, cache_directory=cache)
+    assert len(cached.levels) == len(packed.levels) == 5
+    for level, cached_level in zip(packed.levels, cached.levels):
+        assert np.array_equal(level, cached_level)
+
+
+@pytest.mark.parametrize("change", ["source", "names", "size", "version"])
+def test_cache_is_invalidated_when_its_sources_change(textures, tmp_path, monkeypatch, change):
+    cache = str(tmp_path / "cache")
+    registry = registry_of("red.png", "blue.png")
+    original = TextureArray(registry, textures, cache_directory=cache)
+
+    size = 16
+    if change == "source":
+        save_texture(textures, "blue.png", (0, 200, 0))
+    elif change == "names":
+        registry = registry_of("blue.png", "red.png")
+    elif change == "size":
+        size = 8
+    else:
+        monkeypatch.setattr(texture_array, "PACK_VERSION", texture_array.PACK_VERSION + 1)
+
+    repacked = TextureArray(registry, textures, size=size, cache_directory=cache)
+    assert repacked.cache_path() != original.cache_path()
+    assert len(os.listdir(cache)) == 2
+    if change == "source":
+        assert repacked.levels[0][1, 5, 5].tolist() == [0, 200, 0, 255]
+    if change == "names":
+        assert repacked.levels[0][0, 5, 5].tolist() == [0, 0, 200, 255]
+
+
+def damage_cache(path, damage):
+    if damage == "junk":
+        data = b"junk"
+    elif damage == "truncated":
+        with open(path, "rb") as file:
+            data = file.read()[:100]
+    else:
+        with np.load(path) as cache:
+            levels = {name: cache[name] for name in cache.files}
+        if damage == "missing level":
+            del levels["level_1"]
+        else:
+            levels["level_1"] = levels["level_1"][:, :4]
+        with open(path, "wb") as file:
+            np.savez(file, **levels)
+        return
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+@pytest.mark.parametrize("damage", ["junk", "truncated", "missing level", "wrong shape"])
+def test_damaged_cache_is_rebuilt(textures, tmp_path, monkeypatch, damage):
+    cache = str(tmp_path / "cache")
+    registry = registry_of("red.png", "blue.png")
+    packed = TextureArray(registry, textures, cache_directory=cache)
+    damage_cache(packed.cache_path(), damage)
+
+    rebuilt = TextureArray(registry, textures, cache_directory=cache)
+    for level, rebuilt_level in zip(packed.levels, rebuilt.levels, strict=True):
+        assert np.array_equal(level, rebuilt_level)
+
+    # The rewritten cache is used from then on
+    def pack(self):
+        raise AssertionError("the cache should have been used")
+
+    monkeypatch.setattr(TextureArray, "pack", pack)
+    cached = TextureArray(registry, textures, cache_directory=cache)
+    assert np.array_equal(cached.levels[0], packed.levels[0])
+
+
+def test_caching_can_be_disabled(textures, tmp_path):
+    array = TextureArray(registry_of("red.png"), textures, cache_directory=None)
+    assert array.cache_path() is None
+    assert sorted(os.listdir(tmp_path)) == ["textures"]
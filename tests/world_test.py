@@ -0,0 +1,269 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.game import world as world_module
+from src.game.block_registry import AIR, STONE
+from src.game.chunk import Chunk
+from src.game.chunk_journal import DirtyFlag
+from src.game.world import World
+from src.rendering.camera import Camera
+from src.rendering.texture_array import TextureArray
+
+SIZE = Chunk.CHUNK_SIZE
+
+
+class FakeMesh:
+    """Stands in for ChunkMesh, which needs a GL context."""
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.vertex_count = 0
+        self.deleted = False
+
+    def upload(self, vertices):
+        self.vertex_count = len(vertices)
+
+    def delete(self):
+        self.deleted = True
+
+
+class FakeGenerator:
+    """Stands in for ChunkGenerator: every queued request comes back as an empty chunk on the next poll."""
+
+    def __init__(self, seed=0, workers=None):
+        self.requested = []
+        self.queued = []
+
+    def request(self, position):
+        if position not in self.queued:
+            self.queued.append(position)
+            self.requested.append(position)
+
+    def retain(self, predicate):
+        self.queued = [position for position in self.queued if predicate(position)]
+
+    def set_focus(self, position):
+        pass
+
+    def pending(self):
+        return len(self.queued)
+
+    def poll(self, max_chunks=None):
+        chunks = [Chunk(position, block_ids=np.zeros((SIZE,) * 3, dtype=np.uint16)) for position in self.queued]
+        self.queued = []
+        return chunks
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_world(monkeypatch):
+    """Builds worlds without a GL context, with fake generation and meshing on the calling thread."""
+    renderer = SimpleNamespace(textures=TextureArray(cache_directory=None))
+    monkeypatch.setattr(world_module, "BlockRenderer", lambda: renderer)
+    monkeypatch.setattr(world_module, "ChunkMesh", FakeMesh)
+    monkeypatch.setattr(world_module, "ChunkGenerator", FakeGenerator)
+    worlds = []
+
+    def make(**options):
+        worlds.append(World(**{"generation_workers": 0, "mesh_workers": 0, **options}))
+        return worlds[-1]
+
+    yield make
+    for world in worlds:
+        world.close()
+
+
+def filled_chunk(coords, block_type=STONE):
+    block_ids = np.full((SIZE,) * 3, block_type.id, dtype=np.uint16)
+    return Chunk(tuple(value * SIZE for value in coords), block_ids=block_ids)
+
+
+def meshed_world(make_world, chunks, **options):
+    world = make_world(**options)
+    for coords, chunk in chunks.items():
+        world.add_chunk(coords, chunk)
+    world.update_meshes()
+    world.upload_meshes()
+    return world
+
+
+def test_default_lod_distances_follow_the_load_radius(make_world):
+    world = make_world()
+    assert world.lod_distances == (2, 3, 4)
+    assert [world.lod_factor(coords) for coords in [(0, 0, 0), (1, 0, 1), (2, 0, 0), (0, 5, 3), (3, 0, 3)]] == [
+        1, 1, 2, 4, 8
+    ]
+    assert make_world(load_radius=8, unload_radius=8).lod_distances == (4, 6, 8)
+    assert make_world(lod_distances=(1,)).lod_factor((5, 0, 0)) == 2
+
+
+def test_distant_chunks_are_meshed_downsampled_until_the_focus_comes_near(make_world):
+    world = make_world(vertical_chunks=(0, 1))
+    for coords in [(0, 0, 0), (3, 0, 0)]:
+        world.add_chunk(coords, filled_chunk(coords))
+    world.update_meshes()
+    world.upload_meshes()
+    assert world.chunk_lods == {(0, 0, 0): 1, (3, 0, 0): 4}
+    # A solid chunk downsampled to one material is a single box: one merged quad per side
+    assert world.chunk_meshes[(3, 0, 0)].vertex_count == 36
+
+    world.set_focus((3 * SIZE, 0, 0))
+    world.update_meshes()
+    world.upload_meshes()
+    assert world.chunk_lods == {(0, 0, 0): 4, (3, 0, 0): 1}
+
+
+def test_occlusion_culling_hides_chunks_behind_solid_terrain(make_world):
+    behind = filled_chunk((2, 0, 0), AIR)
+    behind.set_block(8, 8, 8, STONE)
+    chunks = {(0, 0, 0): filled_chunk((0, 0, 0), AIR), (1, 0, 0): filled_chunk((1, 0, 0)), (2, 0, 0): behind}
+    camera = Camera(position=(8.0, 8.0, 8.0), yaw=0.0)
+
+    world = meshed_world(make_world, chunks, lod_distances=(8,))
+    assert [world.chunk_coords(mesh.origin) for mesh in world.visible_meshes(camera)] == [(1, 0, 0)]
+    assert world.occluded_chunks == 1
+
+    world.occlusion_culling = False
+    visible = [world.chunk_coords(mesh.origin) for mesh in world.visible_meshes(camera)]
+    assert sorted(visible) == [(1, 0, 0), (2, 0, 0)]
+    assert world.occluded_chunks == 0
+
+
+def test_culled_chunks_counts_only_the_frustum_and_distance_test(make_world):
+    chunks = {(0, 0, 0): filled_chunk((0, 0, 0), AIR)}
+    for coords in [(1, 0, 0), (-2, 0, 0), (3, 0, 0)]:
+        chunks[coords] = filled_chunk(coords, AIR)
+        chunks[coords].set_block(8, 8, 8, STONE)
+    camera = Camera(position=(8.0, 8.0, 8.0), yaw=0.0)
+
+    world = meshed_world(make_world, chunks, lod_distances=(8,), render_distance=2)
+    visible = [world.chunk_coords(mesh.origin) for mesh in world.visible_meshes(camera)]
+    # The empty chunk holding the camera is neither drawn nor culled; the one behind it and the
+    # one past the render distance are culled
+    assert visible == [(1, 0, 0)]
+    assert (world.visible_chunks, world.culled_chunks, world.occluded_chunks) == (1, 2, 0)
+
+
+def columns(world):
+    return {(x, z) for x, _, z in world.chunks}
+
+
+def disc(center_x, center_z, radius):
+    return {
+        (x, z)
+        for x in range(center_x - radius, center_x + radius + 1)
+        for z in range(center_z - radius, center_z + radius + 1)
+        if (x - center_x) ** 2 + (z - center_z) ** 2 <= radius * radius
+    }
+
+
+def test_chunks_stream_in_within_the_load_radius(make_world):
+    world = make_world(load_radius=2, unload_radius=3, vertical_chunks=(-1, 1))
+    assert world.chunks == {}
+    world.collect_generated_chunks()
+    assert columns(world) == disc(0, 0, 2)
+    assert len(world.chunks) == 2 * len(disc(0, 0, 2))
+    assert world.get_chunk((0, -1, 0)).position == (0, -SIZE, 0)
+
+
+def test_unloading_lags_behind_loading(make_world):
+    world = make_world(load_radius=2, unload_radius=3)
+    world.collect_generated_chunks()
+
+    # One chunk over, the chunks left behind are still inside the unload radius
+    world.set_focus((SIZE, 0, 0))
+    world.collect_generated_chunks()
+    assert columns(world) == disc(0, 0, 2) | disc(1, 0, 2)
+
+    # Moving back and forth across a chunk border neither reloads nor unloads anything
+    requested = len(world.chunk_generator.requested)
+    for x in (0, SIZE, 0, SIZE):
+        world.set_focus((x, 0, 0))
+        world.collect_generated_chunks()
+    assert len(world.chunk_generator.requested) == requested
+    assert columns(world) == disc(0, 0, 2) | disc(1, 0, 2)
+
+    # Further on, what was loaded stays up to the unload radius of the new focus
+    world.set_focus((3 * SIZE, 0, 0))
+    world.collect_generated_chunks()
+    assert columns(world) == disc(3, 0, 2) | (disc(0, 0, 2) | disc(1, 0, 2)) & disc(3, 0, 3)
+
+
+def test_unloaded_chunks_leave_the_block_lookups(make_world):
+    world = make_world(load_radius=1, unload_radius=1)
+    world.collect_generated_chunks()
+    world.set_block(1, 2, 3, STONE)
+    assert world.get_blocks([(1, 2, 3)])[0] == STONE.id
+
+    world.set_focus((10 * SIZE, 0, 0))
+    assert (0, 0, 0) not in world.chunks
+    assert world.get_block(1, 2, 3) is None
+    assert world.get_blocks([(1, 2, 3)], default=99)[0] == 99
+
+
+def test_unloaded_chunks_are_cached_and_evicted_least_recently_used_first(make_world):
+    world = make_world(load_radius=0, unload_radius=0, cache_size=3)
+    world.collect_generated_chunks()
+    edited = world.get_chunk((0, 0, 0))
+    edited.set_block(0, 0, 0, STONE)
+
+    for x in (1, 2):
+        world.set_focus((x * SIZE, 0, 0))
+        world.collect_generated_chunks()
+    assert list(world.unloaded_chunks) == [(0, 0, 0), (1, 0, 0)]
+
+    # Coming back is a cache hit: the edited chunk itself returns, with nothing generated
+    requested = len(world.chunk_generator.requested)
+    world.set_focus((0, 0, 0))
+    assert world.get_chunk((0, 0, 0)) is edited
+    assert len(world.chunk_generator.requested) == requested
+    assert list(world.unloaded_chunks) == [(1, 0, 0), (2, 0, 0)]
+
+    # The least recently used chunks are evicted first, and have to be generated again
+    for x in (3, 4, 1):
+        world.set_focus((x * SIZE, 0, 0))
+        world.collect_generated_chunks()
+    assert list(world.unloaded_chunks) == [(0, 0, 0), (3, 0, 0), (4, 0, 0)]
+    assert world.chunk_generator.requested[-1] == world.chunk_position((1, 0, 0))
+    assert world.get_chunk((1, 0, 0)) is not None
+
+
+def test_block_lookups_span_chunks_at_negative_coordinates(make_world):
+    world = make_world(load_radius=2, unload_radius=2, vertical_chunks=(-1, 1))
+    world.collect_generated_chunks()
+    cells = np.array([(-1, -1, -1), (-16, -16, -16), (-17, 0, 0), (15, 15, 15), (0, -1, 16), (-0.5, 3.9, -15.2)])
+
+    world.set_blocks(cells, STONE)
+    assert world.get_block(-1, -1, -1) is STONE
+    assert world.get_block(-0.5, 3.9, -15.2) is STONE
+    assert world.get_chunk((-1, -1, -1)).get_block(15, 15, 15) is STONE
+    assert list(world.get_blocks(cells)) == [STONE.id] * len(cells)
+    assert list(world.get_blocks(np.floor(cells) + 0.5)) == [STONE.id] * len(cells)
+
+    world.set_block(-17, 0, 0, AIR)
+    assert world.get_blocks([(-17, 0, 0), (-18, 0, 0)]).tolist() == [AIR.id, AIR.id]
+
+
+def test_batched_edits_skip_unloaded_chunks(make_world):
+    world = make_world(load_radius=0, unload_radius=0)
+    world.collect_generated_chunks()
+    world.set_blocks([(2, 3, 4), (40, 3, 4), (-40, 3, 4)], STONE)
+    assert world.get_blocks([(2, 3, 4), (40, 3, 4), (-40, 3, 4)], default=99).tolist() == [STONE.id, 99, 99]
+    assert world.get_block(40, 3, 4) is None
+    with pytest.raises(ValueError):
+        world.set_block(40, 3, 4, STONE)
+
+
+def test_edits_on_a_chunk_border_dirty_the_neighbour_mesh(make_world):
+    world = make_world(load_radius=1, unload_radius=1)
+    world.collect_generated_chunks()
+    world.update_meshes()
+    assert not any(chunk.is_dirty(DirtyFlag.MESH) for chunk in world.chunks.values())
+
+    world.set_blocks([(0, 5, 5)], STONE)
+    dirty = {coords for coords, chunk in world.chunks.items() if chunk.is_dirty(DirtyFlag.MESH)}
+    assert dirty == {(0, 0, 0), (-1, 0, 0)}